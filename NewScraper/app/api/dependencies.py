@@ -1,10 +1,13 @@
 """
 API dependencies including authentication and common dependencies
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security.api_key import APIKeyHeader
 from typing import Optional
 from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Initialize API Key header checker
 API_KEY_NAME = "X-API-Key"
@@ -46,4 +49,24 @@ async def get_proxy_url() -> str:
     Returns:
         str: Configured proxy URL
     """
-    return settings.PROXY_URL
\ No newline at end of file
+    return settings.PROXY_URL
+
+async def get_news_service(request: Request):
+    """
+    Get the shared NewsService from the application's service container.
+
+    Returns:
+        NewsService: Lazily built news service
+
+    Raises:
+        HTTPException: 503 if the service cannot be built yet
+    """
+    try:
+        return await request.app.state.services.get_news_service()
+    except Exception as e:
+        logger.exception("News service unavailable")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"News service unavailable: {e}",
+            headers={"Retry-After": "5"},
+        )
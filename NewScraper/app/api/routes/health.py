@@ -0,0 +1,42 @@
+"""
+Liveness and readiness endpoints
+"""
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from typing import Any, Dict
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/live")
+async def liveness() -> Dict[str, Any]:
+    """Process is up and serving requests, never touches dependencies"""
+    return {"status": "alive", "service": "news-scraper"}
+
+@router.get("/ready")
+async def readiness(request: Request) -> JSONResponse:
+    """
+    Report whether this instance should receive traffic.
+
+    Returns 503 until the news service has been built and the ScrapeOps key is configured.
+    Proxy call and credit totals are included once the proxy client is in use.
+    """
+    from app.utils.proxy import get_proxy_client
+
+    services = request.app.state.services
+    checks = {
+        "news_service": "ready" if services.ready else "starting",
+        "scrapeops_api_key": "configured" if settings.SCRAPEOPS_API_KEY else "missing",
+    }
+    if services.startup_error:
+        checks["error"] = services.startup_error
+
+    ready = services.ready and bool(settings.SCRAPEOPS_API_KEY)
+    content = {"status": "ready" if ready else "not_ready", "checks": checks}
+    # Only report on a client that exists, a probe should not create one
+    if get_proxy_client.cache_info().currsize:
+        content["proxy_usage"] = get_proxy_client().stats()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=content,
+    )
@@ -1,39 +1,105 @@
 """
 News endpoint routes
 """
-from fastapi import APIRouter, Depends, BackgroundTasks
-from app.api.dependencies import verify_api_key
-from app.services.news_service import NewsService
-from app.models.schemas import NewsResponse
+from fastapi import APIRouter, Depends, BackgroundTasks, Header, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from app.api.dependencies import verify_api_key, get_news_service
+from app.core.config import settings
+from app.services.cache import layer_digests, summaries_digest
+from app.models.schemas import NewsResponse, ARTICLE_FIELDS, HEADLINE_FIELDS
+from app.utils import make_etag, etag_matches, cache_headers
+from typing import Literal, Optional, Set
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/news", tags=["news"])
 
-# Initialize NewsService outside the route
-news_service = NewsService()
+def resolve_fields(mode: str, fields: Optional[str]) -> Optional[Set[str]]:
+    """
+    Work out which article fields the client asked for.
+
+    Returns:
+        Optional[Set[str]]: Selected fields, or None for the full article
 
-@router.get("/{ticker}", response_model=NewsResponse)
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if fields:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = selected - ARTICLE_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown article fields: {', '.join(sorted(unknown))}",
+            )
+        if mode == "headlines":
+            selected -= {"paragraphs"}
+        return selected
+    if mode == "headlines":
+        return HEADLINE_FIELDS
+    return None
+
+@router.get("/{ticker}", response_model=NewsResponse, response_class=ORJSONResponse)
 async def get_news(
     ticker: str,
     background_tasks: BackgroundTasks,
-    api_key: str = Depends(verify_api_key)
+    mode: Literal["full", "headlines"] = Query("full", description="'headlines' skips article bodies"),
+    fields: Optional[str] = Query(None, description="Comma-separated article fields to return"),
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(verify_api_key),
+    news_service=Depends(get_news_service),
 ):
     """
     Get financial news for a specific ticker
-    
+
     Args:
         ticker: Stock ticker symbol
         background_tasks: FastAPI background tasks
+        mode: "full" for complete articles, "headlines" to skip body text
+        fields: Optional comma-separated list of article fields to return
+        if_none_match: ETag(s) from a previous response, answered with 304 when unchanged
         api_key: API key for authentication
-    
+        news_service: Shared NewsService from the service container
+
     Returns:
-        NewsResponse: News data with articles from all sources
+        NewsResponse: News data with articles from all sources, or 304 Not Modified
     """
     try:
         logger.debug(f"Received request for ticker: {ticker}")
-        return await news_service.get_news(ticker, background_tasks)
+        selected = resolve_fields(mode, fields)
+        include_body = selected is None or "paragraphs" in selected
+        etag_fields = selected if selected is not None else ARTICLE_FIELDS
+        include_summaries = "summary" in etag_fields and news_service.summaries_enabled
+
+        # Answer conditional requests from the cached digests without loading any articles
+        validator = await news_service.get_cache_validator(ticker, include_body)
+        if validator and if_none_match:
+            headlines_digest, bodies_digest, ttl = validator
+            summary_digest = await news_service.get_summaries_digest(ticker) if include_summaries else None
+            etag = make_etag(headlines_digest, bodies_digest, etag_fields, summary_digest)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, ttl))
+
+        response = await news_service.get_news(ticker, background_tasks, include_body)
+
+        headlines_digest, bodies_digest = layer_digests(response.articles)
+        summary_digest = (
+            summaries_digest(article.summary for article in response.articles)
+            if include_summaries else None
+        )
+        etag = make_etag(
+            headlines_digest, bodies_digest if include_body else None, etag_fields, summary_digest
+        )
+        headers = cache_headers(etag, validator[2] if validator else settings.CACHE_EXPIRATION)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        # Render straight through orjson, skipping FastAPI's response_model re-validation
+        content = response.model_dump() if selected is None else response.project(selected)
+        return ORJSONResponse(content=content, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error processing request for {ticker}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
@@ -3,16 +3,29 @@ Core configuration settings for the FastAPI application.
 """
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Literal, Optional
+import logging
 import os
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
 class Settings(BaseSettings):
     # API Keys and URLs
-    SCRAPEOPS_API_KEY: str = os.getenv("SCRAPEOPS_API_KEY")
+    SCRAPEOPS_API_KEY: Optional[str] = os.getenv("SCRAPEOPS_API_KEY")
     PROXY_URL: str = "https://proxy.scrapeops.io/v1/"
+
+    # Proxy client settings (match PROXY_MAX_CONCURRENCY to the ScrapeOps plan)
+    PROXY_MAX_CONCURRENCY: int = 5
+    PROXY_CONNECT_TIMEOUT: float = 5.0
+    PROXY_READ_TIMEOUT: float = 60.0
+    PROXY_MAX_RETRIES: int = 2
+    PROXY_BACKOFF_BASE: float = 0.5
+    PROXY_BACKOFF_MAX: float = 8.0
+    PROXY_CREDITS_PER_REQUEST: int = 1
     
     # API Settings
     APP_NAME: str = "Financial News Scraper API"
@@ -22,19 +35,35 @@ class Settings(BaseSettings):
     # CORS Settings
     ALLOWED_ORIGINS: list = ["*"]
 
+    # Response compression (zstd/brotli when installed, gzip otherwise)
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes, smaller responses are sent uncompressed
+
     # Optional Redis Settings
     USE_REDIS: bool = False  # Set to True if you want to use Redis
     REDIS_HOST: str = "localhost"  # Only used if USE_REDIS is True
     REDIS_PORT: int = 6379
     CACHE_EXPIRATION: int = 300  # 5 minutes
 
+    # Summary pipeline: newly seen article bodies are sent to the Summarizer service, whose
+    # summaries are attached to cached news (requires USE_REDIS, shared with the Summarizer)
+    SUMMARY_PIPELINE: bool = False
+    SUMMARY_PUBLISHER: Literal["kafka", "redis"] = "kafka"  # Kafka topic or Redis stream
+    SUMMARY_REQUEST_TOPIC: str = "summary_requests"
+    KAFKA_SERVERS: str = "localhost:9092"  # Only used if SUMMARY_PUBLISHER is "kafka"
+    SUMMARY_KEY_PREFIX: str = "news:summary"  # Summaries are read from {prefix}:{content hash}
+    SEEN_ARTICLE_TTL: int = 604800  # 7 days, articles seen within this window are not re-sent
+
+    # Startup Settings
+    WARM_UP_ON_STARTUP: bool = True  # Build scrapers and cache client in the background at startup
+
     class Config:
         case_sensitive = True
 
     def __init__(self):
         super().__init__()
         if not self.SCRAPEOPS_API_KEY:
-            raise ValueError("SCRAPEOPS_API_KEY not found in environment variables")
+            # Stay up so liveness probes pass; readiness reports the missing key
+            logger.warning("SCRAPEOPS_API_KEY not found in environment variables")
 
 @lru_cache
 def get_settings() -> Settings:
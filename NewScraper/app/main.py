@@ -5,8 +5,11 @@ Main FastAPI application entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import Settings
-from app.api.routes import news
+from app.api.routes import health, news
 from app.core.exceptions import configure_exception_handlers
+from app.middleware import CompressionMiddleware
+from app.services.container import ServiceContainer
+from contextlib import asynccontextmanager
 import logging
 
 # Configure logging
@@ -20,10 +23,23 @@ def create_app(settings: Settings) -> FastAPI:
     """Create and configure FastAPI application"""
     logger.info("Initializing FastAPI application")
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Startup: services are built lazily, optionally warmed in the background
+        logger.info("Application starting up...")
+        app.state.services = ServiceContainer()
+        if settings.WARM_UP_ON_STARTUP:
+            app.state.services.start_warm_up()
+        yield
+        # Shutdown
+        logger.info("Application shutting down...")
+        await app.state.services.shutdown()
+
     app = FastAPI(
         title=settings.APP_NAME,
         description=settings.APP_DESCRIPTION,
         version=settings.APP_VERSION,
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -33,10 +49,15 @@ def create_app(settings: Settings) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
 
+    # Compress large payloads with the best encoding the client accepts
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
     # Include routers
     app.include_router(news.router, prefix="/api/v1")
+    app.include_router(health.router)
 
     # Configure exception handlers
     configure_exception_handlers(app)
@@ -46,15 +67,3 @@ def create_app(settings: Settings) -> FastAPI:
 
 
 app = create_app(Settings())
-
-
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Application starting up...")
-    # Add any startup tasks here
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Application shutting down...")
-    # Add any cleanup tasks here
@@ -0,0 +1,133 @@
+"""
+Negotiated response compression middleware (zstd, brotli, gzip).
+
+brotli and zstandard are optional: an encoding is only offered when its package is
+installed, gzip is always available.
+"""
+import gzip
+import logging
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+def _encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available encoders in server preference order"""
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        encoders["zstd"] = compressor.compress
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=5)
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=6)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """
+    Pick the best encoding from an Accept-Encoding header.
+
+    Client q-values decide first, server preference (the order of ``available``) breaks ties.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses larger than ``minimum_size`` with the negotiated encoding.
+
+    Args:
+        app: Wrapped ASGI application
+        minimum_size: Responses smaller than this many bytes are sent as-is
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = _encoders()
+        logger.debug(f"Response compression enabled: {', '.join(self.encoders)}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encoders
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        body_parts = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if self._is_compressible(headers) and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if self._is_compressible(headers) and len(body) >= self.minimum_size:
+                body = self.encoders[encoding](body)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                # The compressed bytes differ from the identity representation
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(self.COMPRESSIBLE_TYPES)
@@ -2,7 +2,7 @@
 Pydantic models for request/response schemas
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime
 
 class NewsArticle(BaseModel):
@@ -12,6 +12,11 @@ class NewsArticle(BaseModel):
     date: str
     source: str
     paragraphs: Optional[str] = ""
+    summary: Optional[str] = None  # Precomputed by the Summarizer service, see summary_pipeline
+
+# Article fields clients can select with ?fields=, headline listings omit the body text
+ARTICLE_FIELDS = set(NewsArticle.model_fields)
+HEADLINE_FIELDS = ARTICLE_FIELDS - {"paragraphs"}
 
 class NewsResponse(BaseModel):
     """Model for the API response"""
@@ -21,6 +26,18 @@ class NewsResponse(BaseModel):
     status: str
     message: Optional[str] = None
 
+    def project(self, fields: Set[str]) -> dict:
+        """Serialize the response keeping only the given article fields"""
+        return self.model_dump(
+            include={
+                "ticker": True,
+                "timestamp": True,
+                "status": True,
+                "message": True,
+                "articles": {"__all__": fields},
+            },
+        )
+
 class ErrorResponse(BaseModel):
     """Model for error responses"""
     status: str = "error"
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup
-from app.utils import timing, get_proxy_response
+from app.utils import timing, get_proxy_response, get_proxy_client
 import concurrent.futures
 from newspaper import Article
 from datetime import datetime
@@ -46,7 +46,7 @@ class BaseScraper(ABC):
         pass
 
     @timing
-    def get_news_content(self, ticker):
+    def get_news_content(self, ticker, include_body=True):
         url = self.get_url(ticker)
         response = requests.get(url, headers=self.headers)
         # TODO: Fix 401 error for marketplace
@@ -56,7 +56,9 @@ class BaseScraper(ABC):
         soup = self.parse_html(response.content)
         try:
             news_content = self.extract_news_content(soup, url)
-            self.fetch_article_contents(news_content)
+            # Headline-only requests skip the per-article downloads entirely
+            if include_body:
+                self.fetch_article_contents(news_content)
             return news_content
         except Exception as e:
             print(f"Error extracting news content: {e}")
@@ -80,30 +82,13 @@ class BaseScraper(ABC):
                     print(f"Error fetching article content: {exc}")
                     continue
 
-    # Same as fetch_article_contents but uses the SCRAPEOPS API, instead of Newspaper3k
+    # Same as fetch_article_contents but uses the SCRAPEOPS API, instead of Newspaper3k.
+    # All URLs are submitted to the shared proxy client in one batch, which enforces the plan's concurrency quota
     def fetch_article_contents_api(self, news_content):
         try:
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_url = {
-                    executor.submit(
-                        self.fetch_and_extract_single_article, article_url
-                    ): article_url
-                    for article_url in news_content["urls"]
-                }
-
-                for future in concurrent.futures.as_completed(future_to_url):
-                    url = future_to_url[future]
-                    try:
-                        article_text = future.result()
-                        index = news_content["urls"].index(url)
-                        news_content["paragraphs"][index] = article_text
-                    except Exception as exc:
-                        print(f"{url} generated an exception: {exc}")
-                        news_content["paragraphs"][
-                            index
-                        ] = ""  # Set empty string for failed fetches
-
+            responses = get_proxy_client().fetch_many(news_content["urls"], self.api_key)
+            for index, (url, response) in enumerate(zip(news_content["urls"], responses)):
+                news_content["paragraphs"][index] = self.extract_single_article(url, response)
             return news_content
         except Exception as e:
             print(f"Error in fetch_article_contents_api: {e}")
@@ -112,29 +97,36 @@ class BaseScraper(ABC):
     # Fetches and extracts the article content for a single URL using the SCRAPEOPS API
     def fetch_and_extract_single_article(self, url):
         try:
-            response = get_proxy_response(url, self.api_key)
-            if response.status_code != 200:
+            return self.extract_single_article(url, get_proxy_response(url, self.api_key))
+        except Exception as e:
+            print(f"Error fetching and extracting single article content: {e}")
+            return ""
+
+    # Extracts the article paragraphs from a proxy response, empty string for failed fetches
+    def extract_single_article(self, url, response):
+        try:
+            if response is None or response.status_code != 200:
                 raise Exception(f"Failed to fetch URL: {url}")
 
             soup = self.parse_html(response.text)
             article_details = self.extract_article_details(soup)
-            paragraphs = article_details.get("paragraphs", "")
-            return paragraphs
+            return article_details.get("paragraphs", "")
         except Exception as e:
-            print(f"Error fetching and extracting single article content: {e}")
+            print(f"{url} generated an exception: {e}")
             return ""
 
     @timing
-    def fetch_and_extract_article_api(self, ticker):
+    def fetch_and_extract_article_api(self, ticker, include_body=True):
         try:
             print("\nFetching article content using API")
             url = self.get_url(ticker)
             response = get_proxy_response(url, self.api_key)
-            print("\nRESPONSE: ", response.content)
             if response.status_code != 200:
                 raise Exception(f"Failed to fetch URL: {url}")
             soup = self.parse_html(response.content)
             news_content = self.extract_news_content(soup, url)
+            if not include_body:
+                return news_content
             return self.fetch_article_contents_api(news_content)
         except Exception as e:
             print(f"Error fetching and extracting article content: {e}")
@@ -1,14 +1,54 @@
 """
 Cache service implementation
+
+News is cached in two layers per ticker so headline listings never pull body text:
+    news:{ticker}:headlines  JSON list of articles without paragraphs
+    news:{ticker}:bodies     JSON object mapping article url -> paragraphs
+    news:{ticker}:digests    Hash of the content digest of each layer, used for ETags, and the
+                             JSON list of the headline layer's urls
+    news:{ticker}:hashes     Hash mapping article url -> content hash of its body
+
+Summaries precomputed by the Summarizer service live under {SUMMARY_KEY_PREFIX}:{content hash}
+and are attached to articles on read, they are never stored in the layers themselves.
+
+The Redis client is synchronous, so every call goes through ``asyncio.to_thread`` with its
+round trips batched into pipelines or multi-key commands, keeping the event loop free.
 """
-from typing import List, Optional
-from app.models.schemas import NewsArticle
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.schemas import NewsArticle, HEADLINE_FIELDS
+from app.services.summary_pipeline import content_hash
 from app.core.config import settings
+import asyncio
+import hashlib
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Summaries are attached on read, so they can arrive after the articles were cached
+_HEADLINE_LAYER_FIELDS = HEADLINE_FIELDS - {"summary"}
+
+def _serialize_layers(articles: List[NewsArticle]) -> Tuple[str, str]:
+    """Serialize articles into the headline and body layer payloads"""
+    headlines_json = json.dumps(
+        [article.model_dump(include=_HEADLINE_LAYER_FIELDS) for article in articles]
+    )
+    bodies_json = json.dumps({article.url: article.paragraphs or "" for article in articles})
+    return headlines_json, bodies_json
+
+def _digest(payload: str) -> str:
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def layer_digests(articles: List[NewsArticle]) -> Tuple[str, str]:
+    """Content digests of the headline and body layers for a set of articles"""
+    headlines_json, bodies_json = _serialize_layers(articles)
+    return _digest(headlines_json), _digest(bodies_json)
+
+def summaries_digest(summaries: Iterable[Optional[str]]) -> Optional[str]:
+    """Digest of the attached summaries, None when there are none"""
+    present = sorted(summary for summary in summaries if summary)
+    return _digest(json.dumps(present)) if present else None
+
 class CacheService:
     def __init__(self):
         self.use_cache = settings.USE_REDIS
@@ -25,34 +65,184 @@ class CacheService:
                 logger.error(f"Failed to initialize Redis: {e}")
                 self.use_cache = False
 
-    async def get_news(self, ticker: str) -> Optional[List[NewsArticle]]:
-        """Get cached news for a ticker"""
+    @staticmethod
+    def _headlines_key(ticker: str) -> str:
+        return f"news:{ticker}:headlines"
+
+    @staticmethod
+    def _bodies_key(ticker: str) -> str:
+        return f"news:{ticker}:bodies"
+
+    @staticmethod
+    def _digests_key(ticker: str) -> str:
+        return f"news:{ticker}:digests"
+
+    @staticmethod
+    def _hashes_key(ticker: str) -> str:
+        return f"news:{ticker}:hashes"
+
+    @staticmethod
+    def _summary_key(digest: str) -> str:
+        return f"{settings.SUMMARY_KEY_PREFIX}:{digest}"
+
+    async def get_validator(
+        self, ticker: str, include_body: bool = True
+    ) -> Optional[Tuple[str, Optional[str], int]]:
+        """
+        Get the cached layer digests and remaining TTL without loading any articles.
+
+        Returns:
+            Optional[Tuple[str, Optional[str], int]]: (headlines digest, bodies digest, ttl seconds),
+            or None when the requested layers are not cached
+        """
         if not self.use_cache:
             return None
-            
+
+        def read():
+            pipe = self.redis_client.pipeline()
+            pipe.hmget(self._digests_key(ticker), "headlines", "bodies")
+            pipe.ttl(self._headlines_key(ticker))
+            return pipe.execute()
+
         try:
-            cache_key = f"news:{ticker}"
-            cached = self.redis_client.get(cache_key)
+            (headlines, bodies), ttl = await asyncio.to_thread(read)
+            if not headlines or ttl is None or ttl <= 0:
+                return None
+            if include_body and not bodies:
+                return None
+            return (
+                headlines.decode(),
+                bodies.decode() if include_body else None,
+                ttl,
+            )
+        except Exception as e:
+            logger.error(f"Error getting cache validator: {e}")
+            return None
+
+    async def get_headlines(self, ticker: str) -> Optional[List[NewsArticle]]:
+        """Get cached headlines (articles without body text) for a ticker"""
+        if not self.use_cache:
+            return None
+
+        try:
+            cached = await asyncio.to_thread(self.redis_client.get, self._headlines_key(ticker))
             if cached:
                 return [NewsArticle(**article) for article in json.loads(cached)]
             return None
+        except Exception as e:
+            logger.error(f"Error getting cached headlines: {e}")
+            return None
+
+    async def get_news(self, ticker: str) -> Optional[List[NewsArticle]]:
+        """Get cached news with bodies for a ticker, None unless every article has a cached body"""
+        if not self.use_cache:
+            return None
+
+        try:
+            headlines, bodies = await asyncio.to_thread(
+                self.redis_client.mget, self._headlines_key(ticker), self._bodies_key(ticker)
+            )
+            if not headlines or not bodies:
+                return None
+
+            bodies = json.loads(bodies)
+            articles = json.loads(headlines)
+            if any(article["url"] not in bodies for article in articles):
+                # Headline layer was refreshed by a listing-only scrape
+                return None
+            return [
+                NewsArticle(**article, paragraphs=bodies[article["url"]])
+                for article in articles
+            ]
         except Exception as e:
             logger.error(f"Error getting cached news: {e}")
             return None
 
-    async def set_news(self, ticker: str, articles: List[NewsArticle]):
-        """Cache news for a ticker"""
+    async def attach_summaries(self, ticker: str, articles: List[NewsArticle]):
+        """Fill in article.summary from precomputed summaries, in place"""
+        if not self.use_cache or not articles:
+            return
+
+        def read() -> List[Optional[bytes]]:
+            # Hash bodies we have, look up the stored hash for headline-only articles
+            missing = [article.url for article in articles if not article.paragraphs]
+            stored = (
+                dict(zip(missing, self.redis_client.hmget(self._hashes_key(ticker), missing)))
+                if missing else {}
+            )
+            hashes = [
+                content_hash(article.paragraphs) if article.paragraphs
+                else (stored[article.url].decode() if stored.get(article.url) else None)
+                for article in articles
+            ]
+            keys = [self._summary_key(h) for h in hashes if h]
+            found = iter(self.redis_client.mget(keys) if keys else [])
+            return [next(found) if h else None for h in hashes]
+
+        try:
+            summaries = await asyncio.to_thread(read)
+            for article, summary in zip(articles, summaries):
+                article.summary = summary.decode() if summary else None
+        except Exception as e:
+            logger.error(f"Error attaching summaries: {e}")
+
+    async def get_summaries_digest(self, ticker: str) -> Optional[str]:
+        """
+        Digest of the stored summaries of the cached headline layer, for conditional requests.
+
+        Matches ``summaries_digest`` of the articles a full read returns: only the urls of the
+        current layer count, not every article seen within SEEN_ARTICLE_TTL.
+        """
+        if not self.use_cache:
+            return None
+
+        def read() -> List[Optional[bytes]]:
+            urls = json.loads(self.redis_client.hget(self._digests_key(ticker), "urls") or "[]")
+            if not urls:
+                return []
+            hashes = [h for h in self.redis_client.hmget(self._hashes_key(ticker), urls) if h]
+            if not hashes:
+                return []
+            return self.redis_client.mget([self._summary_key(h.decode()) for h in hashes])
+
+        try:
+            summaries = await asyncio.to_thread(read)
+            return summaries_digest(s.decode() for s in summaries if s)
+        except Exception as e:
+            logger.error(f"Error getting summaries digest: {e}")
+            return None
+
+    async def set_news(self, ticker: str, articles: List[NewsArticle], include_body: bool = True):
+        """Cache news for a ticker, the body layer is only written when bodies were scraped"""
         if not self.use_cache:
             return
-            
+
         try:
-            cache_key = f"news:{ticker}"
-            articles_json = json.dumps([article.dict() for article in articles])
-            self.redis_client.setex(
-                cache_key,
-                settings.CACHE_EXPIRATION,
-                articles_json
-            )
-            logger.debug(f"Cached {len(articles)} articles for {ticker}")
+            headlines_json, bodies_json = _serialize_layers(articles)
+            digests = {
+                "headlines": _digest(headlines_json),
+                "urls": json.dumps([article.url for article in articles]),
+            }
+            pipe = self.redis_client.pipeline()
+            pipe.setex(self._headlines_key(ticker), settings.CACHE_EXPIRATION, headlines_json)
+            if include_body:
+                digests["bodies"] = _digest(bodies_json)
+                pipe.setex(self._bodies_key(ticker), settings.CACHE_EXPIRATION, bodies_json)
+                hashes = {
+                    article.url: content_hash(article.paragraphs)
+                    for article in articles
+                    if article.paragraphs
+                }
+                if hashes:
+                    # Outlives the layers so summaries stay attachable to headline-only listings
+                    pipe.hset(self._hashes_key(ticker), mapping=hashes)
+                    pipe.expire(self._hashes_key(ticker), settings.SEEN_ARTICLE_TTL)
+            else:
+                # A new headline set invalidates the body digest of the previous set
+                pipe.hdel(self._digests_key(ticker), "bodies")
+            pipe.hset(self._digests_key(ticker), mapping=digests)
+            pipe.expire(self._digests_key(ticker), settings.CACHE_EXPIRATION)
+            await asyncio.to_thread(pipe.execute)
+            logger.debug(f"Cached {len(articles)} articles for {ticker} (bodies: {include_body})")
         except Exception as e:
-            logger.error(f"Error caching news: {e}")
\ No newline at end of file
+            logger.error(f"Error caching news: {e}")
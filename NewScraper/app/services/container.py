@@ -0,0 +1,76 @@
+"""
+Lazily built service container.
+
+Heavy dependencies (scrapers, newspaper3k, bs4, the Redis client) are only imported and
+constructed on first use or by the background warm-up started from the app lifespan, so
+the process can accept liveness probes before they are ready.
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from app.services.news_service import NewsService
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Owns the application's long-lived services.
+
+    Attributes:
+        startup_error (Optional[str]): Last error raised while building services
+        warm_up_task (Optional[asyncio.Task]): Background warm-up started at startup
+    """
+
+    def __init__(self) -> None:
+        self._news_service: Optional["NewsService"] = None
+        self._lock = asyncio.Lock()
+        self.startup_error: Optional[str] = None
+        self.warm_up_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._news_service is not None
+
+    async def get_news_service(self) -> "NewsService":
+        """Return the shared NewsService, building it on first use"""
+        if self._news_service is None:
+            async with self._lock:
+                if self._news_service is None:
+                    # Importing and constructing scrapers is blocking, keep it off the event loop
+                    self._news_service = await asyncio.to_thread(self._build_news_service)
+                    self.startup_error = None
+        return self._news_service
+
+    @staticmethod
+    def _build_news_service() -> "NewsService":
+        from app.services.news_service import NewsService
+
+        return NewsService()
+
+    async def warm_up(self) -> None:
+        """Build all services ahead of the first request, recording rather than raising failures"""
+        try:
+            await self.get_news_service()
+            logger.info("Services warmed up")
+        except Exception as e:
+            self.startup_error = str(e)
+            logger.exception("Service warm-up failed, will retry on first request")
+
+    def start_warm_up(self) -> None:
+        self.warm_up_task = asyncio.create_task(self.warm_up())
+
+    async def shutdown(self) -> None:
+        if self.warm_up_task and not self.warm_up_task.done():
+            self.warm_up_task.cancel()
+
+        if self._news_service is not None:
+            await self._news_service.close()
+
+        from app.utils.proxy import get_proxy_client
+
+        if get_proxy_client.cache_info().currsize:
+            logger.info(f"Proxy usage: {get_proxy_client().stats()}")
+            get_proxy_client().close()
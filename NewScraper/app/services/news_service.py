@@ -4,9 +4,11 @@ News service implementation
 from fastapi import BackgroundTasks
 from app.models.schemas import NewsResponse, NewsArticle
 from app.services.cache import CacheService
+from app.services.summary_pipeline import SummaryPublisher
+from app.core.config import settings
 from app.scrapers import YahooScraper, ReutersScraper
 from app.config.source_configs import SOURCES
-from typing import List
+from typing import List, Optional, Tuple
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -25,6 +27,13 @@ class NewsService:
             except Exception as cache_error:
                 logger.warning(f"Cache service not available: {cache_error}")
                 self.cache_service = None
+
+            # Send newly seen articles to the Summarizer service
+            self.summary_publisher = None
+            if settings.SUMMARY_PIPELINE:
+                redis_client = self.cache_service.redis_client if self.summaries_enabled else None
+                self.summary_publisher = SummaryPublisher(redis_client)
+                logger.debug(f"Summary pipeline enabled ({settings.SUMMARY_PUBLISHER})")
             
             # Initialize scrapers
             self.scrapers = [
@@ -37,16 +46,30 @@ class NewsService:
             logger.exception("Error initializing NewsService")
             raise
 
-    async def get_news(self, ticker: str, background_tasks: BackgroundTasks) -> NewsResponse:
-        """Get news for a ticker from cache or scrape it"""
+    async def get_news(
+        self, ticker: str, background_tasks: BackgroundTasks, include_body: bool = True
+    ) -> NewsResponse:
+        """
+        Get news for a ticker from cache or scrape it
+
+        Args:
+            ticker: Stock ticker symbol
+            background_tasks: FastAPI background tasks used for cache writes
+            include_body: Fetch article bodies; headline listings pass False to skip them
+        """
         try:
-            logger.debug(f"Getting news for ticker: {ticker}")
+            logger.debug(f"Getting news for ticker: {ticker} (bodies: {include_body})")
             
             # Check cache if available
             if self.cache_service and self.cache_service.use_cache:
-                cached_news = await self.cache_service.get_news(ticker)
+                if include_body:
+                    cached_news = await self.cache_service.get_news(ticker)
+                else:
+                    cached_news = await self.cache_service.get_headlines(ticker)
                 if cached_news:
                     logger.debug(f"Cache hit for ticker {ticker}")
+                    if self.summaries_enabled:
+                        await self.cache_service.attach_summaries(ticker, cached_news)
                     return NewsResponse(
                         ticker=ticker,
                         articles=cached_news,
@@ -56,12 +79,16 @@ class NewsService:
 
             # Scrape news if not in cache
             logger.debug(f"Scraping fresh news for {ticker}")
-            articles = await self._scrape_all_sources(ticker)
+            articles = await self._scrape_all_sources(ticker, include_body)
             
             # Cache results in background if cache service is available
             if self.cache_service and self.cache_service.use_cache:
                 logger.debug(f"Scheduling cache update for {ticker}")
-                background_tasks.add_task(self.cache_service.set_news, ticker, articles)
+                background_tasks.add_task(self.cache_service.set_news, ticker, articles, include_body)
+            if self.summaries_enabled:
+                await self.cache_service.attach_summaries(ticker, articles)
+            if self.summary_publisher and include_body:
+                background_tasks.add_task(self.summary_publisher.publish_new, ticker, articles)
             
             return NewsResponse(
                 ticker=ticker,
@@ -73,7 +100,32 @@ class NewsService:
             logger.exception(f"Error getting news for {ticker}")
             raise
 
-    async def _scrape_all_sources(self, ticker: str) -> List[NewsArticle]:
+    @property
+    def summaries_enabled(self) -> bool:
+        """Summaries are attached when the pipeline is on and Redis holds them"""
+        return bool(
+            settings.SUMMARY_PIPELINE and self.cache_service and self.cache_service.use_cache
+        )
+
+    async def get_summaries_digest(self, ticker: str) -> Optional[str]:
+        """Digest of the precomputed summaries available for a ticker, part of the ETag"""
+        if self.summaries_enabled:
+            return await self.cache_service.get_summaries_digest(ticker)
+        return None
+
+    async def close(self):
+        if self.summary_publisher:
+            await self.summary_publisher.close()
+
+    async def get_cache_validator(
+        self, ticker: str, include_body: bool = True
+    ) -> Optional[Tuple[str, Optional[str], int]]:
+        """Cached layer digests and remaining TTL for conditional requests, None if not cached"""
+        if self.cache_service and self.cache_service.use_cache:
+            return await self.cache_service.get_validator(ticker, include_body)
+        return None
+
+    async def _scrape_all_sources(self, ticker: str, include_body: bool = True) -> List[NewsArticle]:
         """Scrape news from all sources in parallel"""
         articles = []
         
@@ -84,12 +136,12 @@ class NewsService:
                 
                 if source_name == "Reuters":
                     logger.debug(f"Using API method for {source_name}")
-                    news = scraper.fetch_and_extract_article_api(ticker)
-                    print("\nLENGTH OF REUTERS: ", len(news["titles"]))
+                    news = scraper.fetch_and_extract_article_api(ticker, include_body)
+                    logger.debug(f"{source_name} returned {len(news['titles'])} titles")
                 else:
                     logger.debug(f"Using standard method for {source_name}")
-                    news = scraper.get_news_content(ticker)
-                    print("\nLENGTH OF YAHOO: ", len(news["titles"]))
+                    news = scraper.get_news_content(ticker, include_body)
+                    logger.debug(f"{source_name} returned {len(news['titles'])} titles")
                 
                 if news and news.get("titles"):
                     source_articles = [
@@ -0,0 +1,131 @@
+"""
+Summary pipeline publisher
+
+Article bodies seen for the first time are sent to the Summarizer service as bulk summary
+requests, keyed by the SHA-256 of the body text:
+    news:seen:{hash}           Marks a body as already sent, expires after SEEN_ARTICLE_TTL
+    {SUMMARY_KEY_PREFIX}:{hash}  Summary written back by the Summarizer, read by CacheService
+
+Requests go to SUMMARY_REQUEST_TOPIC, either as a Redis stream entry (field "value") or a
+Kafka record, both holding the same JSON payload. Redis commands are pipelined and run in a
+worker thread, the client is synchronous.
+"""
+from collections import OrderedDict
+from typing import Iterable, List
+from app.models.schemas import NewsArticle
+from app.core.config import settings
+import asyncio
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seen hashes remembered in memory when Redis is not available
+_LOCAL_SEEN_LIMIT = 10000
+
+def content_hash(text: str) -> str:
+    """Hash identifying an article body across scrapes and services"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class SummaryPublisher:
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client
+        self.transport = settings.SUMMARY_PUBLISHER
+        self._seen = OrderedDict()
+        self._producer = None
+
+    async def publish_new(self, ticker: str, articles: List[NewsArticle]):
+        """Send summary requests for the article bodies that have not been sent before"""
+        by_hash = {
+            content_hash(article.paragraphs): article
+            for article in articles
+            if article.paragraphs
+        }
+        new_hashes = []
+        try:
+            new_hashes = await asyncio.to_thread(self._claim_new, by_hash)
+            if not new_hashes:
+                return
+            messages = [self._request(ticker, h, by_hash[h]) for h in new_hashes]
+            await self._send(messages)
+            logger.debug(f"Published {len(messages)} summary requests for {ticker}")
+        except Exception as e:
+            logger.error(f"Error publishing summary requests for {ticker}: {e}")
+            # Let the next scrape try these articles again
+            await asyncio.to_thread(self._release, new_hashes)
+
+    async def close(self):
+        if self._producer is not None:
+            await self._producer.stop()
+            self._producer = None
+
+    def _claim_new(self, hashes: Iterable[str]) -> List[str]:
+        """Mark hashes as seen, returning only those that were not seen before"""
+        hashes = list(hashes)
+        if self.redis_client is None:
+            new = [h for h in hashes if h not in self._seen]
+            for h in new:
+                self._seen[h] = None
+            while len(self._seen) > _LOCAL_SEEN_LIMIT:
+                self._seen.popitem(last=False)
+            return new
+
+        pipe = self.redis_client.pipeline()
+        for h in hashes:
+            pipe.set(f"news:seen:{h}", 1, nx=True, ex=settings.SEEN_ARTICLE_TTL)
+        return [h for h, claimed in zip(hashes, pipe.execute()) if claimed]
+
+    def _release(self, hashes: List[str]):
+        if self.redis_client is None:
+            for h in hashes:
+                self._seen.pop(h, None)
+            return
+        try:
+            if hashes:
+                self.redis_client.delete(*(f"news:seen:{h}" for h in hashes))
+        except Exception as e:
+            logger.error(f"Error releasing seen articles: {e}")
+
+    @staticmethod
+    def _request(ticker: str, digest: str, article: NewsArticle) -> bytes:
+        return json.dumps({
+            # Equal bodies share a request id, so the Summarizer deduplicates them
+            "request_id": f"news:{digest}",
+            "user_id": "newscraper",
+            "priority": "bulk",
+            "content": article.paragraphs,
+            "content_hash": digest,
+            "ticker": ticker,
+            "url": article.url,
+            "title": article.title,
+            "source": article.source,
+        }).encode("utf-8")
+
+    async def _send(self, messages: List[bytes]):
+        if self.transport == "kafka":
+            producer = await self._get_producer()
+            deliveries = [await producer.send(settings.SUMMARY_REQUEST_TOPIC, message) for message in messages]
+            for delivery in deliveries:
+                await delivery
+            return
+
+        if self.redis_client is None:
+            raise RuntimeError("SUMMARY_PUBLISHER=redis requires USE_REDIS")
+        pipe = self.redis_client.pipeline()
+        for message in messages:
+            pipe.xadd(settings.SUMMARY_REQUEST_TOPIC, {"value": message})
+        await asyncio.to_thread(pipe.execute)
+
+    async def _get_producer(self):
+        if self._producer is None:
+            from aiokafka import AIOKafkaProducer
+
+            producer = AIOKafkaProducer(bootstrap_servers=settings.KAFKA_SERVERS, linger_ms=50)
+            try:
+                await producer.start()
+            except Exception:
+                await producer.stop()
+                raise
+            self._producer = producer
+        return self._producer
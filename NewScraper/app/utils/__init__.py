@@ -1,5 +1,6 @@
 from .decorators import timing, retry
-from .proxy import get_proxy_response
+from .proxy import ProxyClient, get_proxy_client, get_proxy_response
 from .helpers import save_to_json, is_within_last_24_hours
+from .http_cache import make_etag, etag_matches, cache_headers
 
-__all__ = ["timing", "retry", "get_proxy_response", "save_to_json", "is_within_last_24_hours"]
+__all__ = ["timing", "retry", "ProxyClient", "get_proxy_client", "get_proxy_response", "save_to_json", "is_within_last_24_hours", "make_etag", "etag_matches", "cache_headers"]
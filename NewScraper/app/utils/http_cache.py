@@ -0,0 +1,41 @@
+"""
+HTTP caching helpers: content-hash ETags and Cache-Control headers
+"""
+import hashlib
+from typing import Dict, Iterable, Optional
+
+
+def make_etag(
+    headlines_digest: str,
+    bodies_digest: Optional[str],
+    fields: Iterable[str],
+    summaries_digest: Optional[str] = None,
+) -> str:
+    """
+    Build a strong ETag from the cache layer digests and the selected article fields.
+
+    The field selection is part of the tag so a headline listing and a full response
+    for the same articles never validate against each other. Summaries are attached
+    after caching, so their digest is mixed in separately.
+    """
+    material = f"{headlines_digest}:{bodies_digest or ''}:{','.join(sorted(fields))}:{summaries_digest or ''}"
+    return f'"{hashlib.sha1(material.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag using weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    """Response headers letting clients and shared caches reuse the response for max_age seconds"""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(int(max_age), 0)}",
+        "Vary": "X-API-Key, Accept-Encoding",
+    }
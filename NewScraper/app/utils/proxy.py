@@ -1,15 +1,194 @@
+"""
+ScrapeOps proxy client.
+
+All proxied requests go through a single pooled ``requests.Session`` so TCP/TLS
+connections to the proxy endpoint are reused, and a process-wide semaphore keeps
+the number of in-flight requests within the concurrency allowed by the plan.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
 import requests
-from urllib.parse import urlencode
-from app.utils import timing
-
-def get_proxy_response(url, api_key):
-    proxy_params = {
-        "api_key": api_key,
-        "url": url,
-    }
-
-    response = requests.get(
-        url="https://proxy.scrapeops.io/v1/",
-        params=urlencode(proxy_params),
-    )
-    return response
\ No newline at end of file
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another attempt: throttling, proxy-side failures and timeouts
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 520, 524}
+
+
+@dataclass
+class ProxyUsage:
+    """Running totals of proxy calls and the credits they consumed"""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    credits: int = 0
+    total_latency: float = 0.0
+    by_status: Dict[int, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "credits": self.credits,
+            "avg_latency": self.total_latency / self.requests if self.requests else 0.0,
+            "by_status": dict(self.by_status),
+        }
+
+
+class ProxyClient:
+    """
+    Thread-safe client for the ScrapeOps proxy API.
+
+    Attributes:
+        api_key (str): ScrapeOps API key
+        proxy_url (str): Proxy endpoint, taken from ``settings.PROXY_URL``
+        max_concurrency (int): Maximum number of simultaneous proxy requests
+        usage (ProxyUsage): Call and credit accounting
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        proxy_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.api_key = api_key or settings.SCRAPEOPS_API_KEY
+        self.proxy_url = proxy_url or settings.PROXY_URL
+        self.max_concurrency = max_concurrency or settings.PROXY_MAX_CONCURRENCY
+        self.timeout = (settings.PROXY_CONNECT_TIMEOUT, settings.PROXY_READ_TIMEOUT)
+        self.max_retries = settings.PROXY_MAX_RETRIES
+        self.usage = ProxyUsage()
+
+        self._quota = threading.BoundedSemaphore(self.max_concurrency)
+        self._usage_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="scrapeops"
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_concurrency,
+            max_retries=0,  # Retries are handled in get() with jittered backoff
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, api_key: Optional[str] = None) -> requests.Response:
+        """
+        Fetch a URL through the proxy, retrying throttled or failed attempts.
+
+        Args:
+            url (str): Target URL to scrape
+            api_key (Optional[str]): Override for the configured API key
+
+        Returns:
+            requests.Response: Final response (possibly non-200 once retries are exhausted)
+
+        Raises:
+            requests.RequestException: If every attempt failed at the connection level
+        """
+        params = {"api_key": api_key or self.api_key, "url": url}
+        response: Optional[requests.Response] = None
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._record(retry=True)
+                time.sleep(self._backoff(attempt))
+
+            start = time.perf_counter()
+            try:
+                with self._quota:
+                    response = self.session.get(
+                        self.proxy_url, params=params, timeout=self.timeout
+                    )
+            except requests.RequestException as e:
+                last_error = e
+                self._record(latency=time.perf_counter() - start)
+                logger.warning(f"Proxy request for {url} failed (attempt {attempt + 1}): {e}")
+                continue
+
+            self._record(latency=time.perf_counter() - start, status=response.status_code)
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            logger.warning(
+                f"Proxy returned {response.status_code} for {url} (attempt {attempt + 1})"
+            )
+
+        if response is None:
+            raise last_error
+        return response
+
+    def fetch_many(
+        self, urls: List[str], api_key: Optional[str] = None
+    ) -> List[Optional[requests.Response]]:
+        """
+        Submit a batch of URLs at once and collect the responses in input order.
+
+        Failed fetches are returned as ``None`` so one bad URL does not sink the batch.
+        """
+        futures = [self._executor.submit(self.get, url, api_key) for url in urls]
+        responses = []
+        for url, future in zip(urls, futures):
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                logger.error(f"Error fetching {url} through proxy: {e}")
+                responses.append(None)
+        return responses
+
+    def stats(self) -> dict:
+        """Snapshot of proxy usage so far"""
+        with self._usage_lock:
+            return self.usage.as_dict()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        ceiling = min(settings.PROXY_BACKOFF_MAX, settings.PROXY_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _record(self, latency: float = 0.0, status: Optional[int] = None, retry: bool = False):
+        with self._usage_lock:
+            if retry:
+                self.usage.retries += 1
+                return
+            self.usage.requests += 1
+            self.usage.total_latency += latency
+            if status is None:
+                self.usage.failures += 1
+                return
+            self.usage.by_status[status] = self.usage.by_status.get(status, 0) + 1
+            if status == 200:
+                # ScrapeOps only bills successful requests
+                self.usage.successes += 1
+                self.usage.credits += settings.PROXY_CREDITS_PER_REQUEST
+            else:
+                self.usage.failures += 1
+
+
+@lru_cache
+def get_proxy_client() -> ProxyClient:
+    """Process-wide proxy client shared by all scrapers"""
+    return ProxyClient()
+
+
+def get_proxy_response(url, api_key=None):
+    return get_proxy_client().get(url, api_key)
@@ -0,0 +1,30 @@
+from dataclasses import replace
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.models.summarizer import SummaryRequest
+from app.services.summarizer import SummarizerService
+
+
+async def get_summarizer(request: Request) -> SummarizerService:
+    """The shared summarizer service, waiting for it if the model is still loading."""
+    try:
+        return await request.app.state.model_loader.get_service()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Summarizer unavailable: {str(e)}")
+
+
+def http_summary_request(body: SummaryRequest, request: Request) -> SummaryRequest:
+    """
+    The request body, scheduled as an interactive request of the calling user.
+
+    ``priority`` and ``user_id`` in the body are ignored, callers could otherwise escape
+    their fair share. The user comes from USER_ID_HEADER, which the gateway sets after
+    authenticating the caller, or else from the client address. Bulk traffic arrives
+    through the message transport.
+    """
+    user_id = request.headers.get(settings.USER_ID_HEADER) if settings.USER_ID_HEADER else None
+    if not user_id:
+        user_id = request.client.host if request.client else "anonymous"
+    return replace(body, priority="interactive", user_id=user_id)
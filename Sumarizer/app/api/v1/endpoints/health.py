@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/live")
+async def liveness() -> Dict[str, Any]:
+    """Process is up and serving requests, never waits for the model."""
+    return {"status": "alive", "service": "summarizer"}
+
+@router.get("/ready")
+async def readiness(request: Request) -> JSONResponse:
+    """
+    Report whether this replica should receive traffic.
+
+    Returns 503 until the model is loaded and has run its warm-up batch.
+    """
+    loader = request.app.state.model_loader
+    checks = {
+        "model": loader.state,
+        "model_name": settings.MODEL_NAME,
+        "backend": settings.INFERENCE_BACKEND,
+    }
+    if loader.load_seconds is not None:
+        checks["load_seconds"] = round(loader.load_seconds, 2)
+    if loader.warm_up_seconds is not None:
+        checks["warm_up_seconds"] = round(loader.warm_up_seconds, 2)
+    if loader.startup_error:
+        checks["error"] = loader.startup_error
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if loader.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if loader.ready else "not_ready", "checks": checks},
+    )
@@ -1,17 +1,82 @@
-from fastapi import APIRouter, HTTPException
+from contextlib import aclosing
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_summarizer, http_summary_request
 from app.models.summarizer import SummaryRequest, SummaryResponse
+from app.services.scheduler import QueueFullError
 from app.services.summarizer import SummarizerService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
-summarizer_service = SummarizerService()
+
+def _too_many_requests(error: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
 
 @router.post("/summarize", response_model=SummaryResponse)
-async def summarize_text(request: SummaryRequest):
+async def summarize_text(
+    request: SummaryRequest = Depends(http_summary_request),
+    summarizer_service: SummarizerService = Depends(get_summarizer),
+):
     """Generate summary for provided text content."""
     try:
         return await summarizer_service.summarize(request)
+    except QueueFullError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Summarization failed: {str(e)}"
         )
+
+@router.post("/summarize/stream")
+async def summarize_text_stream(
+    http_request: Request,
+    request: SummaryRequest = Depends(http_summary_request),
+    summarizer_service: SummarizerService = Depends(get_summarizer),
+):
+    """
+    Stream chunk summaries as Server-Sent Events while the summary is generated.
+
+    Emits one ``chunk`` event per summarized chunk, then a final ``summary`` event.
+    Generation of queued chunks stops as soon as the client disconnects.
+    """
+    # Cache lookup and admission run before the 200 and the event stream headers are sent
+    try:
+        stream = await summarizer_service.summarize_stream(request)
+    except QueueFullError as e:
+        raise _too_many_requests(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Summarization failed: {str(e)}"
+        )
+
+    async def events():
+        try:
+            async with aclosing(stream):
+                async for event in stream:
+                    if await http_request.is_disconnected():
+                        logger.info("Client disconnected, cancelling summary stream")
+                        break
+                    yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            logger.error(f"Summary stream failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': f'Summarization failed: {str(e)}'})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/queue")
+async def queue_metrics(summarizer_service: SummarizerService = Depends(get_summarizer)):
+    """Queue depth, limits, wait times and batching throughput per priority class."""
+    return summarizer_service.batcher.metrics()
@@ -0,0 +1,147 @@
+"""
+Pluggable CPU inference backends for seq2seq summarization models.
+
+Backends are selected with ``settings.INFERENCE_BACKEND``:
+
+- ``torch``: full-precision PyTorch model (reference output)
+- ``int8``: PyTorch model with dynamic int8 quantization of every ``nn.Linear``
+- ``onnx``: ONNX Runtime encoder-decoder exported with optimum (``pip install optimum[onnxruntime]``)
+
+Every backend returns an object exposing the Hugging Face ``generate`` API, so the rest of
+the service does not care which one is active.
+
+Typical usage:
+    model = load_backend_model("sshleifer/distilbart-cnn-12-6", "int8")
+    report = check_parity("sshleifer/distilbart-cnn-12-6", "int8", texts)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _load_torch(name: str) -> Any:
+    # low_cpu_mem_usage avoids materializing a second, randomly initialized copy
+    # of the weights while the checkpoint is read (safetensors files are mmapped)
+    model = AutoModelForSeq2SeqLM.from_pretrained(name, low_cpu_mem_usage=True)
+    model.eval()
+    model.requires_grad_(False)
+    return model
+
+
+def _load_int8(name: str) -> Any:
+    model = _load_torch(name)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(name: str) -> Any:
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError(
+            "The onnx backend requires optimum[onnxruntime] to be installed"
+        ) from e
+
+    session_options = onnxruntime.SessionOptions()
+    if settings.TORCH_NUM_THREADS:
+        session_options.intra_op_num_threads = settings.TORCH_NUM_THREADS
+    session_options.inter_op_num_threads = settings.TORCH_INTEROP_THREADS
+
+    # Export once and reuse the exported graphs on later starts
+    export_dir = Path(settings.ONNX_CACHE_DIR) / re.sub(r"[^\w.-]", "_", name)
+    if export_dir.exists():
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=session_options)
+
+    logger.info(f"Exporting {name} to ONNX in {export_dir}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        name, export=True, session_options=session_options
+    )
+    model.save_pretrained(export_dir)
+    return model
+
+
+BACKENDS: Dict[str, Callable[[str], Any]] = {
+    "torch": _load_torch,
+    "int8": _load_int8,
+    "onnx": _load_onnx,
+}
+
+
+def load_backend_model(name: str, backend: str) -> Any:
+    """
+    Load a model with the given inference backend.
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {list(BACKENDS)}")
+    return BACKENDS[backend](name)
+
+
+@dataclass
+class ParityReport:
+    """Comparison of a backend's summaries against the PyTorch reference."""
+
+    backend: str
+    exact_matches: int = 0
+    total: int = 0
+    token_f1: List[float] = field(default_factory=list)
+
+    @property
+    def exact_match_rate(self) -> float:
+        return self.exact_matches / self.total if self.total else 0.0
+
+    @property
+    def mean_token_f1(self) -> float:
+        return sum(self.token_f1) / len(self.token_f1) if self.token_f1 else 0.0
+
+
+def _token_f1(reference: str, candidate: str) -> float:
+    ref, cand = reference.split(), candidate.split()
+    if not ref and not cand:
+        return 1.0
+    common = sum(min(ref.count(token), cand.count(token)) for token in set(cand))
+    if not common:
+        return 0.0
+    precision, recall = common / len(cand), common / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def check_parity(
+    name: str, backend: str, texts: List[str], min_length: int = 20, max_length: int = 128
+) -> ParityReport:
+    """
+    Summarize ``texts`` with the PyTorch reference and with ``backend`` using greedy
+    decoding, and report how closely the outputs agree.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(name)
+    reference_model = _load_torch(name)
+    candidate_model = load_backend_model(name, backend)
+
+    def summarize(model: Any, text: str) -> str:
+        inputs = tokenizer(text, max_length=max_length, truncation=True, return_tensors="pt")
+        with torch.inference_mode():
+            ids = model.generate(
+                **inputs, num_beams=1, do_sample=False, min_length=min_length, max_length=max_length
+            )
+        return tokenizer.decode(ids[0], skip_special_tokens=True)
+
+    report = ParityReport(backend=backend)
+    for text in texts:
+        reference = summarize(reference_model, text)
+        candidate = summarize(candidate_model, text)
+        report.total += 1
+        report.exact_matches += int(reference == candidate)
+        report.token_f1.append(_token_f1(reference, candidate))
+    return report
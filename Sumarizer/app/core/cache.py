@@ -1,23 +1,245 @@
-import redis
-import json
+"""
+Summary cache.
+
+Entries are namespaced and keyed by everything that changes the output, not just the text:
+
+    {namespace}:summary:{model}:{backend}:{params}:{content}  final summary of a document
+    {namespace}:chunk:{model}:{backend}:{params}:{tokens}     summary of a single chunk
+    {namespace}:minhash:{model}:{backend}:{params}:{content}  MinHash signature of a document
+    {namespace}:lsh:{model}:{backend}:{params}:{band}:{hash}  set of content digests in an LSH bucket
+
+``params`` is a digest of the generation settings (and, for whole documents, the reduce
+strategy), so a request with a different ``max_length`` never sees another request's summary.
+Chunk entries are keyed by the chunk's token ids, which lets an edited document reuse the
+summaries of the chunks it did not touch. Values are zlib-compressed UTF-8.
+
+Documents that miss the exact key can still hit a near-duplicate: their MinHash signature is
+looked up in the LSH buckets, and the stored summary of a candidate whose estimated Jaccard
+similarity reaches ``NEAR_DUPLICATE_THRESHOLD`` is returned.
+
+With ``CACHE_ENABLED=False`` every lookup misses and nothing is written, which benchmarks use
+to measure inference alone. Article summaries for NewScraper are still published.
+"""
 import hashlib
+import json
+import logging
+import zlib
+from dataclasses import asdict
+from typing import List, Optional, Sequence
+
+import numpy as np
+import redis.asyncio as redis
+
 from app.core.config import settings
+from app.core.similarity import MinHasher
+from app.models.summarizer import GenerationParams
+from app.services.chunker import Chunk
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _params_digest(params: GenerationParams, **extra) -> str:
+    """Short, stable digest of generation settings plus any document-level options."""
+    payload = json.dumps({**asdict(params), **extra}, sort_keys=True)
+    return _digest(payload.encode())[:16]
+
 
 class CacheManager:
-    def __init__(self):
-        self.redis = redis.from_url(settings.REDIS_URL)
-        
-    def get_cache_key(self, content: str) -> str:
-        """Generate cache key from content."""
-        return hashlib.md5(content.encode()).hexdigest()
-        
-    async def get_summary(self, content: str) -> str | None:
+    """
+    Async, pooled Redis cache for document and chunk summaries.
+
+    Cache failures are logged and treated as misses, a Redis outage never fails a request.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        namespace: Optional[str] = None,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        self.redis = redis.from_url(
+            redis_url or settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        self.namespace = namespace or settings.CACHE_NAMESPACE
+        self.model_tag = f"{model_name or settings.MODEL_NAME}:{backend or settings.INFERENCE_BACKEND}"
+        self.enabled = settings.CACHE_ENABLED
+        self.ttl = settings.CACHE_TTL
+        self.threshold = settings.NEAR_DUPLICATE_THRESHOLD
+        self.minhasher = (
+            MinHasher(
+                num_perm=settings.MINHASH_PERMUTATIONS,
+                bands=settings.LSH_BANDS,
+                shingle_size=settings.SHINGLE_SIZE,
+            )
+            if settings.NEAR_DUPLICATE_CACHE and self.enabled
+            else None
+        )
+
+    def summary_key(self, content: str, params: GenerationParams, **options) -> str:
+        """Key of a whole-document summary, ``options`` are strategy-level settings."""
+        return self._document_key("summary", _params_digest(params, **options), _digest(content.encode()))
+
+    def _document_key(self, kind: str, params_digest: str, content_digest: str) -> str:
+        return f"{self.namespace}:{kind}:{self.model_tag}:{params_digest}:{content_digest}"
+
+    def _bucket_keys(self, params_digest: str, signature: np.ndarray) -> List[str]:
+        return [
+            f"{self.namespace}:lsh:{self.model_tag}:{params_digest}:{band}:{band_key}"
+            for band, band_key in enumerate(self.minhasher.band_keys(signature))
+        ]
+
+    def chunk_key(self, chunk: Chunk, params: GenerationParams) -> str:
+        """Key of a single chunk summary, derived from the chunk's token ids."""
+        tokens = ",".join(map(str, chunk.input_ids)).encode()
+        return f"{self.namespace}:chunk:{self.model_tag}:{_params_digest(params)}:{_digest(tokens)}"
+
+    async def get_summary(self, content: str, params: GenerationParams, **options) -> str | None:
         """Get cached summary."""
-        key = self.get_cache_key(content)
-        cached = self.redis.get(key)
-        return cached.decode() if cached else None
-        
-    async def set_summary(self, content: str, summary: str):
-        """Cache summary with TTL."""
-        key = self.get_cache_key(content)
-        self.redis.setex(key, settings.CACHE_TTL, summary)
+        if not self.enabled:
+            return None
+        try:
+            cached = await self.redis.get(self.summary_key(content, params, **options))
+        except Exception as e:
+            logger.warning(f"Summary cache lookup failed: {e}")
+            return None
+        return self._decode(cached)
+
+    async def get_similar_summary(
+        self, signature: np.ndarray, params: GenerationParams, **options
+    ) -> str | None:
+        """
+        Get the cached summary of the most similar indexed document.
+
+        Args:
+            signature: MinHash signature of the requested content, from ``self.minhasher``
+            params: Generation settings, only documents summarized with the same ones match
+
+        Returns:
+            str | None: Summary of the best candidate at or above the threshold, else None
+        """
+        if not self.enabled:
+            return None
+        params_digest = _params_digest(params, **options)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in self._bucket_keys(params_digest, signature):
+                pipe.smembers(key)
+            candidates = sorted(set().union(*await pipe.execute()))[: settings.MAX_NEAR_DUPLICATE_CANDIDATES]
+            if not candidates:
+                return None
+
+            stored = await self.redis.mget(
+                [self._document_key("minhash", params_digest, c.decode()) for c in candidates]
+            )
+            best, best_score = None, self.threshold
+            for candidate, value in zip(candidates, stored):
+                if value is None:
+                    continue
+                score = MinHasher.similarity(signature, np.frombuffer(value, dtype=np.uint64))
+                if score >= best_score:
+                    best, best_score = candidate.decode(), score
+            if best is None:
+                return None
+
+            cached = await self.redis.get(self._document_key("summary", params_digest, best))
+        except Exception as e:
+            logger.warning(f"Near-duplicate cache lookup failed: {e}")
+            return None
+        if cached is not None:
+            logger.debug(f"Near-duplicate cache hit (similarity {best_score:.2f})")
+        return self._decode(cached)
+
+    async def set_summary(
+        self,
+        content: str,
+        params: GenerationParams,
+        summary: str,
+        signature: Optional[np.ndarray] = None,
+        **options,
+    ):
+        """Cache summary with TTL, and index its signature for near-duplicate lookups if given."""
+        if not self.enabled:
+            return
+        params_digest = _params_digest(params, **options)
+        content_digest = _digest(content.encode())
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(
+                self._document_key("summary", params_digest, content_digest),
+                self.ttl,
+                self._encode(summary),
+            )
+            if signature is not None and self.minhasher is not None:
+                pipe.setex(
+                    self._document_key("minhash", params_digest, content_digest),
+                    self.ttl,
+                    signature.tobytes(),
+                )
+                for key in self._bucket_keys(params_digest, signature):
+                    pipe.sadd(key, content_digest)
+                    pipe.expire(key, self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Summary cache write failed: {e}")
+
+    async def get_chunks(
+        self, chunks: Sequence[Chunk], params: GenerationParams
+    ) -> List[Optional[str]]:
+        """Cached summaries for ``chunks`` in order, None where a chunk has not been seen."""
+        if not chunks:
+            return []
+        if not self.enabled:
+            return [None] * len(chunks)
+        try:
+            cached = await self.redis.mget([self.chunk_key(chunk, params) for chunk in chunks])
+        except Exception as e:
+            logger.warning(f"Chunk cache lookup failed: {e}")
+            return [None] * len(chunks)
+        return [self._decode(value) for value in cached]
+
+    async def set_chunk(self, chunk: Chunk, params: GenerationParams, summary: str):
+        """Cache a single chunk summary with TTL."""
+        if not self.enabled:
+            return
+        try:
+            await self.redis.setex(self.chunk_key(chunk, params), self.ttl, self._encode(summary))
+        except Exception as e:
+            logger.warning(f"Chunk cache write failed: {e}")
+
+    async def set_news_summary(self, content_hash: str, summary: str):
+        """
+        Publish a summary for NewScraper, which attaches it to cached articles.
+
+        Stored as plain UTF-8 under ``{NEWS_SUMMARY_KEY_PREFIX}:{content_hash}``, outside the
+        namespace, since the key layout is shared with NewScraper.
+        """
+        try:
+            await self.redis.setex(
+                f"{settings.NEWS_SUMMARY_KEY_PREFIX}:{content_hash}",
+                settings.NEWS_SUMMARY_TTL,
+                summary.encode("utf-8"),
+            )
+        except Exception as e:
+            logger.warning(f"News summary write failed: {e}")
+
+    async def close(self):
+        await self.redis.aclose()
+
+    @staticmethod
+    def _encode(summary: str) -> bytes:
+        return zlib.compress(summary.encode("utf-8"), settings.CACHE_COMPRESSION_LEVEL)
+
+    @staticmethod
+    def _decode(value: Optional[bytes]) -> Optional[str]:
+        if value is None:
+            return None
+        try:
+            return zlib.decompress(value).decode("utf-8")
+        except zlib.error:
+            # Written by an older, uncompressed version of the cache
+            return None
@@ -1,5 +1,17 @@
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+
+class ModelRoute(BaseModel):
+    """Model and generation budget for documents up to ``max_input_tokens`` long."""
+
+    max_input_tokens: int | None = Field(default=None, ge=1, description="None: any length")
+    model: str | None = Field(default=None, description="None: MODEL_NAME")
+    max_new_tokens: int = Field(default=192, ge=1, description="Cap on tokens generated per chunk")
+    min_new_tokens: int = Field(default=0, ge=0, description="Used when the request sets no min_length")
+    num_beams: int = Field(default=1, ge=1, description="1 decodes greedily")
+    no_repeat_ngram_size: int = Field(default=3, ge=0, description="0 allows repeated n-grams")
 
 
 class Settings(BaseSettings):
@@ -18,15 +30,139 @@ class Settings(BaseSettings):
         default="sshleifer/distilbart-cnn-12-6",
         description="Hugging Face model name for summarization",
     )
+    INFERENCE_BACKEND: Literal["torch", "int8", "onnx"] = Field(
+        default="torch",
+        description="torch (fp32), int8 (dynamic quantization) or onnx (ONNX Runtime)",
+    )
+    ONNX_CACHE_DIR: str = Field(
+        default=".onnx_cache", description="Where exported ONNX graphs are kept"
+    )
+    PRELOAD_MODELS: bool = Field(
+        default=False,
+        description="Load models at import time so pre-fork workers share the weights",
+    )
+    WARM_UP_ON_STARTUP: bool = Field(
+        default=True, description="Load and warm up the model in the background at startup, else on first request"
+    )
+    WARM_UP_INPUT_TOKENS: int = Field(default=256, ge=16, description="Input length of the synthetic warm-up batch")
 
     # Performance Settings
-    MAX_CHUNK_SIZE: int = Field(default=800, ge=100, le=1000)
-    CHUNK_OVERLAP: int = Field(default=100, ge=0, le=200)
+    MAX_CHUNK_SIZE: int = Field(
+        default=1024, ge=100, le=4096, description="Tokens per chunk, capped at the model input limit"
+    )
+    CHUNK_OVERLAP: int = Field(default=64, ge=0, le=200, description="Tokens shared by consecutive chunks")
     MAX_QUEUE_SIZE: int = Field(default=10, ge=1, le=50)
 
+    # Model Routing Settings, the first route a document fits is used
+    MODEL_ROUTES: List[ModelRoute] = Field(
+        default=[
+            ModelRoute(max_input_tokens=512, max_new_tokens=96, min_new_tokens=16, num_beams=1),
+            ModelRoute(max_new_tokens=192, min_new_tokens=32, num_beams=2),
+        ],
+        description="JSON list, e.g. a smaller model for short news items",
+    )
+
+    # Long Document Settings
+    SUMMARY_STRATEGY: Literal["hierarchical", "concat"] = "hierarchical"
+    SUMMARY_TARGET_TOKENS: int = Field(
+        default=256, ge=16, description="Reduce rounds run until the summary fits this many tokens"
+    )
+    MAX_REDUCE_ROUNDS: int = Field(default=3, ge=0, le=10)
+
+    # Extractive Tier Settings
+    SUMMARY_MODE: Literal["abstractive", "extractive", "auto"] = "abstractive"
+    AUTO_EXTRACTIVE_QUEUE_DEPTH: int = Field(
+        default=64, ge=1, description="Queued chunks at which 'auto' requests switch to extractive"
+    )
+    STREAM_PREVIEW: bool = Field(default=True, description="Send an extractive preview before chunk events")
+
+    # Batching Settings
+    MAX_BATCH_SIZE: int = Field(default=8, ge=1, le=64)
+    MAX_BATCH_WAIT_MS: int = Field(default=20, ge=0, le=1000)
+
+    # Scheduling Settings
+    INTERACTIVE_QUEUE_LIMIT: int = Field(
+        default=256, ge=1, description="Queued interactive chunks before requests get 429"
+    )
+    BULK_QUEUE_LIMIT: int = Field(default=1024, ge=1, description="Queued bulk chunks before bulk requests wait")
+    USER_QUEUE_LIMIT: int = Field(default=128, ge=1, description="Queued chunks per user and priority class")
+    INTERACTIVE_WEIGHT: int = Field(
+        default=8, ge=1, description="Interactive chunks served for every bulk chunk while both wait"
+    )
+    MAX_RETRY_AFTER: int = Field(default=60, ge=1)
+    USER_ID_HEADER: str | None = Field(
+        default=None,
+        description="Header carrying the authenticated user set by the gateway, else users are client addresses",
+    )
+
+    # Inference Executor Settings
+    INFERENCE_WORKERS: int = Field(default=1, ge=1, le=16)
+    TORCH_NUM_THREADS: int | None = Field(
+        default=None, ge=1, description="Intra-op threads per worker, defaults to cores / workers"
+    )
+    TORCH_INTEROP_THREADS: int = Field(default=1, ge=1)
+
+    # Message Transport Settings
+    MESSAGE_TRANSPORT: Literal["kafka", "redis", "memory", "file"] = Field(
+        default="kafka",
+        description="kafka, redis (Redis Streams), memory (in-process) or file (in-process, persisted)",
+    )
+    TRANSPORT_DIR: str = Field(default=".transport", description="Where the file transport keeps its logs")
+    REDIS_STREAM_MAXLEN: int = Field(default=100000, ge=1, description="Approximate entries kept per stream")
+
+    CONSUME_REQUESTS: bool = Field(
+        default=False, description="Run the summary request consumer in the API process once the model is loaded"
+    )
+
+    # Kafka Settings (the consumer and retry settings apply to every transport)
+    KAFKA_SERVERS: str = "localhost:9092"
+    KAFKA_MAX_POLL_RECORDS: int = Field(default=100, ge=1, description="Records fetched per getmany call")
+    KAFKA_POLL_TIMEOUT_MS: int = Field(default=500, ge=0)
+    KAFKA_MAX_CONCURRENCY: int = Field(
+        default=16, ge=1, description="Summary requests processed at once by the consumer"
+    )
+    KAFKA_COMMIT_INTERVAL_MS: int = Field(default=1000, ge=0)
+    KAFKA_RETRY_DELAYS_MS: List[int] = Field(
+        default=[5000, 60000, 600000],
+        description="Delay of each retry tier, failures beyond the last tier go to the dead-letter topic",
+    )
+    KAFKA_PRODUCER_LINGER_MS: int = Field(default=20, ge=0, description="Wait to fill a batch before sending")
+    KAFKA_PRODUCER_BATCH_BYTES: int = Field(default=65536, ge=1024)
+    KAFKA_COMPRESSION_TYPE: Literal["gzip", "snappy", "lz4", "zstd"] | None = "lz4"
+    KAFKA_PRODUCER_MAX_IN_FLIGHT: int = Field(
+        default=256, ge=1, description="Sends awaiting acknowledgement before new sends wait"
+    )
+    KAFKA_SEND_TIMEOUT: float = Field(default=10.0, gt=0)
+
     # Cache Settings
     REDIS_URL: str = "redis://localhost:6379"
+    CACHE_ENABLED: bool = Field(default=True, description="Disable to measure raw inference, e.g. in benchmarks")
     CACHE_TTL: int = 3600  # 1 hour
+    CACHE_NAMESPACE: str = "summarizer"
+    CACHE_COMPRESSION_LEVEL: int = Field(default=6, ge=1, le=9, description="zlib level for cached summaries")
+    REDIS_MAX_CONNECTIONS: int = Field(default=20, ge=1)
+
+    IDEMPOTENCY_ENABLED: bool = Field(
+        default=True, description="Disable to process every delivery, e.g. in benchmarks"
+    )
+    IDEMPOTENCY_TTL: int = Field(default=86400, ge=60, description="How long completed request results are kept")
+    IDEMPOTENCY_IN_PROGRESS_TTL: int = Field(
+        default=600, ge=10, description="Claim lifetime, a crashed worker's request becomes retryable after it"
+    )
+
+    # News Pipeline Settings (shared with NewScraper, which reads these keys)
+    NEWS_SUMMARY_KEY_PREFIX: str = "news:summary"
+    NEWS_SUMMARY_TTL: int = Field(default=604800, ge=60, description="How long article summaries are kept")
+
+    # Near-Duplicate Cache Settings
+    NEAR_DUPLICATE_CACHE: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = Field(
+        default=0.9, gt=0, le=1, description="Estimated Jaccard similarity that counts as the same document"
+    )
+    MINHASH_PERMUTATIONS: int = Field(default=128, ge=16, le=1024)
+    LSH_BANDS: int = Field(default=16, ge=1, description="Must divide MINHASH_PERMUTATIONS")
+    SHINGLE_SIZE: int = Field(default=5, ge=1, le=20, description="Words per shingle")
+    MAX_NEAR_DUPLICATE_CANDIDATES: int = Field(default=32, ge=1)
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,76 @@
+"""
+Dedicated executor for blocking model inference.
+
+Tokenization and ``model.generate`` release the GIL inside torch kernels, so running
+them on a small thread pool keeps the FastAPI event loop (health checks, Kafka polling,
+new requests) responsive while summaries are generated.
+
+Typical usage:
+    executor = get_inference_executor()
+    summaries = await executor.run(service._summarize_batch, chunks, params)
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceExecutor:
+    """
+    Thread pool sized for CPU inference with matching torch thread settings.
+
+    Attributes:
+        workers (int): Number of batches that may run concurrently
+        torch_threads (int): Intra-op threads per torch call
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        torch_threads: Optional[int] = None,
+        interop_threads: Optional[int] = None,
+    ) -> None:
+        self.workers = workers or settings.INFERENCE_WORKERS
+        # Split the cores between workers so concurrent batches do not oversubscribe the CPU
+        self.torch_threads = torch_threads or settings.TORCH_NUM_THREADS or max(
+            1, (os.cpu_count() or 1) // self.workers
+        )
+        self._configure_torch(interop_threads or settings.TORCH_INTEROP_THREADS)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="inference"
+        )
+        logger.info(
+            f"Inference executor started with {self.workers} worker(s), "
+            f"{self.torch_threads} torch thread(s) each"
+        )
+
+    def _configure_torch(self, interop_threads: int) -> None:
+        import torch
+
+        torch.set_num_threads(self.torch_threads)
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has started
+            logger.debug("torch inter-op threads already configured")
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking callable on the inference pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(fn, *args))
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+@lru_cache
+def get_inference_executor() -> InferenceExecutor:
+    """Process-wide inference executor."""
+    return InferenceExecutor()
@@ -0,0 +1,115 @@
+"""
+Idempotency store for summary requests.
+
+Each request_id owns one Redis key, ``{namespace}:request:{request_id}``, holding its state:
+
+    in_progress  claimed by a worker, expires after IDEMPOTENCY_IN_PROGRESS_TTL so a crashed
+                 worker's claim does not block the request forever
+    completed    the stored result, kept for IDEMPOTENCY_TTL
+
+A redelivered or duplicate request finds the key and is answered from it instead of
+running inference again. With ``IDEMPOTENCY_ENABLED=False`` nothing is stored and every
+delivery is processed.
+
+Typical usage:
+    store = IdempotencyStore(redis_client)
+    claim = await store.claim(request_id)
+    if claim.state == "completed":
+        return claim.result
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Literal, Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInProgressError(Exception):
+    """Another worker holds the claim on this request."""
+
+
+@dataclass
+class Claim:
+    """Outcome of claiming a request_id."""
+
+    # "acquired": this worker must process the request
+    state: Literal["acquired", "in_progress", "completed"]
+    result: Optional[Dict[str, Any]] = None
+
+
+class IdempotencyStore:
+    """
+    Records the processing state of summary requests in Redis.
+
+    Attributes:
+        redis: Async Redis client, shared with the summary cache so both use one pool
+        namespace (str): Key prefix
+    """
+
+    def __init__(self, redis_client: redis.Redis, namespace: Optional[str] = None) -> None:
+        self.redis = redis_client
+        self.namespace = namespace or settings.CACHE_NAMESPACE
+        self.enabled = settings.IDEMPOTENCY_ENABLED
+
+    def key(self, request_id: str) -> str:
+        return f"{self.namespace}:request:{request_id}"
+
+    async def claim(self, request_id: str) -> Claim:
+        """
+        Atomically mark a request in progress unless it is already known.
+
+        Fails open: if Redis is unreachable the request is processed without deduplication.
+
+        Returns:
+            Claim: "acquired" if this caller now owns the request, otherwise the existing state
+        """
+        if not self.enabled:
+            return Claim(state="acquired")
+
+        record = json.dumps({"state": "in_progress", "claimed_at": time.time()})
+        try:
+            acquired = await self.redis.set(
+                self.key(request_id), record, nx=True, ex=settings.IDEMPOTENCY_IN_PROGRESS_TTL
+            )
+            if acquired:
+                return Claim(state="acquired")
+            existing = await self.redis.get(self.key(request_id))
+        except Exception as e:
+            logger.warning(f"Idempotency check for request {request_id} failed: {str(e)}")
+            return Claim(state="acquired")
+
+        if existing is None:
+            # Expired between SET and GET, try once more
+            return await self.claim(request_id)
+        existing = json.loads(existing)
+        if existing["state"] == "completed":
+            return Claim(state="completed", result=existing["result"])
+        return Claim(state="in_progress")
+
+    async def complete(self, request_id: str, result: Dict[str, Any]) -> None:
+        """Store the result of a processed request."""
+        if not self.enabled:
+            return
+
+        record = json.dumps({"state": "completed", "result": result})
+        try:
+            await self.redis.set(self.key(request_id), record, ex=settings.IDEMPOTENCY_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to store result of request {request_id}: {str(e)}")
+
+    async def release(self, request_id: str) -> None:
+        """Drop the claim of a request that failed, so a retry can process it."""
+        if not self.enabled:
+            return
+
+        try:
+            await self.redis.delete(self.key(request_id))
+        except Exception as e:
+            logger.warning(f"Failed to release claim on request {request_id}: {str(e)}")
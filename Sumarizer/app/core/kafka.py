@@ -4,24 +4,166 @@ Kafka client implementation for the summarizer service.
 
 This module provides Kafka integration for asynchronous message handling
 in the summarizer service. It includes producers and consumers for
-handling summary requests and notifications.
+handling summary requests and notifications. ``KafkaClient`` is the default
+``MessageTransport``; the topic layout and offset tracking below are shared by all of them.
+
+Failed requests move through tiered retry topics and end up in a dead-letter topic:
+
+    summary_requests -> summary_requests.retry.0 -> ... -> summary_requests.retry.N -> summary_requests.dlq
+
+Each hop carries its failure metadata in ``x-*`` record headers. Tier ``i`` is redelivered
+KAFKA_RETRY_DELAYS_MS[i] after the failure.
 
 Typical usage:
     client = KafkaClient()
+    await client.start_consumer(tracker)
     await client.send_summary_completed(user_id=1, summary_data={...})
+    await client.close()
 """
 
-from typing import Any, Dict, Optional
-from kafka import KafkaProducer, KafkaConsumer
-import json
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Optional, Set
+import asyncio
+import time
 from app.core.config import settings
+from app.core.transport import Headers, MessageTransport, OffsetAndMetadata, TopicPartition
 import logging
-from datetime import datetime
+
+# aiokafka is imported by KafkaClient when it connects, the other transports work without it
+if TYPE_CHECKING:
+    from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
 logger = logging.getLogger(__name__)
 
+CONSUMER_GROUP = "summarizer_group"
+REQUEST_TOPIC = "summary_requests"
+DLQ_TOPIC = f"{REQUEST_TOPIC}.dlq"
+RETRY_TOPIC_PREFIX = f"{REQUEST_TOPIC}.retry."
+
+ATTEMPT_HEADER = "x-attempt"
+RETRY_AT_HEADER = "x-retry-at"  # Epoch milliseconds
+
+
+def retry_topic(tier: int) -> str:
+    return f"{RETRY_TOPIC_PREFIX}{tier}"
+
+
+def request_topics() -> List[str]:
+    """Topics the request consumer reads: new requests and every retry tier."""
+    return [REQUEST_TOPIC] + [retry_topic(tier) for tier in range(len(settings.KAFKA_RETRY_DELAYS_MS))]
+
+
+def header(message: Any, name: str) -> Optional[str]:
+    """Value of a record header as text, None if absent."""
+    for key, value in message.headers or ():
+        if key == name:
+            return value.decode("utf-8")
+    return None
+
+
+def failure_headers(message: Any, error: Exception, attempt: int) -> Headers:
+    """
+    Headers for republishing a failed record.
+
+    The original topic/partition/offset and first failure time survive every hop, the
+    error fields describe the latest failure.
+    """
+    now = str(int(time.time() * 1000))
+    headers = {key: value for key, value in message.headers or ()}
+    headers.setdefault("x-original-topic", message.topic.encode("utf-8"))
+    headers.setdefault("x-original-partition", str(message.partition).encode("utf-8"))
+    headers.setdefault("x-original-offset", str(message.offset).encode("utf-8"))
+    headers.setdefault("x-first-failed-at", now.encode("utf-8"))
+    headers.update({
+        ATTEMPT_HEADER: str(attempt).encode("utf-8"),
+        "x-failed-at": now.encode("utf-8"),
+        "x-error-type": type(error).__name__.encode("utf-8"),
+        "x-error-message": str(error)[:1000].encode("utf-8"),
+    })
+    headers.pop(RETRY_AT_HEADER, None)
+    return list(headers.items())
+
+
+class OffsetTracker:
+    """
+    Tracks records processed out of order and yields offsets that are safe to commit.
 
-class KafkaClient:
+    Records of a partition are handed out in offset order but may finish in any order.
+    A partition's commit position only advances past a record once it and every record
+    before it are done, so a crash never skips an unprocessed message.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[TopicPartition, Deque[int]] = {}
+        self._done: Dict[TopicPartition, Set[int]] = {}
+        self._committable: Dict[TopicPartition, int] = {}
+        self._committed: Dict[TopicPartition, int] = {}
+
+    def add(self, tp: TopicPartition, offset: int) -> None:
+        """Register a record that has been handed to a worker."""
+        self._pending.setdefault(tp, deque()).append(offset)
+        self._done.setdefault(tp, set())
+
+    def complete(self, tp: TopicPartition, offset: int) -> None:
+        """Mark a record finished, ignored if its partition was revoked meanwhile."""
+        pending = self._pending.get(tp)
+        if pending is None:
+            return
+        done = self._done[tp]
+        done.add(offset)
+        while pending and pending[0] in done:
+            done.discard(pending[0])
+            # Kafka commits the offset of the next record to read
+            self._committable[tp] = pending.popleft() + 1
+
+    @property
+    def in_flight(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    def committable(
+        self, partitions: Optional[Iterable[TopicPartition]] = None
+    ) -> Dict[TopicPartition, OffsetAndMetadata]:
+        """Offsets that advanced since the last commit, optionally limited to ``partitions``."""
+        selected = self._committable.keys() if partitions is None else partitions
+        return {
+            tp: OffsetAndMetadata(self._committable[tp], "")
+            for tp in selected
+            if tp in self._committable and self._committed.get(tp) != self._committable[tp]
+        }
+
+    def mark_committed(self, offsets: Dict[TopicPartition, OffsetAndMetadata]) -> None:
+        for tp, offset in offsets.items():
+            self._committed[tp] = offset.offset
+
+    def forget(self, partitions: Iterable[TopicPartition]) -> None:
+        """Drop state for partitions this consumer no longer owns."""
+        for tp in partitions:
+            self._pending.pop(tp, None)
+            self._done.pop(tp, None)
+            self._committable.pop(tp, None)
+            self._committed.pop(tp, None)
+
+
+class CommitOnRevoke:
+    """
+    Rebalance listener of every transport's consumer.
+
+    Commits finished records of revoked partitions before another consumer takes them over.
+    """
+
+    def __init__(self, client: MessageTransport, tracker: OffsetTracker) -> None:
+        self.client = client
+        self.tracker = tracker
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        await self.client.commit(self.tracker)
+        self.tracker.forget(revoked)
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        pass
+
+
+class KafkaClient(MessageTransport):
     """
     Kafka client for handling message production and consumption.
 
@@ -29,104 +171,128 @@ class KafkaClient:
     and receiving messages related to the summarization service.
 
     Attributes:
-        producer (KafkaProducer): Kafka producer instance
-        consumer (KafkaConsumer): Kafka consumer instance for summary requests
+        producer (AIOKafkaProducer): asyncio producer, started on first use
+        consumer (AIOKafkaConsumer): asyncio consumer for summary requests, created by
+            ``start_consumer`` since it must be bound to the running event loop
     """
 
     def __init__(self) -> None:
-        """Initialize Kafka producer and consumer connections."""
-        try:
-            self.producer = KafkaProducer(
-                bootstrap_servers=settings.KAFKA_SERVERS,
-                value_serializer=self._serialize_message,
-                acks="all",  # Wait for all replicas
-                retries=3,  # Retry failed sends
-                retry_backoff_ms=500,  # Backoff time between retries
-            )
-
-            self.consumer = KafkaConsumer(
-                "summary_requests",
-                bootstrap_servers=settings.KAFKA_SERVERS,
-                value_deserializer=self._deserialize_message,
-                group_id="summarizer_group",
-                auto_offset_reset="earliest",
-                enable_auto_commit=False,  # Manual commit for better control
-                session_timeout_ms=30000,  # 30 seconds
-                max_poll_interval_ms=300000,  # 5 minutes
-            )
-
-            logger.info("Kafka client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Kafka client: {str(e)}")
-            raise
+        """Set up the client, connections are opened on the running event loop."""
+        self.producer: Optional["AIOKafkaProducer"] = None
+        self.consumer: Optional["AIOKafkaConsumer"] = None
+        self._producer_lock = asyncio.Lock()
+        # Bounds sends awaiting acknowledgement so a slow broker applies backpressure
+        self._in_flight = asyncio.Semaphore(settings.KAFKA_PRODUCER_MAX_IN_FLIGHT)
 
-    @staticmethod
-    def _serialize_message(message: Dict[str, Any]) -> bytes:
+    async def start_producer(self) -> "AIOKafkaProducer":
         """
-        Serialize message to JSON bytes.
+        Connect the producer if it is not running yet.
 
-        Args:
-            message: Dictionary containing message data
+        Sends linger for KAFKA_PRODUCER_LINGER_MS so concurrent completions leave in one
+        compressed batch per partition.
+        """
+        async with self._producer_lock:
+            if self.producer is not None:
+                return self.producer
+            from aiokafka import AIOKafkaProducer
 
-        Returns:
-            bytes: JSON-encoded message
+            try:
+                producer = AIOKafkaProducer(
+                    bootstrap_servers=settings.KAFKA_SERVERS,
+                    acks="all",  # Wait for all replicas
+                    enable_idempotence=True,  # Broker-side retries never duplicate a message
+                    linger_ms=settings.KAFKA_PRODUCER_LINGER_MS,
+                    max_batch_size=settings.KAFKA_PRODUCER_BATCH_BYTES,
+                    compression_type=settings.KAFKA_COMPRESSION_TYPE,
+                    retry_backoff_ms=500,  # Backoff time between retries
+                )
+                await producer.start()
+            except Exception as e:
+                logger.error(f"Failed to initialize Kafka producer: {str(e)}")
+                raise
+            self.producer = producer
+            logger.info("Kafka producer started")
+            return producer
 
-        Raises:
-            json.JSONEncodeError: If message serialization fails
-        """
+    async def stop_producer(self) -> None:
+        """Flush pending batches and disconnect the producer."""
+        async with self._producer_lock:
+            if self.producer is not None:
+                await self.producer.stop()
+                self.producer = None
+
+    async def open_reader(self, topic: str, group_id: str) -> "AIOKafkaConsumer":
+        """Consumer assigned every partition of ``topic``, none if the topic does not exist."""
+        from aiokafka import AIOKafkaConsumer
+        from aiokafka import TopicPartition as KafkaTopicPartition
+
+        consumer = AIOKafkaConsumer(
+            bootstrap_servers=settings.KAFKA_SERVERS,
+            group_id=group_id,
+            enable_auto_commit=False,
+        )
+        await consumer.start()
         try:
-            return json.dumps(message).encode("utf-8")
-        except json.JSONEncodeError as e:
-            logger.error(f"Message serialization failed: {str(e)}")
+            await consumer.topics()  # Refresh metadata so the partitions are known
+            partitions = [KafkaTopicPartition(topic, p) for p in consumer.partitions_for_topic(topic) or ()]
+            if partitions:
+                consumer.assign(partitions)
+            for tp in partitions:
+                committed = await consumer.committed(tp)
+                if committed is None:
+                    await consumer.seek_to_beginning(tp)
+                else:
+                    consumer.seek(tp, committed)
+        except Exception:
+            await consumer.stop()
             raise
+        return consumer
 
-    @staticmethod
-    def _deserialize_message(message: bytes) -> Dict[str, Any]:
+    async def start_consumer(self, tracker: OffsetTracker) -> "AIOKafkaConsumer":
         """
-        Deserialize message from JSON bytes.
+        Connect the summary request consumer.
 
         Args:
-            message: JSON-encoded message bytes
+            tracker: Offsets of the records being processed, committed on rebalance
 
         Returns:
-            dict: Deserialized message data
-
-        Raises:
-            json.JSONDecodeError: If message deserialization fails
+            AIOKafkaConsumer: Started consumer subscribed to ``summary_requests`` and its
+            retry topics
         """
-        try:
-            return json.loads(message.decode("utf-8"))
-        except json.JSONDecodeError as e:
-            logger.error(f"Message deserialization failed: {str(e)}")
-            raise
+        from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener
 
-    async def send_summary_completed(
-        self, user_id: int, summary_data: Dict[str, Any]
+        # aiokafka only accepts instances of its listener ABC
+        ConsumerRebalanceListener.register(CommitOnRevoke)
+        # Values stay raw bytes, a record that fails to decode is dead-lettered by the handler
+        self.consumer = AIOKafkaConsumer(
+            bootstrap_servers=settings.KAFKA_SERVERS,
+            group_id=CONSUMER_GROUP,
+            auto_offset_reset="earliest",
+            enable_auto_commit=False,  # Offsets are committed in order by OffsetTracker
+            max_poll_records=settings.KAFKA_MAX_POLL_RECORDS,
+            session_timeout_ms=30000,  # 30 seconds
+            max_poll_interval_ms=300000,  # 5 minutes
+        )
+        self.consumer.subscribe(request_topics(), listener=CommitOnRevoke(self, tracker))
+        await self.consumer.start()
+        logger.info("Kafka consumer started")
+        return self.consumer
+
+    async def publish(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        headers: Optional[Headers] = None,
     ) -> None:
         """
-        Send completion notification for processed summary.
-
-        Args:
-            user_id: ID of the user who requested the summary
-            summary_data: Dictionary containing summary results and metadata
+        Send a raw record and wait for its acknowledgement.
 
         Raises:
-            KafkaError: If message sending fails
+            KafkaError: If the broker does not acknowledge within KAFKA_SEND_TIMEOUT
         """
-        message = {
-            "user_id": user_id,
-            "summary": summary_data,
-            "timestamp": datetime.utcnow().isoformat(),
-            "status": "completed",
-        }
-
-        try:
-            self.producer.send("summary_completed", message).get(
-                timeout=10
-            )  # Wait for send confirmation
-            logger.info(f"Summary completion notification sent for user {user_id}")
-        except Exception as e:
-            logger.error(
-                f"Failed to send summary completion for user {user_id}: {str(e)}"
-            )
-            raise
+        producer = await self.start_producer()
+        async with self._in_flight:
+            # send() only enqueues into the current batch, the future resolves on ack
+            delivery = await producer.send(topic, value, key=key, headers=headers)
+            await asyncio.wait_for(delivery, timeout=settings.KAFKA_SEND_TIMEOUT)
@@ -0,0 +1,250 @@
+"""
+In-process message bus, a stand-in for Kafka that needs no external services.
+
+Topics are append-only lists of records in a ``LocalBus`` shared by every transport of the
+process, so a benchmark or test can publish requests, run the request handler and read the
+completion events in one event loop. With a directory (``MESSAGE_TRANSPORT=file``) each
+topic is also appended to ``{TRANSPORT_DIR}/{topic}.log`` as JSON lines and committed
+offsets are kept in ``offsets.json``, so a restarted process resumes where its group left off.
+
+Nothing is ever trimmed, the bus is meant for development and load tests, not production.
+
+Typical usage:
+    bus = get_bus()
+    transport = LocalTransport(bus)
+    await transport.publish("summary_requests", value)
+    consumer = LocalConsumer(bus, ["summary_completed"], group_id="benchmark")
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.kafka import CONSUMER_GROUP, CommitOnRevoke, OffsetTracker, request_topics
+from app.core.transport import (
+    Headers,
+    LogConsumer,
+    MessageTransport,
+    Record,
+    TopicPartition,
+    decode_headers,
+    encode_headers,
+)
+
+logger = logging.getLogger(__name__)
+
+_buses: Dict[Optional[str], "LocalBus"] = {}
+
+
+def _b64(value: Optional[bytes]) -> Optional[str]:
+    return None if value is None else base64.b64encode(value).decode("ascii")
+
+
+def _unb64(value: Optional[str]) -> Optional[bytes]:
+    return None if value is None else base64.b64decode(value)
+
+
+class LocalBus:
+    """
+    Topics, committed offsets and partition owners of the in-process transport.
+
+    Attributes:
+        directory (Path | None): Where topics and offsets are persisted, None keeps them in memory
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self._logs: Dict[str, List[Record]] = {}
+        self._offsets: Dict[str, Dict[str, int]] = {}
+        self._owners: Dict[Tuple[str, str], Any] = {}
+        self._waiters: Set[asyncio.Future] = set()
+        if self.directory is not None:
+            self._load()
+
+    def append(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        headers: Optional[Headers] = None,
+    ) -> Record:
+        log = self._logs.setdefault(topic, [])
+        record = Record(
+            topic=topic,
+            partition=0,
+            offset=len(log),
+            value=value,
+            key=key,
+            headers=list(headers or ()),
+            timestamp=int(time.time() * 1000),
+        )
+        if self.directory is not None:
+            line = json.dumps({
+                "offset": record.offset,
+                "timestamp": record.timestamp,
+                "key": _b64(record.key),
+                "value": _b64(record.value),
+                "headers": encode_headers(record.headers),
+            })
+            with open(self.directory / f"{topic}.log", "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        log.append(record)
+
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+        return record
+
+    def read(self, positions: Dict[TopicPartition, int], max_records: int) -> Dict[TopicPartition, List[Record]]:
+        """Up to ``max_records`` records in total, starting at each partition's position."""
+        batches = {}
+        for tp, position in positions.items():
+            if max_records <= 0:
+                break
+            records = self._logs.get(tp.topic, [])[position:position + max_records]
+            if records:
+                batches[tp] = records
+                max_records -= len(records)
+        return batches
+
+    async def wait(self, timeout: float) -> None:
+        """Return once a record is appended to any topic, or after ``timeout`` seconds."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters.discard(waiter)
+
+    def end_offset(self, topic: str) -> int:
+        return len(self._logs.get(topic, ()))
+
+    def committed(self, group_id: str, topic: str) -> Optional[int]:
+        return self._offsets.get(group_id, {}).get(topic)
+
+    def commit(self, group_id: str, offsets: Dict[str, int]) -> None:
+        self._offsets.setdefault(group_id, {}).update(offsets)
+        if self.directory is not None:
+            # Written aside and renamed, a crash never leaves a half-written offsets file
+            path = self.directory / "offsets.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._offsets), encoding="utf-8")
+            os.replace(tmp, path)
+
+    def acquire(self, group_id: str, topic: str, owner: Any) -> bool:
+        current = self._owners.setdefault((group_id, topic), owner)
+        return current is owner
+
+    def release(self, group_id: str, topic: str, owner: Any) -> None:
+        if self._owners.get((group_id, topic)) is owner:
+            del self._owners[(group_id, topic)]
+
+    def _load(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob("*.log")):
+            topic = path.name[: -len(".log")]
+            log = self._logs.setdefault(topic, [])
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    log.append(Record(
+                        topic=topic,
+                        partition=0,
+                        offset=entry["offset"],
+                        value=_unb64(entry["value"]),
+                        key=_unb64(entry["key"]),
+                        headers=decode_headers(entry["headers"]),
+                        timestamp=entry["timestamp"],
+                    ))
+        offsets = self.directory / "offsets.json"
+        if offsets.exists():
+            self._offsets = json.loads(offsets.read_text(encoding="utf-8"))
+        logger.info(f"Loaded {sum(len(log) for log in self._logs.values())} records from {self.directory}")
+
+
+def get_bus(directory: Optional[str] = None) -> LocalBus:
+    """The process-wide bus, one per directory (None for the in-memory one)."""
+    if directory not in _buses:
+        _buses[directory] = LocalBus(directory)
+    return _buses[directory]
+
+
+class LocalConsumer(LogConsumer):
+    """Consumer-group reader of a ``LocalBus``."""
+
+    def __init__(self, bus: LocalBus, topics: Iterable[str], group_id: str, **kwargs: Any) -> None:
+        super().__init__(topics, group_id, **kwargs)
+        self.bus = bus
+
+    async def _acquire(self, tp: TopicPartition) -> bool:
+        return self.bus.acquire(self.group_id, tp.topic, self)
+
+    async def _release(self, tp: TopicPartition) -> None:
+        self.bus.release(self.group_id, tp.topic, self)
+
+    async def _load_committed(self, tp: TopicPartition) -> Optional[int]:
+        return self.bus.committed(self.group_id, tp.topic)
+
+    async def _store_committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        self.bus.commit(self.group_id, {tp.topic: offset for tp, offset in offsets.items()})
+
+    async def _end_offset(self, tp: TopicPartition) -> int:
+        return self.bus.end_offset(tp.topic)
+
+    async def _fetch(
+        self, positions: Dict[TopicPartition, int], max_records: int, timeout: float
+    ) -> Dict[TopicPartition, List[Record]]:
+        batches = self.bus.read(positions, max_records)
+        if not batches and timeout > 0:
+            await self.bus.wait(timeout)
+            batches = self.bus.read(positions, max_records)
+        return batches
+
+
+class LocalTransport(MessageTransport):
+    """
+    ``MessageTransport`` over a ``LocalBus``.
+
+    Publishing is synchronous and cannot fail, so the producer needs no setup.
+    """
+
+    def __init__(self, bus: Optional[LocalBus] = None) -> None:
+        self.bus = bus or get_bus()
+        self.consumer: Optional[LocalConsumer] = None
+
+    async def publish(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        headers: Optional[Headers] = None,
+    ) -> None:
+        self.bus.append(topic, value, key=key, headers=headers)
+
+    async def open_reader(self, topic: str, group_id: str) -> LocalConsumer:
+        consumer = LocalConsumer(self.bus, [topic], group_id)
+        await consumer.start()
+        return consumer
+
+    async def start_consumer(self, tracker: OffsetTracker) -> LocalConsumer:
+        self.consumer = LocalConsumer(
+            self.bus,
+            request_topics(),
+            CONSUMER_GROUP,
+            listener=CommitOnRevoke(self, tracker),
+            max_poll_records=settings.KAFKA_MAX_POLL_RECORDS,
+        )
+        await self.consumer.start()
+        logger.info(f"Local consumer started on {self.bus.directory or 'the in-memory bus'}")
+        return self.consumer
@@ -0,0 +1,97 @@
+"""
+Process-wide registry of loaded summarization models.
+
+Every consumer (HTTP endpoint, Kafka handler, benchmarks) asks the registry for a model
+instead of loading its own copy, so each model's weights live in memory once per process.
+
+For multi-worker deployments, load the models in the master process and fork afterwards
+(e.g. ``gunicorn --preload`` with ``PRELOAD_MODELS=true``). ``prepare_for_fork`` freezes
+the garbage collector so the forked workers do not touch, and therefore do not copy, the
+pages holding the shared weights.
+
+transformers, torch and the backend loaders are imported on the first load, so importing
+this module is cheap.
+
+Typical usage:
+    loaded = model_registry.get(settings.MODEL_NAME, settings.INFERENCE_BACKEND)
+    ids = loaded.model.generate(**loaded.tokenizer(text, return_tensors="pt"))
+"""
+
+import gc
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedModel:
+    """A tokenizer/model pair shared by all consumers of a model name and backend."""
+
+    name: str
+    backend: str
+    tokenizer: Any
+    model: Any
+    load_time: float
+
+
+class ModelRegistry:
+    """Loads each (model, backend) pair at most once per process and hands out the shared instance."""
+
+    def __init__(self) -> None:
+        self._models: Dict[Tuple[str, str], LoadedModel] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def get(self, name: str, backend: str = "torch") -> LoadedModel:
+        """
+        Return the loaded model, loading it on first request.
+
+        Concurrent first requests for the same model wait for a single load.
+        """
+        key = (name, backend)
+        loaded = self._models.get(key)
+        if loaded is not None:
+            return loaded
+
+        with self._registry_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._models:
+                self._models[key] = self._load(name, backend)
+        return self._models[key]
+
+    def _load(self, name: str, backend: str) -> LoadedModel:
+        from transformers import AutoTokenizer
+
+        from app.core.backends import load_backend_model
+
+        start = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        model = load_backend_model(name, backend)
+        load_time = time.perf_counter() - start
+        logger.info(f"Model {name} ({backend}) loaded in {load_time:.2f} seconds")
+        return LoadedModel(
+            name=name, backend=backend, tokenizer=tokenizer, model=model, load_time=load_time
+        )
+
+    def loaded(self) -> List[Tuple[str, str]]:
+        return list(self._models)
+
+    def preload(self, names: Iterable[str], backend: str = "torch") -> None:
+        """Load models ahead of time, e.g. in a pre-fork master process."""
+        for name in names:
+            self.get(name, backend)
+        self.prepare_for_fork()
+
+    @staticmethod
+    def prepare_for_fork() -> None:
+        """Move everything allocated so far out of GC tracking to keep forked pages shared."""
+        gc.collect()
+        gc.freeze()
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,219 @@
+"""
+Redis Streams transport.
+
+Each topic is a stream of the same name, entries carry the record in the fields ``value``,
+``key`` and ``headers`` (only ``value`` is required, which is all NewScraper's summary
+pipeline writes). Consumer-group state lives next to the streams:
+
+    {namespace}:offsets:{group}         hash of topic -> next offset to read
+    {namespace}:owner:{group}:{topic}   lease of the consumer reading the topic
+
+Offsets keep Kafka's meaning, so ``OffsetTracker`` commits work unchanged: a stream entry
+id ``{ms}-{seq}`` is the integer ``ms << 64 | seq``. Streams are trimmed to about
+REDIS_STREAM_MAXLEN entries.
+
+A lease is renewed by a background task every third of its lifetime, not by polling, so a
+consumer that stops polling while its records are processed (the handler waits for a free
+slot before taking the next record) keeps its topics. Only a consumer whose process or
+event loop stalls for the whole lease loses them.
+
+Typical usage:
+    transport = RedisStreamTransport(redis_client)
+    await transport.publish("summary_requests", value)
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.kafka import CONSUMER_GROUP, CommitOnRevoke, OffsetTracker, request_topics
+from app.core.transport import (
+    Headers,
+    LogConsumer,
+    MessageTransport,
+    Record,
+    TopicPartition,
+    decode_headers,
+    encode_headers,
+)
+
+logger = logging.getLogger(__name__)
+
+_LEASE_MS = 30000  # Same as the Kafka consumer's session timeout
+_SEQ_BITS = 64
+
+# Only the lease holder may renew or drop it
+_RENEW = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def entry_offset(entry_id: bytes) -> int:
+    """Integer offset of a stream entry id."""
+    ms, seq = entry_id.decode("ascii").split("-")
+    return (int(ms) << _SEQ_BITS) | int(seq)
+
+
+def entry_id(offset: int) -> str:
+    return f"{offset >> _SEQ_BITS}-{offset & ((1 << _SEQ_BITS) - 1)}"
+
+
+class RedisStreamConsumer(LogConsumer):
+    """Consumer-group reader of Redis streams, ownership is a lease renewed while polling."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        topics: Iterable[str],
+        group_id: str,
+        namespace: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(topics, group_id, **kwargs)
+        self.redis = redis_client
+        self.namespace = namespace or settings.CACHE_NAMESPACE
+        self.member_id = uuid.uuid4().hex
+        self._renew = redis_client.register_script(_RENEW)
+        self._release_lease = redis_client.register_script(_RELEASE)
+        self._keep_alive: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await super().start()
+        self._keep_alive = asyncio.create_task(self._renew_leases())
+
+    async def stop(self) -> None:
+        if self._keep_alive is not None:
+            self._keep_alive.cancel()
+            await asyncio.gather(self._keep_alive, return_exceptions=True)
+            self._keep_alive = None
+        await super().stop()
+
+    async def _renew_leases(self) -> None:
+        """Extend the leases held, a lost one is revoked by the next rebalance."""
+        while True:
+            await asyncio.sleep(_LEASE_MS / 3000)
+            for tp in self.assignment():
+                try:
+                    if not await self._renew(keys=[self._owner_key(tp)], args=[self.member_id, _LEASE_MS]):
+                        logger.warning(f"Lease on {tp.topic} was lost")
+                except Exception as e:
+                    # Retried on the next round, well before the lease runs out
+                    logger.warning(f"Failed to renew lease on {tp.topic}: {str(e)}")
+
+    def _owner_key(self, tp: TopicPartition) -> str:
+        return f"{self.namespace}:owner:{self.group_id}:{tp.topic}"
+
+    @property
+    def _offsets_key(self) -> str:
+        return f"{self.namespace}:offsets:{self.group_id}"
+
+    async def _acquire(self, tp: TopicPartition) -> bool:
+        key = self._owner_key(tp)
+        if await self.redis.set(key, self.member_id, nx=True, px=_LEASE_MS):
+            return True
+        return bool(await self._renew(keys=[key], args=[self.member_id, _LEASE_MS]))
+
+    async def _release(self, tp: TopicPartition) -> None:
+        try:
+            await self._release_lease(keys=[self._owner_key(tp)], args=[self.member_id])
+        except Exception as e:
+            # The lease runs out on its own
+            logger.warning(f"Failed to release {tp.topic}: {str(e)}")
+
+    async def _load_committed(self, tp: TopicPartition) -> Optional[int]:
+        committed = await self.redis.hget(self._offsets_key, tp.topic)
+        return None if committed is None else int(committed)
+
+    async def _store_committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        await self.redis.hset(self._offsets_key, mapping={tp.topic: offset for tp, offset in offsets.items()})
+
+    async def _end_offset(self, tp: TopicPartition) -> int:
+        last = await self.redis.xrevrange(tp.topic, count=1)
+        return entry_offset(last[0][0]) + 1 if last else 0
+
+    async def _fetch(
+        self, positions: Dict[TopicPartition, int], max_records: int, timeout: float
+    ) -> Dict[TopicPartition, List[Record]]:
+        # XREAD returns entries after the given id, i.e. from the position on
+        streams = {tp.topic: entry_id(position - 1) if position else "0-0" for tp, position in positions.items()}
+        response = await self.redis.xread(
+            streams, count=max_records, block=int(timeout * 1000) if timeout > 0 else None
+        )
+        batches = {}
+        for stream, entries in response or ():
+            topic = stream.decode("utf-8") if isinstance(stream, bytes) else stream
+            batches[TopicPartition(topic, 0)] = [self._record(topic, *entry) for entry in entries]
+        return batches
+
+    @staticmethod
+    def _record(topic: str, entry: bytes, fields: Dict[bytes, bytes]) -> Record:
+        offset = entry_offset(entry)
+        headers = fields.get(b"headers")
+        return Record(
+            topic=topic,
+            partition=0,
+            offset=offset,
+            value=fields.get(b"value", b""),
+            key=fields.get(b"key"),
+            headers=decode_headers(headers.decode("utf-8") if headers else None),
+            timestamp=offset >> _SEQ_BITS,
+        )
+
+
+class RedisStreamTransport(MessageTransport):
+    """
+    ``MessageTransport`` over Redis Streams.
+
+    Attributes:
+        redis: Async Redis client, may be shared with the summary cache
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None) -> None:
+        self.redis = redis_client or redis.from_url(
+            settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        self.consumer: Optional[RedisStreamConsumer] = None
+
+    async def publish(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        headers: Optional[Headers] = None,
+    ) -> None:
+        fields = {"value": value}
+        if key is not None:
+            fields["key"] = key
+        if headers:
+            fields["headers"] = encode_headers(headers)
+        await self.redis.xadd(topic, fields, maxlen=settings.REDIS_STREAM_MAXLEN, approximate=True)
+
+    async def open_reader(self, topic: str, group_id: str) -> RedisStreamConsumer:
+        consumer = RedisStreamConsumer(self.redis, [topic], group_id)
+        await consumer.start()
+        return consumer
+
+    async def start_consumer(self, tracker: OffsetTracker) -> RedisStreamConsumer:
+        self.consumer = RedisStreamConsumer(
+            self.redis,
+            request_topics(),
+            CONSUMER_GROUP,
+            listener=CommitOnRevoke(self, tracker),
+            max_poll_records=settings.KAFKA_MAX_POLL_RECORDS,
+        )
+        await self.consumer.start()
+        logger.info("Redis stream consumer started")
+        return self.consumer
@@ -0,0 +1,72 @@
+"""
+MinHash signatures for near-duplicate detection.
+
+Documents are reduced to word shingles, and each shingle is hashed with ``num_perm`` random
+permutations. The fraction of equal positions in two signatures estimates the Jaccard
+similarity of their shingle sets. Signatures are split into LSH bands, and documents that
+share any band become candidates. With ``bands`` b and ``rows`` r, pairs more similar than
+roughly ``(1 / b) ** (1 / r)`` are likely to collide.
+"""
+import hashlib
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+# Smallest prime above 2**32, keeps (a * h + b) within uint64 for 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_WORD = re.compile(r"\w+")
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures and their LSH band keys.
+
+    Attributes:
+        num_perm (int): Signature length
+        bands (int): Number of LSH bands, must divide ``num_perm``
+        shingle_size (int): Words per shingle
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures must be comparable across processes and restarts
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return [" ".join(words)]
+        return [
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        ]
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of ``text`` as a ``uint64`` array of length ``num_perm``."""
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in set(self.shingles(text))),
+            dtype=np.uint64,
+        )
+        permuted = (hashes[:, None] * self._a + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        """One short digest per LSH band, equal digests mark candidate near-duplicates."""
+        return [
+            hashlib.sha1(band.tobytes()).hexdigest()[:16]
+            for band in signature.reshape(self.bands, self.rows)
+        ]
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(left == right))
@@ -0,0 +1,399 @@
+"""
+Message transports for summary requests and completion events.
+
+The request handler talks to a ``MessageTransport`` rather than to Kafka directly, so the
+pipeline can run on whichever bus is available. ``settings.MESSAGE_TRANSPORT`` selects it:
+
+- ``kafka``: Kafka through aiokafka (``app.core.kafka``)
+- ``redis``: Redis Streams, one stream per topic (``app.core.redis_streams``)
+- ``memory``: in-process log, for tests and single-machine benchmarks (``app.core.local_bus``)
+- ``file``: the in-process log persisted under TRANSPORT_DIR, survives restarts
+
+Every backend keeps Kafka's consumer-group semantics. A topic is an ordered log of records
+with integer offsets, a group stores the offset of the next record to read, and commits only
+move forward once every earlier record is done (see ``OffsetTracker``). Outside Kafka each
+topic is a single partition, owned by one consumer of a group at a time.
+
+Typical usage:
+    transport = create_transport()
+    consumer = await transport.start_consumer(tracker)
+    await transport.publish("summary_completed", value)
+    await transport.commit(tracker)
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Headers = List[Tuple[str, bytes]]
+
+# How often a log consumer renews its partition ownership, well within the lease
+_REBALANCE_INTERVAL = 1.0
+
+
+class TopicPartition(NamedTuple):
+    """Same fields as aiokafka's, and equal to it, so aiokafka is only needed for Kafka."""
+
+    topic: str
+    partition: int
+
+
+class OffsetAndMetadata(NamedTuple):
+    offset: int
+    metadata: str
+
+
+class CommitFailedError(Exception):
+    """A commit was rejected because the partition now belongs to another consumer."""
+
+
+@dataclass
+class Record:
+    """A consumed record, with the attributes of aiokafka's ConsumerRecord the handler reads."""
+
+    topic: str
+    partition: int
+    offset: int
+    value: bytes
+    key: Optional[bytes] = None
+    headers: Headers = field(default_factory=list)
+    timestamp: int = 0  # Epoch milliseconds
+
+
+def encode_headers(headers: Optional[Iterable[Tuple[str, bytes]]]) -> str:
+    """Headers as JSON text, header values may be arbitrary bytes."""
+    return json.dumps([[key, base64.b64encode(value).decode("ascii")] for key, value in headers or ()])
+
+
+def decode_headers(encoded: Optional[str]) -> Headers:
+    if not encoded:
+        return []
+    return [(key, base64.b64decode(value)) for key, value in json.loads(encoded)]
+
+
+class MessageTransport(ABC):
+    """
+    Publishes records and runs the summary request consumer on one message bus.
+
+    Attributes:
+        consumer: Started consumer, None until ``start_consumer``. It exposes the subset of
+            the AIOKafkaConsumer API the handler uses: ``getmany``, ``seek``, ``pause``,
+            ``resume``, ``assignment`` and ``commit``
+    """
+
+    consumer: Optional[Any] = None
+
+    async def start_producer(self) -> Any:
+        """Connect for publishing ahead of the first ``publish``, if the backend needs it."""
+        return None
+
+    async def stop_producer(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        headers: Optional[Headers] = None,
+    ) -> None:
+        """Append a raw record to ``topic`` and wait until it is stored."""
+
+    @abstractmethod
+    async def open_reader(self, topic: str, group_id: str) -> Any:
+        """
+        Start a consumer of ``group_id`` that reads every partition of ``topic``.
+
+        Partitions start at the group's committed offsets, or at the beginning. The consumer
+        also answers ``end_offsets``, and the caller stops it when done. Tools such as the DLQ
+        replay use it.
+        """
+
+    @abstractmethod
+    async def start_consumer(self, tracker: Any) -> Any:
+        """
+        Start the summary request consumer.
+
+        Args:
+            tracker: ``OffsetTracker`` of the records being processed, committed before a
+                partition moves to another consumer
+        """
+
+    async def commit(self, tracker: Any) -> None:
+        """Commit every offset the tracker advanced, failures are retried with the next commit."""
+        offsets = tracker.committable()
+        if not offsets or self.consumer is None:
+            return
+        try:
+            await self.consumer.commit(offsets)
+            tracker.mark_committed(offsets)
+        except Exception as e:
+            logger.warning(f"Offset commit failed: {str(e)}")
+
+    async def stop_consumer(self) -> None:
+        if self.consumer is not None:
+            await self.consumer.stop()
+            self.consumer = None
+
+    async def close(self) -> None:
+        await self.stop_consumer()
+        await self.stop_producer()
+
+    @staticmethod
+    def serialize_message(message: Dict[str, Any]) -> bytes:
+        """
+        Serialize message to JSON bytes.
+
+        Args:
+            message: Dictionary containing message data
+
+        Returns:
+            bytes: JSON-encoded message
+
+        Raises:
+            TypeError: If the message holds a value JSON cannot represent
+            ValueError: If the message contains a circular reference
+        """
+        try:
+            return json.dumps(message).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            logger.error(f"Message serialization failed: {str(e)}")
+            raise
+
+    @staticmethod
+    def deserialize_message(message: bytes) -> Dict[str, Any]:
+        """
+        Deserialize message from JSON bytes.
+
+        Args:
+            message: JSON-encoded message bytes
+
+        Returns:
+            dict: Deserialized message data
+
+        Raises:
+            json.JSONDecodeError: If message deserialization fails
+        """
+        try:
+            return json.loads(message.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            logger.error(f"Message deserialization failed: {str(e)}")
+            raise
+
+    async def send_summary_completed(
+        self, user_id: int, summary_data: Dict[str, Any]
+    ) -> None:
+        """
+        Send completion notification for processed summary.
+
+        Waits until the transport has stored the event; on Kafka the message itself is
+        batched with other sends for up to KAFKA_PRODUCER_LINGER_MS.
+
+        Args:
+            user_id: ID of the user who requested the summary
+            summary_data: Dictionary containing summary results and metadata
+
+        Raises:
+            Exception: If message sending fails
+        """
+        message = {
+            "user_id": user_id,
+            "summary": summary_data,
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": "completed",
+        }
+
+        try:
+            await self.publish(
+                "summary_completed",
+                self.serialize_message(message),
+                key=str(user_id).encode("utf-8"),
+            )
+            logger.info(f"Summary completion notification sent for user {user_id}")
+        except Exception as e:
+            logger.error(
+                f"Failed to send summary completion for user {user_id}: {str(e)}"
+            )
+            raise
+
+
+class LogConsumer(ABC):
+    """
+    Consumer-group reader over single-partition topics, for the transports other than Kafka.
+
+    Mirrors the AIOKafkaConsumer calls the handler makes. A consumer reads the topics whose
+    ownership it holds for its group, starting at the group's committed offset (or the
+    beginning, like ``auto_offset_reset="earliest"``). A topic owned by another consumer is
+    picked up once that consumer stops or, on a shared backend, its lease runs out; the
+    rebalance listener sees the same revoke/assign calls as with Kafka.
+    """
+
+    def __init__(
+        self,
+        topics: Iterable[str],
+        group_id: str,
+        listener: Optional[Any] = None,
+        max_poll_records: int = 500,
+    ) -> None:
+        self.group_id = group_id
+        self._partitions = [TopicPartition(topic, 0) for topic in topics]
+        self._listener = listener
+        self._max_poll_records = max_poll_records
+        self._assigned: Set[TopicPartition] = set()
+        self._positions: Dict[TopicPartition, int] = {}
+        self._paused: Set[TopicPartition] = set()
+        self._last_rebalance = 0.0
+
+    async def start(self) -> None:
+        await self._rebalance()
+
+    async def stop(self) -> None:
+        for tp in self._assigned:
+            await self._release(tp)
+        self._assigned.clear()
+
+    def assignment(self) -> Set[TopicPartition]:
+        return set(self._assigned)
+
+    def seek(self, tp: TopicPartition, offset: int) -> None:
+        self._positions[tp] = offset
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self._paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self._paused.difference_update(partitions)
+
+    def paused(self) -> Set[TopicPartition]:
+        return set(self._paused)
+
+    async def position(self, tp: TopicPartition) -> int:
+        return self._positions[tp]
+
+    async def committed(self, tp: TopicPartition) -> Optional[int]:
+        return await self._load_committed(tp)
+
+    async def end_offsets(self, partitions: Iterable[TopicPartition]) -> Dict[TopicPartition, int]:
+        """Offset after the last record of each partition."""
+        return {tp: await self._end_offset(tp) for tp in partitions}
+
+    async def commit(self, offsets: Dict[TopicPartition, OffsetAndMetadata]) -> None:
+        """
+        Store the group's next offset to read for each partition.
+
+        Raises:
+            CommitFailedError: If a partition is no longer owned by this consumer
+        """
+        lost = [tp for tp in offsets if tp not in self._assigned]
+        if lost:
+            raise CommitFailedError(f"Partitions {lost} are owned by another consumer of {self.group_id}")
+        await self._store_committed({tp: offset.offset for tp, offset in offsets.items()})
+
+    async def getmany(
+        self,
+        *partitions: TopicPartition,
+        timeout_ms: int = 0,
+        max_records: Optional[int] = None,
+    ) -> Dict[TopicPartition, List[Record]]:
+        """Records after the current positions, waiting up to ``timeout_ms`` if there are none."""
+        if time.monotonic() - self._last_rebalance >= _REBALANCE_INTERVAL:
+            await self._rebalance()
+        readable = {
+            tp: self._positions[tp]
+            for tp in partitions or self._assigned
+            if tp in self._assigned and tp not in self._paused
+        }
+        if not readable:
+            await asyncio.sleep(timeout_ms / 1000)
+            return {}
+
+        batches = await self._fetch(readable, max_records or self._max_poll_records, timeout_ms / 1000)
+        for tp, records in batches.items():
+            self._positions[tp] = records[-1].offset + 1
+        return batches
+
+    async def _rebalance(self) -> None:
+        """Renew ownership of the partitions held and take over any that are free."""
+        self._last_rebalance = time.monotonic()
+        revoked, assigned = set(), set()
+        for tp in self._partitions:
+            if await self._acquire(tp):
+                if tp not in self._assigned:
+                    assigned.add(tp)
+            elif tp in self._assigned:
+                revoked.add(tp)
+
+        if revoked:
+            # Already owned elsewhere, so commits for them are rejected like Kafka's would be
+            self._assigned -= revoked
+            self._paused -= revoked
+            if self._listener is not None:
+                await self._listener.on_partitions_revoked(revoked)
+        if assigned:
+            for tp in assigned:
+                committed = await self._load_committed(tp)
+                self._positions[tp] = committed if committed is not None else 0
+            self._assigned |= assigned
+            if self._listener is not None:
+                await self._listener.on_partitions_assigned(assigned)
+
+    @abstractmethod
+    async def _acquire(self, tp: TopicPartition) -> bool:
+        """Take or renew ownership of ``tp`` for this consumer, False if another one holds it."""
+
+    @abstractmethod
+    async def _release(self, tp: TopicPartition) -> None:
+        """Give up ownership of ``tp``."""
+
+    @abstractmethod
+    async def _load_committed(self, tp: TopicPartition) -> Optional[int]:
+        """The group's committed offset of ``tp``, None if it never committed."""
+
+    @abstractmethod
+    async def _store_committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        """Persist the group's committed offsets."""
+
+    @abstractmethod
+    async def _end_offset(self, tp: TopicPartition) -> int:
+        """Offset after the last record of ``tp``, 0 while it is empty."""
+
+    @abstractmethod
+    async def _fetch(
+        self, positions: Dict[TopicPartition, int], max_records: int, timeout: float
+    ) -> Dict[TopicPartition, List[Record]]:
+        """Records at or after ``positions``, waiting up to ``timeout`` seconds for new ones."""
+
+
+def create_transport(redis_client: Optional[Any] = None) -> MessageTransport:
+    """
+    Transport selected by ``settings.MESSAGE_TRANSPORT``.
+
+    Args:
+        redis_client: Async Redis client for the ``redis`` transport, a pool is created from
+            REDIS_URL if omitted
+    """
+    # Imported here, each backend module imports this one
+    if settings.MESSAGE_TRANSPORT == "kafka":
+        from app.core.kafka import KafkaClient
+
+        return KafkaClient()
+    if settings.MESSAGE_TRANSPORT == "redis":
+        from app.core.redis_streams import RedisStreamTransport
+
+        return RedisStreamTransport(redis_client)
+
+    from app.core.local_bus import LocalTransport, get_bus
+
+    directory = settings.TRANSPORT_DIR if settings.MESSAGE_TRANSPORT == "file" else None
+    return LocalTransport(get_bus(directory))
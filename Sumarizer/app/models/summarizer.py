@@ -1,14 +1,33 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Literal
 
 @dataclass
 class SummaryRequest:
     content: str
+    # Tokens per summary, capped by the model route the content's length selects
     max_length: int | None = None
     min_length: int | None = None
+    # "hierarchical" re-summarizes chunk summaries, "concat" joins them as-is
+    strategy: Literal["hierarchical", "concat"] | None = None
+    # "extractive" ranks and returns source sentences, "auto" falls back to it under load
+    mode: Literal["abstractive", "extractive", "auto"] | None = None
+    # Scheduling: interactive requests are served before bulk ones, users round-robin
+    priority: Literal["interactive", "bulk"] | None = None
+    user_id: str | None = None
 
 @dataclass
 class SummaryResponse:
     summary: str
     processing_time: float
-    chunks_processed: int
\ No newline at end of file
+    chunks_processed: int
+    mode: Literal["abstractive", "extractive"] = "abstractive"
+    model: str | None = None
+
+@dataclass(frozen=True)
+class GenerationParams:
+    """Generation settings shared by every chunk in an inference batch."""
+    model: str
+    min_new_tokens: int
+    max_new_tokens: int
+    num_beams: int = 1
+    no_repeat_ngram_size: int = 0
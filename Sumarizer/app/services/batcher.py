@@ -0,0 +1,258 @@
+"""
+Micro-batching inference scheduler.
+
+Chunks submitted by concurrent summarization requests (HTTP and Kafka) are collected
+for up to ``MAX_BATCH_WAIT_MS`` or until ``MAX_BATCH_SIZE`` chunks are waiting, then
+padded into a single ``model.generate`` call. Each caller gets back the summary of its
+own chunk. Waiting chunks are ordered by ``FairQueue``: interactive before bulk, and
+round-robin across users. ``admit`` sheds interactive requests with ``QueueFullError``
+and makes bulk requests wait once their class is at its depth limit.
+
+Typical usage:
+    batcher = BatchScheduler(run_batch=service._summarize_batch, executor=get_inference_executor())
+    await batcher.admit(owner, chunks=len(chunks))
+    summary = await batcher.submit(chunk, GenerationParams(model=name, min_new_tokens=16, max_new_tokens=96), owner)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.executor import InferenceExecutor
+from app.models.summarizer import GenerationParams
+from app.services.chunker import Chunk
+from app.services.scheduler import PRIORITIES, FairQueue, JobOwner, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Job:
+    """A single chunk waiting for inference."""
+
+    chunk: Chunk
+    params: GenerationParams
+    owner: JobOwner
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class BatchStats:
+    """Running counters used to judge batching efficiency."""
+
+    batches: int = 0
+    chunks: int = 0
+    max_batch: int = 0
+    busy_seconds: float = 0.0
+    # Moving average of the time chunks spent queued, per priority class
+    queue_wait: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PRIORITIES, 0.0))
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.chunks / self.batches if self.batches else 0.0
+
+    @property
+    def seconds_per_chunk(self) -> float:
+        return self.busy_seconds / self.chunks if self.chunks else 0.0
+
+
+class BatchScheduler:
+    """
+    Collects chunks from concurrent callers and runs them through the model in batches.
+
+    Attributes:
+        run_batch: Blocking callable summarizing a list of chunks that share generation params
+        executor (InferenceExecutor): Pool the batches run on, one batch per worker at a time
+        max_batch_size (int): Upper bound on chunks per generate call
+        max_wait (float): Seconds to wait for a batch to fill after the first chunk
+        stats (BatchStats): Batching counters
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Chunk], GenerationParams], List[str]],
+        executor: InferenceExecutor,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+    ) -> None:
+        self.run_batch = run_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size or settings.MAX_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.MAX_BATCH_WAIT_MS) / 1000
+        self.stats = BatchStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.limits = {
+            "interactive": settings.INTERACTIVE_QUEUE_LIMIT,
+            "bulk": settings.BULK_QUEUE_LIMIT,
+        }
+        self._queue: Optional[FairQueue] = None
+        self._capacity: Optional[asyncio.Condition] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # Jobs whose params did not match the batch they were collected with
+        self._carry_over: List[_Job] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return (len(self._queue) if self._queue else 0) + len(self._carry_over)
+
+    async def admit(self, owner: JobOwner, chunks: int = 1) -> None:
+        """
+        Admission control, called once per request before its chunks are submitted.
+
+        Args:
+            owner: Priority class and user of the request
+            chunks: Chunks the request will queue. A request larger than a limit is only
+                admitted onto an empty queue, rather than never
+
+        Raises:
+            QueueFullError: For interactive requests while their class or their user is at
+                the depth limit; bulk requests wait for capacity instead
+        """
+        self._ensure_worker()
+        if not self._is_full(owner, chunks):
+            return
+        if owner.priority == "interactive":
+            raise QueueFullError(
+                f"{owner.priority} queue is full", retry_after=self.retry_after(owner.priority)
+            )
+        async with self._capacity:
+            await self._capacity.wait_for(lambda: not self._is_full(owner, chunks))
+
+    def retry_after(self, priority: str) -> int:
+        """Seconds until the queued chunks of ``priority`` should have drained."""
+        backlog = self._queue.depth(priority) if self._queue else 0
+        if priority == "bulk" and self._queue:
+            backlog += self._queue.depth("interactive")
+        seconds = backlog * self.stats.seconds_per_chunk / self.executor.workers
+        return min(max(math.ceil(seconds), 1), settings.MAX_RETRY_AFTER)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depths, limits and throughput for the queue metrics endpoint."""
+        queues = self._queue.snapshot() if self._queue else {p: {"depth": 0, "users": 0} for p in PRIORITIES}
+        for priority, queue in queues.items():
+            queue["limit"] = self.limits[priority]
+            queue["avg_wait_seconds"] = round(self.stats.queue_wait[priority], 4)
+            queue["estimated_drain_seconds"] = self.retry_after(priority) if queue["depth"] else 0
+        return {
+            "queues": queues,
+            "carry_over": len(self._carry_over),
+            "batches": self.stats.batches,
+            "chunks": self.stats.chunks,
+            "avg_batch_size": round(self.stats.avg_batch_size, 2),
+            "max_batch_size": self.stats.max_batch,
+            "seconds_per_chunk": round(self.stats.seconds_per_chunk, 4),
+        }
+
+    async def submit(
+        self, chunk: Chunk, params: GenerationParams, owner: JobOwner = JobOwner()
+    ) -> str:
+        """
+        Queue a chunk for batched inference and wait for its summary.
+
+        Args:
+            chunk: Tokenized text to summarize
+            params: Generation parameters, only chunks with equal params share a batch
+            owner: Priority class and user the chunk is scheduled for
+
+        Returns:
+            str: Summary of the chunk
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put(_Job(chunk=chunk, params=params, owner=owner, future=future))
+        return await future
+
+    def _is_full(self, owner: JobOwner, chunks: int) -> bool:
+        """True if queueing ``chunks`` more would take the class or the user past its limit."""
+
+        def exceeds(depth: int, limit: int) -> bool:
+            return depth + min(chunks, limit) > limit
+
+        return exceeds(self._queue.depth(owner.priority), self.limits[owner.priority]) or exceeds(
+            self._queue.user_depth(owner), settings.USER_QUEUE_LIMIT
+        )
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and tasks are bound to the loop that created them
+            self._loop = loop
+            self._queue = FairQueue(interactive_weight=settings.INTERACTIVE_WEIGHT)
+            self._capacity = asyncio.Condition()
+            self._carry_over = []
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._slots = asyncio.Semaphore(self.executor.workers)
+            self._worker = loop.create_task(self._run())
+
+    async def _collect(self) -> List[_Job]:
+        """Wait for the first job, then gather more until the batch is full or the wait expires."""
+        carried = self._carry_over
+        jobs = list(carried) or [await self._queue.get()]
+        self._carry_over = []
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(jobs) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        now = time.perf_counter()
+        for job in jobs[len(carried):]:
+            wait = self.stats.queue_wait
+            wait[job.owner.priority] += 0.1 * (now - job.enqueued_at - wait[job.owner.priority])
+        # Dequeued jobs free capacity for bulk requests waiting in admit()
+        async with self._capacity:
+            self._capacity.notify_all()
+        return jobs
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for a free worker first so batches keep filling while all workers are busy
+            await self._slots.acquire()
+            jobs = await self._collect()
+
+            # One generate call per parameter set, the oldest set goes first
+            groups: Dict[GenerationParams, List[_Job]] = {}
+            for job in jobs:
+                groups.setdefault(job.params, []).append(job)
+            params, batch = next(iter(groups.items()))
+            self._carry_over = [job for job in jobs if job.params != params]
+
+            batch = [job for job in batch if not job.future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._execute(batch, params))
+            task.add_done_callback(lambda _: self._slots.release())
+
+    async def _execute(self, batch: List[_Job], params: GenerationParams) -> None:
+        start = time.perf_counter()
+        try:
+            summaries = await self.executor.run(
+                self.run_batch, [job.chunk for job in batch], params
+            )
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} chunks failed: {str(e)}")
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.busy_seconds += time.perf_counter() - start
+        self.stats.chunks += len(batch)
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        for job, summary in zip(batch, summaries):
+            if not job.future.done():
+                job.future.set_result(summary)
@@ -0,0 +1,103 @@
+"""
+Tokenizer-aware text chunking.
+
+The content is tokenized once with the model's own (fast) tokenizer. Whole sentences are
+packed into chunks up to the exact model input budget, sentences longer than the budget
+are split at token boundaries, and consecutive chunks share ``overlap`` tokens. Each chunk
+keeps its token ids so inference does not tokenize the text a second time.
+
+Typical usage:
+    chunker = TokenChunker(tokenizer, max_tokens=settings.MAX_CHUNK_SIZE, overlap=settings.CHUNK_OVERLAP)
+    for chunk in chunker.split(content):
+        print(len(chunk.input_ids), chunk.text[:40])
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Any, List
+
+# Sentence ends followed by whitespace, and paragraph breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+@dataclass
+class Chunk:
+    """A slice of the input text and its token ids (without special tokens)."""
+
+    text: str
+    input_ids: List[int]
+
+
+class TokenChunker:
+    """
+    Packs sentences into chunks that fill the model input exactly.
+
+    Attributes:
+        tokenizer: Hugging Face fast tokenizer of the summarization model
+        budget (int): Tokens per chunk, excluding the special tokens the model adds
+        overlap (int): Tokens repeated at the start of the following chunk
+    """
+
+    def __init__(self, tokenizer: Any, max_tokens: int, overlap: int) -> None:
+        if not tokenizer.is_fast:
+            raise ValueError("TokenChunker needs a fast tokenizer for offset mapping")
+        self.tokenizer = tokenizer
+        model_limit = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()
+        self.budget = min(max_tokens, model_limit)
+        # At least one fresh token per chunk, otherwise splitting never advances
+        self.overlap = min(overlap, self.budget - 1)
+
+    def split(self, content: str) -> List[Chunk]:
+        """Split content into chunks of at most ``budget`` tokens."""
+        encoding = self.tokenizer(
+            content,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            verbose=False,  # Long inputs are expected here, they are what we split
+        )
+        ids, offsets = encoding["input_ids"], encoding["offset_mapping"]
+        if not ids:
+            return []
+
+        boundaries = self._sentence_boundaries(content, offsets)
+        chunks = []
+        start = fresh_start = 0
+        while start < len(ids):
+            hard_end = min(start + self.budget, len(ids))
+            # Prefer the last sentence end that fits, unless it would leave the chunk less
+            # than half full or add nothing beyond the overlap; then cut at a token boundary
+            index = bisect.bisect_right(boundaries, hard_end) - 1
+            end = hard_end
+            if index >= 0:
+                boundary = boundaries[index]
+                if boundary > fresh_start and boundary - start >= self.budget // 2:
+                    end = boundary
+
+            chunks.append(
+                Chunk(
+                    text=content[offsets[start][0]:offsets[end - 1][1]],
+                    input_ids=ids[start:end],
+                )
+            )
+            if end >= len(ids):
+                break
+            fresh_start = end
+            start = max(end - self.overlap, start + 1)
+        return chunks
+
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens in text, excluding special tokens."""
+        return len(self.tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+
+    @staticmethod
+    def _sentence_boundaries(content: str, offsets: List[tuple]) -> List[int]:
+        """Token indices at which a new sentence starts, in increasing order."""
+        token_starts = [start for start, _ in offsets]
+        boundaries = []
+        for match in _SENTENCE_BOUNDARY.finditer(content):
+            index = bisect.bisect_left(token_starts, match.end())
+            if 0 < index < len(offsets) and (not boundaries or boundaries[-1] != index):
+                boundaries.append(index)
+        boundaries.append(len(offsets))
+        return boundaries
@@ -2,19 +2,34 @@
 Kafka event handling implementation for the summarizer service.
 
 This module contains handlers for processing Kafka messages and
-managing the lifecycle of summary requests through the system.
+managing the lifecycle of summary requests through the system. Records arrive
+through the transport selected by MESSAGE_TRANSPORT; Kafka, Redis Streams and the
+local bus share the topic layout and commit semantics, so the handler is the same for all.
 
 Typical usage:
     handler = KafkaEventHandler()
     await handler.start_listening()
 """
 
-from typing import Dict, Any, Optional
-from app.core.kafka import KafkaClient
-from app.services.summarizer import SummarizerService
+from typing import Dict, Any, Optional, Set
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore, RequestInProgressError
+from app.core.kafka import (
+    ATTEMPT_HEADER,
+    DLQ_TOPIC,
+    RETRY_AT_HEADER,
+    RETRY_TOPIC_PREFIX,
+    OffsetTracker,
+    failure_headers,
+    header,
+    retry_topic,
+)
+from app.core.transport import MessageTransport, create_transport
+from app.services.summarizer import SummarizerService, get_summarizer_service
 from app.models.summarizer import SummaryRequest
 import asyncio
 import logging
+import time
 from datetime import datetime
 import traceback
 
@@ -29,41 +44,147 @@ class KafkaEventHandler:
     through processing and notification of completion.
 
     Attributes:
-        kafka (KafkaClient): Kafka client for message handling
-        summarizer (SummarizerService): Service for text summarization
+        transport (MessageTransport): Message bus the requests are consumed from
+        summarizer (SummarizerService): Shared service for text summarization
+        offsets (OffsetTracker): Commit positions of the records being processed
+        idempotency (IdempotencyStore): Processing state and results by request_id
     """
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[MessageTransport] = None) -> None:
         """Initialize Kafka handler with required services."""
-        self.kafka = KafkaClient()
-        self.summarizer = SummarizerService()
+        self.summarizer = get_summarizer_service()
+        self.transport = transport or create_transport(self.summarizer.cache.redis)
+        self.offsets = OffsetTracker()
+        self.idempotency = IdempotencyStore(self.summarizer.cache.redis)
+        self._stopping = False
         logger.info("Kafka event handler initialized")
 
     async def start_listening(self) -> None:
         """
-        Start listening for summary requests from Kafka.
+        Start listening for summary requests on the configured transport.
 
-        This method runs indefinitely, processing incoming messages
-        and handling any errors that occur during processing.
+        Records are polled in batches and processed concurrently, at most
+        KAFKA_MAX_CONCURRENCY at a time, so their chunks share inference batches.
+        Polling pauses while every slot is busy. Offsets are committed in order every
+        KAFKA_COMMIT_INTERVAL_MS, and once more on shutdown after in-flight records finish.
+        Records from a retry topic that are not due yet pause their partition until they are.
 
         Raises:
             Exception: If there's an unrecoverable error in the consumer
         """
         logger.info("Starting to listen for summary requests")
+        await self.transport.start_producer()
+        consumer = await self.transport.start_consumer(self.offsets)
+        slots = asyncio.Semaphore(settings.KAFKA_MAX_CONCURRENCY)
+        in_flight: Set[asyncio.Task] = set()
+        last_commit = time.monotonic()
         try:
-            async for message in self.kafka.consumer:
-                try:
-                    await self.handle_summary_request(message.value)
-                    # Commit offset only after successful processing
-                    self.kafka.consumer.commit()
-                except Exception as e:
-                    logger.error(
-                        f"Error processing message {message.value}: {str(e)}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
+            while not self._stopping:
+                batches = await consumer.getmany(
+                    timeout_ms=settings.KAFKA_POLL_TIMEOUT_MS,
+                    max_records=settings.KAFKA_MAX_POLL_RECORDS,
+                )
+                for tp, messages in batches.items():
+                    for message in messages:
+                        delay = self._retry_delay(message)
+                        if delay > 0:
+                            # Retry topics are ordered by due time, the rest of the partition waits too
+                            self._defer(consumer, tp, message.offset, delay)
+                            break
+                        await slots.acquire()
+                        self.offsets.add(tp, message.offset)
+                        task = asyncio.create_task(self._process(tp, message, slots))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+
+                if time.monotonic() - last_commit >= settings.KAFKA_COMMIT_INTERVAL_MS / 1000:
+                    await self.transport.commit(self.offsets)
+                    last_commit = time.monotonic()
+        except asyncio.CancelledError:
+            self._stopping = True
+            raise
         except Exception as e:
-            logger.critical(f"Kafka consumer failed: {str(e)}")
+            logger.critical(f"Summary request consumer failed: {str(e)}")
             raise
+        finally:
+            if in_flight:
+                logger.info(f"Waiting for {len(in_flight)} in-flight summary requests")
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            await self.transport.commit(self.offsets)
+            await self.transport.close()
+
+    def stop(self) -> None:
+        """
+        Stop polling, ``start_listening`` returns once in-flight records are done.
+
+        May be called before ``start_listening``, which then returns right after connecting.
+        """
+        self._stopping = True
+
+    async def _process(self, tp, message, slots: asyncio.Semaphore) -> None:
+        """Handle one record, then release its slot and mark its offset done."""
+        handled = True
+        try:
+            await self.handle_summary_request(self.transport.deserialize_message(message.value))
+        except Exception as e:
+            logger.error(
+                f"Error processing message {message.value}: {str(e)}\n"
+                f"Traceback: {traceback.format_exc()}"
+            )
+            # Failed records move to a retry or dead-letter topic so the partition keeps moving
+            handled = await self._route_failure(message, e)
+        finally:
+            slots.release()
+            if handled:
+                self.offsets.complete(tp, message.offset)
+
+    async def _route_failure(self, message, error: Exception) -> bool:
+        """
+        Republish a failed record to its next retry tier, or to the dead-letter topic.
+
+        Malformed requests (``ValueError``, including undecodable JSON) skip the retries.
+
+        Returns:
+            bool: False if the record could not be republished; the consumer is then stopped
+            without committing it, so it is redelivered after a restart
+        """
+        attempt = int(header(message, ATTEMPT_HEADER) or 0)
+        headers = failure_headers(message, error, attempt + 1)
+        if not isinstance(error, ValueError) and attempt < len(settings.KAFKA_RETRY_DELAYS_MS):
+            topic = retry_topic(attempt)
+            retry_at = int(time.time() * 1000) + settings.KAFKA_RETRY_DELAYS_MS[attempt]
+            headers.append((RETRY_AT_HEADER, str(retry_at).encode("utf-8")))
+        else:
+            topic = DLQ_TOPIC
+
+        try:
+            await self.transport.publish(topic, message.value, key=message.key, headers=headers)
+        except Exception as e:
+            logger.critical(f"Failed to publish record to {topic}, stopping consumer: {str(e)}")
+            self.stop()
+            return False
+        logger.warning(f"Moved failed record {message.topic}:{message.partition}:{message.offset} to {topic}")
+        return True
+
+    @staticmethod
+    def _retry_delay(message) -> float:
+        """Seconds until a retry record is due, 0 for records that can run now."""
+        retry_at = header(message, RETRY_AT_HEADER)
+        if retry_at is None or not message.topic.startswith(RETRY_TOPIC_PREFIX):
+            return 0.0
+        return max(0.0, (int(retry_at) - time.time() * 1000) / 1000)
+
+    @staticmethod
+    def _defer(consumer, tp, offset: int, delay: float) -> None:
+        """Rewind the partition to ``offset`` and pause it for ``delay`` seconds."""
+        consumer.seek(tp, offset)
+        consumer.pause(tp)
+
+        def resume() -> None:
+            if tp in consumer.assignment():
+                consumer.resume(tp)
+
+        asyncio.get_running_loop().call_later(delay, resume)
 
     async def handle_summary_request(self, data: Dict[str, Any]) -> None:
         """
@@ -74,9 +195,15 @@ class KafkaEventHandler:
                 - content: Text to summarize
                 - user_id: ID of requesting user
                 - request_id: Unique request identifier
+                - content_hash: Optional, set by NewScraper; the summary is then
+                  also stored under NEWS_SUMMARY_KEY_PREFIX for it to attach
+
+        Requests are deduplicated by ``request_id``: one that already completed is answered
+        from the idempotency store without running inference.
 
         Raises:
             ValueError: If required data is missing
+            RequestInProgressError: If another worker is processing the same request
             Exception: If summarization fails
         """
         request_id = data.get("request_id")
@@ -85,6 +212,19 @@ class KafkaEventHandler:
         if not all([request_id, user_id, data.get("content")]):
             raise ValueError("Missing required request data")
 
+        claim = await self.idempotency.claim(request_id)
+        if claim.state == "completed":
+            # Redelivery, e.g. after a crash before the offset was committed: the
+            # notification may not have gone out, so resend the stored result
+            logger.info(f"Summary request {request_id} already completed, resending stored result")
+            await self._publish_news_summary(data, claim.result["summary"])
+            await self.transport.send_summary_completed(user_id=user_id, summary_data=claim.result)
+            return
+        if claim.state == "in_progress":
+            raise RequestInProgressError(
+                f"Summary request {request_id} is being processed by another worker"
+            )
+
         logger.info(f"Processing summary request {request_id} for user {user_id}")
 
         try:
@@ -93,30 +233,34 @@ class KafkaEventHandler:
                 content=data["content"],
                 max_length=data.get("max_length"),
                 min_length=data.get("min_length"),
+                priority=data.get("priority") or "bulk",
+                user_id=str(user_id),
             )
 
             # Process summary
             summary_result = await self.summarizer.summarize(summary_request)
-
-            # Send completion notification
-            await self.kafka.send_summary_completed(
-                user_id=user_id,
-                summary_data={
-                    "request_id": request_id,
-                    "summary": summary_result.summary,
-                    "processing_time": summary_result.processing_time,
-                    "chunks_processed": summary_result.chunks_processed,
-                    "completed_at": datetime.utcnow().isoformat(),
-                },
-            )
-
-            logger.info(f"Summary request {request_id} completed successfully")
-
+            summary_data = {
+                "request_id": request_id,
+                "summary": summary_result.summary,
+                "processing_time": summary_result.processing_time,
+                "chunks_processed": summary_result.chunks_processed,
+                "completed_at": datetime.utcnow().isoformat(),
+            }
         except Exception as e:
             logger.error(
                 f"Failed to process summary request {request_id}: {str(e)}\n"
                 f"Traceback: {traceback.format_exc()}"
             )
-            # Here you might want to send a failure notification
-            # or implement retry logic
+            await self.idempotency.release(request_id)
             raise
+
+        # Written before the result is marked completed, a redelivery after that only resends
+        await self._publish_news_summary(data, summary_result.summary)
+        await self.idempotency.complete(request_id, summary_data)
+        await self.transport.send_summary_completed(user_id=user_id, summary_data=summary_data)
+        logger.info(f"Summary request {request_id} completed successfully")
+
+    async def _publish_news_summary(self, data: Dict[str, Any], summary: str) -> None:
+        """Make the summary of an article from the NewScraper pipeline readable by content hash."""
+        if data.get("content_hash"):
+            await self.summarizer.cache.set_news_summary(data["content_hash"], summary)
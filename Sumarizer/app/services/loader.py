@@ -0,0 +1,115 @@
+"""
+Background loading and warm-up of the summarizer service.
+
+Building ``SummarizerService`` imports torch and transformers, reads the model weights and
+starts the inference pool, which takes seconds to minutes. The loader does it off the event
+loop, right after startup (WARM_UP_ON_STARTUP) or on the first request. It then runs one
+synthetic batch through ``generate``, so kernel selection and allocator growth are paid
+before real traffic arrives. The process answers liveness probes throughout, and
+``/health/ready`` only reports ready once both steps are done.
+
+Typical usage:
+    loader = ModelLoader()
+    loader.start_loading()
+    service = await loader.get_service()
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Literal, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.summarizer import SummarizerService
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLoader:
+    """
+    Owns the process-wide summarizer service and reports its loading state.
+
+    Attributes:
+        state (str): idle, loading, warming, ready or failed
+        startup_error (Optional[str]): Error of the last failed load, retried on the next request
+        load_seconds (Optional[float]): Time spent importing and loading the model
+        warm_up_seconds (Optional[float]): Time spent on the synthetic generate pass
+        load_task (Optional[asyncio.Task]): Background load started at startup
+    """
+
+    def __init__(self) -> None:
+        self._service: Optional["SummarizerService"] = None
+        self._lock = asyncio.Lock()
+        self.state: Literal["idle", "loading", "warming", "ready", "failed"] = "idle"
+        self.startup_error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.load_task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    async def wait_ready(self) -> "SummarizerService":
+        """Wait until someone else has loaded the service, without starting the load."""
+        await self._ready.wait()
+        return self._service
+
+    async def get_service(self) -> "SummarizerService":
+        """Return the loaded and warmed service, loading it first if needed."""
+        if self._service is None:
+            async with self._lock:
+                if self._service is None:
+                    self._service = await self._load()
+        return self._service
+
+    async def _load(self) -> "SummarizerService":
+        try:
+            self.state = "loading"
+            start = time.perf_counter()
+            # Imports and weight loading are blocking, keep them off the event loop
+            service = await asyncio.to_thread(self._build_service)
+            self.load_seconds = time.perf_counter() - start
+
+            self.state = "warming"
+            start = time.perf_counter()
+            await service.warm_up()
+            self.warm_up_seconds = time.perf_counter() - start
+        except Exception as e:
+            self.state = "failed"
+            self.startup_error = str(e)
+            raise
+
+        self.state = "ready"
+        self.startup_error = None
+        self._ready.set()
+        logger.info(
+            f"Summarizer ready: loaded in {self.load_seconds:.2f}s, warmed up in {self.warm_up_seconds:.2f}s"
+        )
+        return service
+
+    @staticmethod
+    def _build_service() -> "SummarizerService":
+        from app.services.summarizer import get_summarizer_service
+
+        return get_summarizer_service()
+
+    async def load(self) -> None:
+        """Load ahead of the first request, recording rather than raising failures."""
+        try:
+            await self.get_service()
+        except Exception:
+            logger.exception("Model loading failed, will retry on first request")
+
+    def start_loading(self) -> None:
+        self.load_task = asyncio.create_task(self.load())
+
+    async def shutdown(self) -> None:
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+        if self._service is not None:
+            await self._service.cache.close()
+            self._service.batcher.executor.shutdown()
@@ -0,0 +1,80 @@
+"""
+Length-based routing of summary requests to a model and generation budget.
+
+Routes come from ``settings.MODEL_ROUTES`` and are tried in order. A document takes the
+first route whose ``max_input_tokens`` it fits and whose ``max_new_tokens`` covers the
+requested summary length, so short news items can go to a smaller model with greedy decoding
+and a small output cap, while long reports get beam search and a larger budget. A document
+that fits no route takes the last one.
+
+Routing happens before the cache lookup, since the route is part of the cache key, so a
+document's length is estimated from its characters rather than tokenized. Route boundaries
+are approximate, and chunking still uses exact token counts.
+
+Typical usage:
+    router = ModelRouter(settings.MODEL_ROUTES, default_model=settings.MODEL_NAME)
+    params = router.params(estimate_tokens(content), max_length=None, min_length=None)
+"""
+
+import math
+from typing import List, Optional, Sequence
+
+from app.core.config import ModelRoute
+from app.models.summarizer import GenerationParams
+
+# Typical for BPE tokenizers on English news text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``, without running a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class ModelRouter:
+    """
+    Picks a route by document length and turns it into generation parameters.
+
+    Attributes:
+        routes (List[ModelRoute]): Candidate routes, in priority order
+        default_model (str): Model of the routes that do not name one
+    """
+
+    def __init__(self, routes: Sequence[ModelRoute], default_model: str) -> None:
+        if not routes:
+            raise ValueError("MODEL_ROUTES needs at least one route")
+        self.routes: List[ModelRoute] = list(routes)
+        self.default_model = default_model
+
+    @property
+    def models(self) -> List[str]:
+        """Every model a request can be routed to, default model first."""
+        names = [self.default_model] + [route.model for route in self.routes if route.model]
+        return list(dict.fromkeys(names))
+
+    def route(self, input_tokens: int, max_length: Optional[int] = None) -> ModelRoute:
+        for route in self.routes:
+            fits = route.max_input_tokens is None or input_tokens <= route.max_input_tokens
+            if fits and (max_length is None or max_length <= route.max_new_tokens):
+                return route
+        return self.routes[-1]
+
+    def params(
+        self, input_tokens: int, max_length: Optional[int], min_length: Optional[int]
+    ) -> GenerationParams:
+        """
+        Generation parameters for a document of ``input_tokens`` tokens.
+
+        The request's ``max_length`` can lower the route's cap but not raise it, and no
+        chunk is given a budget longer than the whole document.
+        """
+        route = self.route(input_tokens, max_length)
+        max_new_tokens = min(route.max_new_tokens, max_length or route.max_new_tokens, max(input_tokens, 1))
+        min_new_tokens = min(min_length if min_length is not None else route.min_new_tokens, max_new_tokens)
+        return GenerationParams(
+            model=route.model or self.default_model,
+            min_new_tokens=min_new_tokens,
+            max_new_tokens=max_new_tokens,
+            num_beams=route.num_beams,
+            no_repeat_ngram_size=route.no_repeat_ngram_size,
+        )
@@ -0,0 +1,113 @@
+"""
+Priority classes, per-user fairness and admission control for inference jobs.
+
+Jobs belong to a priority class, "interactive" (HTTP callers waiting on a response) or
+"bulk" (Kafka backfills). ``FairQueue`` serves interactive jobs first but lets one bulk job
+through every ``interactive_weight`` jobs so backfills never stall completely. Within a
+class, users are served round-robin, one job at a time, so a single user's large
+document cannot hold everyone else's requests.
+
+Typical usage:
+    queue = FairQueue(interactive_weight=settings.INTERACTIVE_WEIGHT)
+    queue.put(job)
+    job = await queue.get()
+"""
+
+import asyncio
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Literal, Optional
+
+Priority = Literal["interactive", "bulk"]
+PRIORITIES = ("interactive", "bulk")
+
+
+@dataclass(frozen=True)
+class JobOwner:
+    """Who a job is scheduled for."""
+
+    priority: Priority = "interactive"
+    user_id: str = "anonymous"
+
+
+class QueueFullError(Exception):
+    """Raised when an interactive request is shed because its queue is full."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FairQueue:
+    """
+    Weighted two-class queue with round-robin across users inside each class.
+
+    Items only need an ``owner`` attribute holding a ``JobOwner``.
+    """
+
+    def __init__(self, interactive_weight: int) -> None:
+        self.interactive_weight = interactive_weight
+        self._users: Dict[str, "OrderedDict[str, Deque[Any]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._depth: Counter = Counter()
+        self._user_depth: Counter = Counter()
+        self._interactive_streak = 0
+        self._not_empty = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(self._depth.values())
+
+    def depth(self, priority: Priority) -> int:
+        return self._depth[priority]
+
+    def user_depth(self, owner: JobOwner) -> int:
+        return self._user_depth[owner]
+
+    def put(self, item: Any) -> None:
+        owner = item.owner
+        self._users[owner.priority].setdefault(owner.user_id, deque()).append(item)
+        self._depth[owner.priority] += 1
+        self._user_depth[owner] += 1
+        self._not_empty.set()
+
+    def get_nowait(self) -> Optional[Any]:
+        """Next item by class weight and user round-robin, None if the queue is empty."""
+        priority = self._next_priority()
+        if priority is None:
+            return None
+        users = self._users[priority]
+        user_id, items = next(iter(users.items()))
+        item = items.popleft()
+        if items:
+            users.move_to_end(user_id)
+        else:
+            del users[user_id]
+        self._depth[priority] -= 1
+        self._user_depth[item.owner] -= 1
+        if not self._user_depth[item.owner]:
+            del self._user_depth[item.owner]
+        return item
+
+    async def get(self) -> Any:
+        while True:
+            item = self.get_nowait()
+            if item is not None:
+                return item
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {
+            priority: {"depth": self._depth[priority], "users": len(self._users[priority])}
+            for priority in PRIORITIES
+        }
+
+    def _next_priority(self) -> Optional[Priority]:
+        has_interactive = bool(self._depth["interactive"])
+        has_bulk = bool(self._depth["bulk"])
+        if has_interactive and (not has_bulk or self._interactive_streak < self.interactive_weight):
+            self._interactive_streak += 1
+            return "interactive"
+        if has_bulk:
+            self._interactive_streak = 0
+            return "bulk"
+        return None
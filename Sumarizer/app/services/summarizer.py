@@ -1,118 +1,354 @@
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLm
 import asyncio
 import time
-from typing import List, Tuple
+import numpy as np
+from functools import lru_cache
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from app.core.config import settings
-from app.models.summarizer import SummaryRequest, SummaryResponse
+from app.models.summarizer import GenerationParams, SummaryRequest, SummaryResponse
 from app.core.cache import CacheManager
+from app.core.executor import get_inference_executor
+from app.core.model_registry import model_registry
+from app.services.batcher import BatchScheduler
+from app.services.chunker import Chunk, TokenChunker
+from app.services.extractive import ExtractiveSummarizer
+from app.services.routing import ModelRouter, estimate_tokens
+from app.services.scheduler import JobOwner
 
 
 class SummarizerService:
     def __init__(self):
-        self.tokenizer, self.model = self._load_model()
+        self.router = ModelRouter(settings.MODEL_ROUTES, default_model=settings.MODEL_NAME)
+        # Every routed model is loaded up front, chunks are tokenized for the model they go to
+        self.chunkers: Dict[str, TokenChunker] = {
+            name: TokenChunker(
+                model_registry.get(name, settings.INFERENCE_BACKEND).tokenizer,
+                max_tokens=settings.MAX_CHUNK_SIZE,
+                overlap=settings.CHUNK_OVERLAP,
+            )
+            for name in self.router.models
+        }
+        self.chunker = self.chunkers[settings.MODEL_NAME]
         self.cache = CacheManager()
-
-    def _load_model(self) -> Tuple[AutoTokenizer, AutoModelForSeq2SeqLm]:
-        """Load the tokenizer and model."""
-        start = time.perf_counter()
-        tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_NAME)
-        model = AutoModelForSeq2SeqLm.from_pretrained(settings.MODEL_NAME)
-        print(f"Model loaded in {time.perf_counter()-start:.2f} seconds")
-        return tokenizer, model
+        self.extractive = ExtractiveSummarizer(count_tokens=self.chunker.count_tokens)
+        self.batcher = BatchScheduler(
+            run_batch=self._summarize_batch, executor=get_inference_executor()
+        )
 
     async def summarize(self, request: SummaryRequest) -> SummaryResponse:
         """Generate summary for given content."""
-        # Check cache first
-        cached_summary = await self.cache.get_summary(request.content)
+        mode = request.mode or settings.SUMMARY_MODE
+        if mode == "extractive":
+            return await self._extract(request)
+
+        params = self._generation_params(request)
+        options = self._summary_options(request)
+
+        # Check cache first, then near-duplicates of previously summarized documents
+        cached_summary, signature = await self._lookup(request, params, options)
         if cached_summary:
             return SummaryResponse(
-                summary=cached_summary, processing_time=0, chunks_processed=0
+                summary=cached_summary, processing_time=0, chunks_processed=0, model=params.model
             )
+        if mode == "auto" and self._overloaded():
+            # Degrade to the extractive tier rather than queueing behind a full model
+            return await self._extract(request)
 
         start_time = time.perf_counter()
-        chunk_queue = asyncio.Queue(maxsize=settings.MAX_QUEUE_SIZE)
+        owner = self._owner(request)
+        chunks = await self._split(request.content, params.model)
+        await self._admit(owner, chunks)
+
+        # Map: summarize every chunk, batched together with other requests' chunks
+        summaries = await self._map(chunks, params, owner)
+        chunks_processed = len(chunks)
+
+        full_summary, reduced = await self._combine(summaries, params, request)
+        await self.cache.set_summary(
+            request.content, params, full_summary, signature=signature, **options
+        )
 
-        # Start producer/consumer tasks
-        producer = asyncio.create_task(
-            self._produce_chunks(chunk_queue, request.content)
+        return SummaryResponse(
+            summary=full_summary,
+            processing_time=time.perf_counter() - start_time,
+            chunks_processed=chunks_processed + reduced,
+            model=params.model,
         )
-        consumer = asyncio.create_task(self._consume_chunks(chunk_queue, request))
 
-        await producer
-        summaries = await consumer
+    async def summarize_stream(self, request: SummaryRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Look up and admit a request, then return a stream of its summary events.
 
-        # Combine summaries and cache result
-        full_summary = " ".join(summaries)
-        await self.cache.set_summary(request.content, full_summary)
+        The stream yields an extractive ``{"event": "preview", "data": {...}}`` first (if
+        STREAM_PREVIEW is on), then ``{"event": "chunk", "data": {...}}`` per chunk in
+        completion order, and a final ``{"event": "summary", "data": {...}}``. Closing it
+        early cancels every chunk that has not been generated yet.
 
-        return SummaryResponse(
+        Raises:
+            QueueFullError: Before any event, if an interactive request's queue is full
+        """
+        mode = request.mode or settings.SUMMARY_MODE
+        if mode == "extractive":
+            return self._summary_events(request)
+
+        params = self._generation_params(request)
+        options = self._summary_options(request)
+        cached_summary, signature = await self._lookup(request, params, options)
+        if cached_summary:
+            response = SummaryResponse(
+                summary=cached_summary, processing_time=0, chunks_processed=0, model=params.model
+            )
+            return self._summary_events(request, response)
+        if mode == "auto" and self._overloaded():
+            return self._summary_events(request)
+
+        owner = self._owner(request)
+        chunks = await self._split(request.content, params.model)
+        await self._admit(owner, chunks)
+        return self._stream(request, params, options, signature, owner, chunks)
+
+    async def _summary_events(
+        self, request: SummaryRequest, response: Optional[SummaryResponse] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """A stream of just the final summary event, extractive unless ``response`` is given."""
+        yield {"event": "summary", "data": asdict(response or await self._extract(request))}
+
+    async def _stream(
+        self,
+        request: SummaryRequest,
+        params: GenerationParams,
+        options: Dict[str, Any],
+        signature: Optional[np.ndarray],
+        owner: JobOwner,
+        chunks: List[Chunk],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Events of an admitted request, see ``summarize_stream``."""
+        start_time = time.perf_counter()
+        if settings.STREAM_PREVIEW:
+            preview = await self._extract(request)
+            yield {"event": "preview", "data": {"summary": preview.summary}}
+
+        tasks = await self._map_tasks(chunks, params, owner)
+        index_of = {task: index for index, task in enumerate(tasks)}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=index_of.get):
+                    yield {
+                        "event": "chunk",
+                        "data": {"index": index_of[task], "total": len(tasks), "summary": task.result()},
+                    }
+        finally:
+            # Client went away (or a chunk failed): drop everything still queued
+            for task in tasks:
+                task.cancel()
+
+        summaries = [task.result() for task in tasks]
+        full_summary, reduced = await self._combine(summaries, params, request)
+        await self.cache.set_summary(
+            request.content, params, full_summary, signature=signature, **options
+        )
+        response = SummaryResponse(
             summary=full_summary,
             processing_time=time.perf_counter() - start_time,
-            chunks_processed=len(summaries),
+            chunks_processed=len(chunks) + reduced,
+            model=params.model,
+        )
+        yield {"event": "summary", "data": asdict(response)}
+
+    async def warm_up(self) -> None:
+        """
+        Run one synthetic full-size batch through ``generate`` on every routed model.
+
+        Goes straight to the inference executor, so neither the cache nor the batching
+        statistics see it.
+        """
+        sentence = "Markets moved higher as investors weighed the latest earnings reports. "
+        text = sentence * (settings.WARM_UP_INPUT_TOKENS // self.chunker.count_tokens(sentence) + 1)
+        for route in self.router.routes:
+            params = GenerationParams(
+                model=route.model or settings.MODEL_NAME,
+                min_new_tokens=8,
+                max_new_tokens=32,
+                num_beams=route.num_beams,
+                no_repeat_ngram_size=route.no_repeat_ngram_size,
+            )
+            chunk = (await self._split(text, params.model))[0]
+            await self.batcher.executor.run(self._summarize_batch, [chunk] * settings.MAX_BATCH_SIZE, params)
+
+    async def _admit(self, owner: JobOwner, chunks: List[Chunk]) -> None:
+        """Admit a request by the chunks it can have queued at once (see ``_map_tasks``)."""
+        await self.batcher.admit(owner, chunks=min(len(chunks), settings.MAX_QUEUE_SIZE))
+
+    @staticmethod
+    def _owner(request: SummaryRequest) -> JobOwner:
+        return JobOwner(
+            priority=request.priority or "interactive",
+            user_id=request.user_id or "anonymous",
         )
 
-    async def _produce_chunks(self, queue: asyncio.Queue, content: str):
-        """Split content into chunks and add to queue."""
-        chunks = self._split_text(
-            content, max_tokens=settings.MAX_CHUNK_SIZE, overlap=settings.CHUNK_OVERLAP
+    def _overloaded(self) -> bool:
+        """True when enough chunks are queued for "auto" requests to go extractive."""
+        return self.batcher.queue_depth >= settings.AUTO_EXTRACTIVE_QUEUE_DEPTH
+
+    async def _extract(self, request: SummaryRequest) -> SummaryResponse:
+        """Extractive summary within the request's length budget."""
+        start_time = time.perf_counter()
+        summary = await asyncio.to_thread(
+            self.extractive.summarize,
+            request.content,
+            request.max_length or settings.SUMMARY_TARGET_TOKENS,
         )
-        for chunk in chunks:
-            await queue.put(chunk)
-        await queue.put(None)  # Signal completion
-
-    async def _consume_chunks(
-        self, queue: asyncio.Queue, request: SummaryRequest
-    ) -> List[str]:
-        """Process chunks from queue into summaries."""
-        summaries = []
-        while True:
-            chunk = await queue.get()
-            if chunk is None:
+        return SummaryResponse(
+            summary=summary,
+            processing_time=time.perf_counter() - start_time,
+            chunks_processed=0,
+            mode="extractive",
+        )
+
+    async def _lookup(
+        self, request: SummaryRequest, params: GenerationParams, options: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Exact, then near-duplicate cache lookup.
+
+        Returns:
+            Tuple[Optional[str], Optional[np.ndarray]]: Cached summary (if any) and the content's
+            MinHash signature, computed only when the exact lookup missed
+        """
+        cached_summary = await self.cache.get_summary(request.content, params, **options)
+        if cached_summary:
+            return cached_summary, None
+        signature = await self._signature(request.content)
+        if signature is not None:
+            cached_summary = await self.cache.get_similar_summary(signature, params, **options)
+        return cached_summary, signature
+
+    def _generation_params(self, request: SummaryRequest) -> GenerationParams:
+        """Model and generation budget for the request, routed by the content's estimated length."""
+        return self.router.params(estimate_tokens(request.content), request.max_length, request.min_length)
+
+    @staticmethod
+    def _summary_options(request: SummaryRequest) -> Dict[str, Any]:
+        """Document-level settings that change the final summary, part of its cache key."""
+        strategy = request.strategy or settings.SUMMARY_STRATEGY
+        if strategy == "hierarchical":
+            return {
+                "strategy": strategy,
+                "target_tokens": request.max_length or settings.SUMMARY_TARGET_TOKENS,
+            }
+        return {"strategy": strategy}
+
+    async def _combine(
+        self, summaries: List[str], params: GenerationParams, request: SummaryRequest
+    ) -> Tuple[str, int]:
+        """Join chunk summaries according to the request's strategy."""
+        if (request.strategy or settings.SUMMARY_STRATEGY) == "hierarchical":
+            return await self._reduce(
+                summaries,
+                params,
+                self._owner(request),
+                target_tokens=request.max_length or settings.SUMMARY_TARGET_TOKENS,
+            )
+        return " ".join(summaries), 0
+
+    async def _signature(self, content: str) -> Optional[np.ndarray]:
+        """MinHash signature for the near-duplicate cache, None when it is disabled."""
+        if self.cache.minhasher is None:
+            return None
+        return await asyncio.to_thread(self.cache.minhasher.signature, content)
+
+    async def _split(self, content: str, model: str) -> List[Chunk]:
+        """Split content into token-budgeted chunks for ``model``."""
+        # Tokenizing a long document takes a while, keep it off the event loop
+        return await asyncio.to_thread(self.chunkers[model].split, content)
+
+    async def _map(self, chunks: List[Chunk], params: GenerationParams, owner: JobOwner) -> List[str]:
+        """Summarize chunks in parallel and return the summaries in chunk order."""
+        tasks = await self._map_tasks(chunks, params, owner)
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _map_tasks(
+        self, chunks: List[Chunk], params: GenerationParams, owner: JobOwner
+    ) -> List[asyncio.Task]:
+        """
+        One task per chunk, at most MAX_QUEUE_SIZE of them submitted to the batcher at a time.
+
+        Chunks with a cached summary resolve immediately, so an edited document only
+        regenerates the chunks that changed.
+        """
+        slots = asyncio.Semaphore(settings.MAX_QUEUE_SIZE)
+        cached = await self.cache.get_chunks(chunks, params)
+
+        async def summarize_chunk(chunk: Chunk, hit: Optional[str]) -> str:
+            if hit is not None:
+                return hit
+            async with slots:
+                summary = await self.batcher.submit(chunk, params, owner)
+            await self.cache.set_chunk(chunk, params, summary)
+            return summary
+
+        return [
+            asyncio.create_task(summarize_chunk(chunk, hit)) for chunk, hit in zip(chunks, cached)
+        ]
+
+    async def _reduce(
+        self, summaries: List[str], params: GenerationParams, owner: JobOwner, target_tokens: int
+    ) -> Tuple[str, int]:
+        """
+        Re-summarize partial summaries until they fit ``target_tokens``.
+
+        Returns:
+            Tuple[str, int]: Final summary and number of chunks summarized while reducing
+        """
+        chunks_processed = 0
+        # Newlines keep each partial summary a separate paragraph for the chunker
+        text = "\n".join(summaries)
+        for _ in range(settings.MAX_REDUCE_ROUNDS):
+            if len(summaries) <= 1 or self.chunkers[params.model].count_tokens(text) <= target_tokens:
                 break
-            summary = self._summarize_chunk(chunk, request)
-            summaries.append(summary)
-            queue.task_done()
-        return summaries
-
-    def _split_text(self, content: str, max_tokens: int, overlap: int) -> List[str]:
-        """Split text into overlapping chunks."""
-        paragraphs = content.split("\n")
-        chunks = []
-        current_chunk = ""
-        current_tokens = 0
-
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            tokens = len(paragraph.split())
-
-            if current_tokens + tokens <= max_tokens:
-                current_chunk += f"{paragraph} "
-                current_tokens += tokens
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                overlap_text = " ".join(current_chunk.split()[-overlap:])
-                current_chunk = f"{overlap_text} {paragraph} "
-                current_tokens = len(current_chunk.split())
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        return chunks
-
-    def _summarize_chunk(self, chunk: str, request: SummaryRequest) -> str:
-        """Summarize a single chunk of text."""
-        inputs = self.tokenizer(
-            chunk,
-            max_length=request.max_length or 1024,
+            chunks = await self._split(text, params.model)
+            summaries = await self._map(chunks, params, owner)
+            chunks_processed += len(chunks)
+            text = "\n".join(summaries)
+        return " ".join(summaries), chunks_processed
+
+    def _summarize_batch(self, chunks: List[Chunk], params: GenerationParams) -> List[str]:
+        """Summarize a batch of chunks with one padded generate call, runs on the inference executor."""
+        import torch
+
+        loaded = model_registry.get(params.model, settings.INFERENCE_BACKEND)
+        tokenizer = loaded.tokenizer
+        # Reuse the chunker's token ids, only special tokens and padding are added here
+        inputs = tokenizer.pad(
+            {
+                "input_ids": [
+                    tokenizer.build_inputs_with_special_tokens(chunk.input_ids)
+                    for chunk in chunks
+                ]
+            },
             return_tensors="pt",
-            truncation=True,
         )
 
-        summary_ids = self.model.generate(
-            **inputs,
-            min_length=request.min_length or 50,
-            max_length=request.max_length or 1024,
-        )
+        with torch.inference_mode():
+            # Explicit budgets override the model's generation_config (e.g. 4 beams on distilbart-cnn)
+            summary_ids = loaded.model.generate(
+                **inputs,
+                min_new_tokens=params.min_new_tokens,
+                max_new_tokens=params.max_new_tokens,
+                num_beams=params.num_beams,
+                no_repeat_ngram_size=params.no_repeat_ngram_size,
+                early_stopping=params.num_beams > 1,
+            )
+
+        return tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
 
-        return self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+@lru_cache
+def get_summarizer_service() -> SummarizerService:
+    """Process-wide service so HTTP and Kafka requests share one batch scheduler."""
+    return SummarizerService()
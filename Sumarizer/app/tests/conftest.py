@@ -0,0 +1,46 @@
+import pytest
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
+from app.core.executor import InferenceExecutor
+from app.core.local_bus import LocalBus, LocalTransport
+from app.models.summarizer import GenerationParams
+
+WORDS = [
+    "the", "market", "rallied", "after", "earnings", "beat", "estimates", "shares",
+    "fell", "on", "weak", "guidance", "analysts", "expect", "growth", "to", "slow",
+    "next", "quarter", "revenue", "rose", "percent", "and", "margins", "improved",
+]
+
+
+@pytest.fixture(scope="session")
+def tokenizer():
+    """Small word-level fast tokenizer, so chunking is tested without downloading a model."""
+    vocab = {"[UNK]": 0, **{token: i for i, token in enumerate(WORDS + [".", ","], start=1)}}
+    backend = Tokenizer(models.WordLevel(vocab=vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", model_max_length=64)
+
+
+@pytest.fixture(scope="session")
+def executor():
+    """Inference pool with a single worker, batches run one at a time."""
+    executor = InferenceExecutor(workers=1, torch_threads=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def params():
+    return GenerationParams(model="test-model", min_new_tokens=8, max_new_tokens=32)
+
+
+@pytest.fixture
+def bus():
+    """Fresh in-memory bus, the process-wide one is shared between tests."""
+    return LocalBus()
+
+
+@pytest.fixture
+def transport(bus):
+    return LocalTransport(bus)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from transformers import AutoTokenizer
+
+from app.core.backends import ParityReport, _token_f1, check_parity
+from app.core.config import settings
+from scripts.check_parity import SAMPLE_TEXTS
+
+# Same bar as ``python -m scripts.check_parity``
+MIN_F1 = 0.9
+# Override to check a smaller model, e.g. sshleifer/distilbart-cnn-6-6
+PARITY_MODEL = os.environ.get("PARITY_MODEL", settings.MODEL_NAME)
+
+
+@pytest.fixture(scope="module")
+def model_name():
+    """The parity model, skipped unless it is already downloaded, tests never fetch weights."""
+    try:
+        AutoTokenizer.from_pretrained(PARITY_MODEL, local_files_only=True)
+    except OSError:
+        pytest.skip(f"{PARITY_MODEL} is not in the local Hugging Face cache")
+    return PARITY_MODEL
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backend_matches_fp32_summaries(model_name, backend, tmp_path, monkeypatch):
+    """Greedy summaries of each backend stay within the F1 bar of the fp32 PyTorch model."""
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+        monkeypatch.setattr(settings, "ONNX_CACHE_DIR", str(tmp_path))
+
+    report = check_parity(model_name, backend, SAMPLE_TEXTS)
+
+    assert report.total == len(SAMPLE_TEXTS)
+    assert report.mean_token_f1 >= MIN_F1, (
+        f"{backend} mean token F1 {report.mean_token_f1:.3f} "
+        f"(exact match {report.exact_match_rate:.0%}) is below {MIN_F1}"
+    )
+
+
+def test_token_f1():
+    assert _token_f1("rates held steady", "rates held steady") == 1.0
+    assert _token_f1("", "") == 1.0
+    assert _token_f1("rates held steady", "oil prices fell") == 0.0
+    assert _token_f1("rates held steady", "rates held") == pytest.approx(0.8)
+
+
+def test_parity_report_rates():
+    report = ParityReport(backend="int8", exact_matches=1, total=2, token_f1=[1.0, 0.5])
+
+    assert report.exact_match_rate == 0.5
+    assert report.mean_token_f1 == 0.75
+    assert ParityReport(backend="int8").mean_token_f1 == 0.0
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(fakeredis.aioredis.FakeRedis(), namespace="test")
+
+
+def test_a_request_is_claimed_once(store):
+    async def main():
+        assert (await store.claim("r1")).state == "acquired"
+        assert (await store.claim("r1")).state == "in_progress"
+        assert (await store.claim("r2")).state == "acquired"
+
+    asyncio.run(main())
+
+
+def test_completed_requests_return_their_result(store):
+    async def main():
+        await store.claim("r1")
+        await store.complete("r1", {"summary": "short"})
+
+        claim = await store.claim("r1")
+        assert claim.state == "completed"
+        assert claim.result == {"summary": "short"}
+
+    asyncio.run(main())
+
+
+def test_released_requests_can_be_claimed_again(store):
+    async def main():
+        await store.claim("r1")
+        await store.release("r1")
+        assert (await store.claim("r1")).state == "acquired"
+
+    asyncio.run(main())
+
+
+def test_disabled_store_processes_every_delivery(monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_ENABLED", False)
+    store = IdempotencyStore(fakeredis.aioredis.FakeRedis(), namespace="test")
+
+    async def main():
+        await store.claim("r1")
+        await store.complete("r1", {"summary": "short"})
+        assert (await store.claim("r1")).state == "acquired"
+        assert await store.redis.keys("*") == []
+
+    asyncio.run(main())
+
+
+def test_redis_outages_fail_open():
+    store = IdempotencyStore(fakeredis.aioredis.FakeRedis(connected=False), namespace="test")
+
+    assert asyncio.run(store.claim("r1")).state == "acquired"
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.core.local_bus import LocalBus, LocalConsumer, LocalTransport
+from app.core.transport import CommitFailedError, MessageTransport, OffsetAndMetadata, TopicPartition
+
+TOPIC = "summary_requests"
+TP = TopicPartition(TOPIC, 0)
+
+
+def test_group_resumes_from_its_committed_offset(bus):
+    for i in range(3):
+        bus.append(TOPIC, f"m{i}".encode())
+
+    async def main():
+        first = LocalConsumer(bus, [TOPIC], "group")
+        await first.start()
+        batch = await first.getmany(timeout_ms=0)
+        assert [r.value for r in batch[TP]] == [b"m0", b"m1", b"m2"]
+        await first.commit({TP: OffsetAndMetadata(2, "")})
+        await first.stop()
+
+        second = LocalConsumer(bus, [TOPIC], "group")
+        await second.start()
+        batch = await second.getmany(timeout_ms=0)
+        assert [r.value for r in batch[TP]] == [b"m2"]
+        assert await second.end_offsets([TP]) == {TP: 3}
+
+    asyncio.run(main())
+
+
+def test_a_partition_has_one_owner_per_group(bus):
+    bus.append(TOPIC, b"m0")
+
+    async def main():
+        owner = LocalConsumer(bus, [TOPIC], "group")
+        waiting = LocalConsumer(bus, [TOPIC], "group")
+        other_group = LocalConsumer(bus, [TOPIC], "other")
+        for consumer in (owner, waiting, other_group):
+            await consumer.start()
+
+        assert owner.assignment() == {TP}
+        assert waiting.assignment() == set()
+        assert other_group.assignment() == {TP}
+        with pytest.raises(CommitFailedError):
+            await waiting.commit({TP: OffsetAndMetadata(1, "")})
+
+        await owner.stop()
+        await waiting._rebalance()
+        assert waiting.assignment() == {TP}
+
+    asyncio.run(main())
+
+
+def test_getmany_waits_for_new_records(bus):
+    async def main():
+        consumer = LocalConsumer(bus, [TOPIC], "group")
+        await consumer.start()
+        poll = asyncio.create_task(consumer.getmany(timeout_ms=1000))
+        await asyncio.sleep(0.01)
+        await LocalTransport(bus).publish(TOPIC, b"late", key=b"k", headers=[("x-h", b"\x00v")])
+        batch = await asyncio.wait_for(poll, 1)
+
+        [record] = batch[TP]
+        assert (record.value, record.key, record.headers) == (b"late", b"k", [("x-h", b"\x00v")])
+
+    asyncio.run(main())
+
+
+def test_paused_partitions_are_not_read(bus):
+    bus.append(TOPIC, b"m0")
+
+    async def main():
+        consumer = LocalConsumer(bus, [TOPIC], "group")
+        await consumer.start()
+        consumer.pause(TP)
+        assert await consumer.getmany(timeout_ms=0) == {}
+        consumer.resume(TP)
+        assert len((await consumer.getmany(timeout_ms=0))[TP]) == 1
+
+    asyncio.run(main())
+
+
+def test_file_bus_survives_restarts(tmp_path):
+    bus = LocalBus(str(tmp_path))
+    bus.append(TOPIC, b"m0", key=b"k", headers=[("x-attempt", b"1")])
+    bus.append(TOPIC, b"m1")
+    bus.commit("group", {TOPIC: 1})
+
+    restarted = LocalBus(str(tmp_path))
+    [first, second] = restarted.read({TP: 0}, 10)[TP]
+    assert (first.value, first.key, first.headers) == (b"m0", b"k", [("x-attempt", b"1")])
+    assert second.offset == 1
+    assert restarted.committed("group", TOPIC) == 1
+
+
+def test_serialize_message_rejects_values_json_cannot_represent():
+    assert MessageTransport.deserialize_message(MessageTransport.serialize_message({"a": 1})) == {"a": 1}
+    with pytest.raises(TypeError):
+        MessageTransport.serialize_message({"a": {1, 2}})
+    circular = {}
+    circular["self"] = circular
+    with pytest.raises(ValueError):
+        MessageTransport.serialize_message(circular)
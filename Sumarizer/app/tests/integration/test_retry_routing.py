@@ -0,0 +1,118 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.kafka import ATTEMPT_HEADER, CONSUMER_GROUP, DLQ_TOPIC, REQUEST_TOPIC, RETRY_AT_HEADER, header, retry_topic
+from app.core.transport import Record, TopicPartition
+from app.services import kafka_handlers
+from app.services.kafka_handlers import KafkaEventHandler
+
+REQUEST = {"request_id": "r1", "user_id": 1, "content": "Shares rallied after earnings."}
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    """Summarizer whose inference always fails, the handler only sees the exception."""
+
+    async def summarize(request):
+        raise RuntimeError("inference failed")
+
+    service = SimpleNamespace(cache=SimpleNamespace(redis=None), summarize=summarize)
+    monkeypatch.setattr(kafka_handlers, "get_summarizer_service", lambda: service)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_ENABLED", False)
+    monkeypatch.setattr(settings, "KAFKA_RETRY_DELAYS_MS", [5000, 60000])
+    monkeypatch.setattr(settings, "KAFKA_POLL_TIMEOUT_MS", 20)
+    monkeypatch.setattr(settings, "KAFKA_COMMIT_INTERVAL_MS", 0)
+    return service
+
+
+@pytest.fixture
+def handler(summarizer, transport):
+    return KafkaEventHandler(transport=transport)
+
+
+def record(value: dict, topic: str = REQUEST_TOPIC, offset: int = 0, attempt: int | None = None) -> Record:
+    headers = [] if attempt is None else [(ATTEMPT_HEADER, str(attempt).encode("utf-8"))]
+    return Record(topic=topic, partition=0, offset=offset, value=json.dumps(value).encode("utf-8"), headers=headers)
+
+
+def process(handler: KafkaEventHandler, message: Record) -> None:
+    async def main():
+        tp = TopicPartition(message.topic, message.partition)
+        handler.offsets.add(tp, message.offset)
+        await handler._process(tp, message, asyncio.Semaphore(0))
+
+    asyncio.run(main())
+
+
+def published(bus, topic: str) -> list:
+    return bus.read({TopicPartition(topic, 0): 0}, 100).get(TopicPartition(topic, 0), [])
+
+
+def test_failures_move_to_the_next_retry_tier(handler, bus):
+    process(handler, record(REQUEST, offset=7))
+
+    [retry] = published(bus, retry_topic(0))
+    assert json.loads(retry.value) == REQUEST
+    assert header(retry, ATTEMPT_HEADER) == "1"
+    assert header(retry, RETRY_AT_HEADER) is not None
+    assert header(retry, "x-original-offset") == "7"
+    assert header(retry, "x-error-type") == "RuntimeError"
+    # Republished, so the original record is committed
+    assert handler.offsets.committable()[TopicPartition(REQUEST_TOPIC, 0)].offset == 8
+
+
+def test_retry_records_keep_their_origin(handler, bus):
+    message = record(REQUEST, topic=retry_topic(0), attempt=1)
+    message.headers.append(("x-original-offset", b"7"))
+    process(handler, message)
+
+    [retry] = published(bus, retry_topic(1))
+    assert header(retry, ATTEMPT_HEADER) == "2"
+    assert header(retry, "x-original-offset") == "7"
+
+
+def test_last_tier_failures_go_to_the_dead_letter_topic(handler, bus):
+    process(handler, record(REQUEST, topic=retry_topic(1), attempt=2))
+
+    [dead] = published(bus, DLQ_TOPIC)
+    assert header(dead, ATTEMPT_HEADER) == "3"
+    assert header(dead, RETRY_AT_HEADER) is None
+    assert published(bus, retry_topic(0)) == []
+
+
+@pytest.mark.parametrize("value", [{"request_id": "r1", "user_id": 1}, "not json"])
+def test_malformed_requests_skip_the_retries(handler, bus, value):
+    """ValueError, including undecodable JSON, goes straight to the dead-letter topic."""
+    message = record(REQUEST)
+    message.value = value.encode("utf-8") if isinstance(value, str) else json.dumps(value).encode("utf-8")
+    process(handler, message)
+
+    [dead] = published(bus, DLQ_TOPIC)
+    assert header(dead, ATTEMPT_HEADER) == "1"
+    assert header(dead, "x-error-type") in ("ValueError", "JSONDecodeError")
+    assert published(bus, retry_topic(0)) == []
+
+
+def test_consumer_routes_and_commits_past_failed_records(handler, transport, bus):
+    """End to end on the local bus: the consumer moves failures on and commits past them."""
+    bus.append(REQUEST_TOPIC, json.dumps({"request_id": "r1"}).encode("utf-8"))
+    bus.append(REQUEST_TOPIC, json.dumps(REQUEST).encode("utf-8"))
+
+    async def main():
+        listening = asyncio.create_task(handler.start_listening())
+        for _ in range(200):
+            if published(bus, DLQ_TOPIC) and published(bus, retry_topic(0)):
+                break
+            await asyncio.sleep(0.01)
+        handler.stop()
+        await asyncio.wait_for(listening, 5)
+
+    asyncio.run(main())
+
+    assert len(published(bus, DLQ_TOPIC)) == 1
+    assert len(published(bus, retry_topic(0))) == 1
+    assert bus.committed(CONSUMER_GROUP, REQUEST_TOPIC) == 2
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from dataclasses import replace
+
+import pytest
+
+from app.services.batcher import BatchScheduler
+from app.services.chunker import Chunk
+from app.services.scheduler import JobOwner, QueueFullError
+
+
+def chunk(i: int) -> Chunk:
+    return Chunk(text=f"chunk {i}", input_ids=[i])
+
+
+def test_each_caller_gets_the_summary_of_its_own_chunk(executor, params):
+    """Chunks from concurrent callers share one batch, results go back to the right caller."""
+    batches = []
+
+    def run_batch(chunks, params):
+        batches.append([c.text for c in chunks])
+        return [c.text.upper() for c in chunks]
+
+    batcher = BatchScheduler(run_batch, executor, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(
+            batcher.submit(chunk(i), params, JobOwner(user_id=f"user{i % 3}")) for i in range(6)
+        ))
+
+    assert asyncio.run(main()) == [f"CHUNK {i}" for i in range(6)]
+    assert len(batches) == 1
+    assert sorted(batches[0]) == sorted(f"chunk {i}" for i in range(6))
+    assert batcher.stats.chunks == 6
+
+
+def test_batches_are_split_by_generation_params(executor, params):
+    """Chunks with different params never share a generate call, and none is dropped."""
+    other = replace(params, max_new_tokens=64)
+    batches = []
+
+    def run_batch(chunks, batch_params):
+        batches.append((batch_params, [c.text for c in chunks]))
+        return [f"{c.text}/{batch_params.max_new_tokens}" for c in chunks]
+
+    batcher = BatchScheduler(run_batch, executor, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(
+            batcher.submit(chunk(i), params if i % 2 else other) for i in range(6)
+        ))
+
+    results = asyncio.run(main())
+
+    assert results == [f"chunk {i}/{32 if i % 2 else 64}" for i in range(6)]
+    assert len(batches) == 2
+    for batch_params, texts in batches:
+        expected = [f"chunk {i}" for i in range(6) if (i % 2) == (batch_params == params)]
+        assert sorted(texts) == expected
+
+
+def test_batch_failure_reaches_every_caller(executor, params):
+    def run_batch(chunks, params):
+        raise RuntimeError("out of memory")
+
+    batcher = BatchScheduler(run_batch, executor, max_batch_size=8, max_wait_ms=10)
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.submit(chunk(i), params) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_interactive_requests_are_shed_when_their_queue_is_full(executor, params):
+    """Admission counts the chunks a request will queue, a full class raises with Retry-After."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def run_batch(chunks, params):
+        started.set()
+        release.wait(5)
+        return [c.text for c in chunks]
+
+    batcher = BatchScheduler(run_batch, executor, max_batch_size=1, max_wait_ms=0)
+    batcher.limits["interactive"] = 3
+    owner = JobOwner("interactive", "alice")
+
+    async def main():
+        # The first chunk occupies the only worker, the next two stay queued
+        first = asyncio.create_task(batcher.submit(chunk(0), params, owner))
+        await asyncio.to_thread(started.wait, 5)
+        queued = [asyncio.create_task(batcher.submit(chunk(i), params, owner)) for i in (1, 2)]
+        await asyncio.sleep(0.01)
+
+        await batcher.admit(owner, chunks=1)
+        with pytest.raises(QueueFullError) as error:
+            await batcher.admit(owner, chunks=2)
+        assert error.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(first, *queued)
+        # Larger than the limit, but admitted once the queue is empty
+        await batcher.admit(owner, chunks=10)
+
+    asyncio.run(main())
+
+
+def test_bulk_requests_wait_for_capacity(executor, params):
+    release = threading.Event()
+    started = threading.Event()
+
+    def run_batch(chunks, params):
+        started.set()
+        release.wait(5)
+        return [c.text for c in chunks]
+
+    batcher = BatchScheduler(run_batch, executor, max_batch_size=1, max_wait_ms=0)
+    batcher.limits["bulk"] = 1
+    owner = JobOwner("bulk", "backfill")
+
+    async def main():
+        first = asyncio.create_task(batcher.submit(chunk(0), params, owner))
+        await asyncio.to_thread(started.wait, 5)
+        queued = asyncio.create_task(batcher.submit(chunk(1), params, owner))
+        await asyncio.sleep(0.01)
+
+        admitted = asyncio.create_task(batcher.admit(owner))
+        await asyncio.sleep(0.05)
+        assert not admitted.done()
+
+        release.set()
+        await asyncio.wait_for(admitted, 5)
+        await asyncio.gather(first, queued)
+
+    asyncio.run(main())
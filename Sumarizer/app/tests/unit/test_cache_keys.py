@@ -0,0 +1,83 @@
+from dataclasses import replace
+
+import pytest
+
+from app.core.cache import CacheManager
+from app.core.similarity import MinHasher
+from app.services.chunker import Chunk
+
+ARTICLE = (
+    "Shares of the company rallied on Tuesday after quarterly earnings beat analyst estimates, "
+    "with revenue rising twelve percent as demand for its cloud services kept growing. "
+    "Management raised its full year guidance and said margins should keep improving."
+)
+
+
+@pytest.fixture
+def cache():
+    # No connection is made until a command runs
+    return CacheManager(redis_url="redis://localhost:6379", namespace="test", model_name="m", backend="torch")
+
+
+def test_summary_key_depends_on_generation_settings(cache, params):
+    key = cache.summary_key(ARTICLE, params, strategy="hierarchical")
+
+    assert key == cache.summary_key(ARTICLE, params, strategy="hierarchical")
+    assert key != cache.summary_key(ARTICLE, replace(params, max_new_tokens=64), strategy="hierarchical")
+    assert key != cache.summary_key(ARTICLE, params, strategy="concat")
+    assert key != cache.summary_key(ARTICLE + " ", params, strategy="hierarchical")
+    assert key.startswith("test:summary:m:torch:")
+
+
+def test_summary_key_depends_on_model_and_backend(params):
+    keys = {
+        CacheManager(redis_url="redis://localhost:6379", model_name=model, backend=backend).summary_key(ARTICLE, params)
+        for model in ("m", "other")
+        for backend in ("torch", "int8")
+    }
+
+    assert len(keys) == 4
+
+
+def test_chunk_key_is_derived_from_token_ids(cache, params):
+    """Equal token ids share a key whatever the surrounding text, so edits reuse unchanged chunks."""
+    key = cache.chunk_key(Chunk(text="a", input_ids=[1, 2, 3]), params)
+
+    assert key == cache.chunk_key(Chunk(text="b", input_ids=[1, 2, 3]), params)
+    assert key != cache.chunk_key(Chunk(text="a", input_ids=[1, 2, 4]), params)
+    assert key != cache.chunk_key(Chunk(text="a", input_ids=[1, 2, 3]), replace(params, num_beams=2))
+
+
+def test_compressed_values_round_trip():
+    assert CacheManager._decode(CacheManager._encode("summary")) == "summary"
+    assert CacheManager._decode(b"not compressed") is None
+    assert CacheManager._decode(None) is None
+
+
+def test_minhash_estimates_similarity():
+    hasher = MinHasher(num_perm=128, bands=16, shingle_size=3)
+    signature = hasher.signature(ARTICLE)
+    edited = hasher.signature(ARTICLE.replace("Tuesday", "Wednesday"))
+    unrelated = hasher.signature("The weather service expects heavy rain across the coast for the rest of the week.")
+
+    assert MinHasher.similarity(signature, hasher.signature(ARTICLE)) == 1.0
+    assert MinHasher.similarity(signature, edited) > 0.7
+    assert MinHasher.similarity(signature, unrelated) < 0.1
+
+
+def test_near_duplicates_share_lsh_bands():
+    hasher = MinHasher(num_perm=128, bands=32, shingle_size=3)
+    keys = hasher.band_keys(hasher.signature(ARTICLE))
+    edited = hasher.band_keys(hasher.signature(ARTICLE.replace("Tuesday", "Wednesday")))
+
+    assert len(keys) == 32
+    assert set(keys) & set(edited)
+
+
+def test_minhash_signatures_are_stable_across_instances():
+    assert (MinHasher().signature(ARTICLE) == MinHasher().signature(ARTICLE)).all()
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=100, bands=16)
@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.chunker import TokenChunker
+
+SENTENCES = [
+    "the market rallied after earnings beat estimates .",
+    "shares fell on weak guidance .",
+    "analysts expect growth to slow next quarter .",
+    "revenue rose percent and margins improved .",
+]
+CONTENT = " ".join(SENTENCES * 6)
+
+
+def test_chunks_fit_the_budget_and_cover_the_text(tokenizer):
+    chunker = TokenChunker(tokenizer, max_tokens=20, overlap=4)
+    chunks = chunker.split(CONTENT)
+    ids = tokenizer(CONTENT, add_special_tokens=False)["input_ids"]
+
+    assert len(chunks) > 1
+    assert all(0 < len(chunk.input_ids) <= 20 for chunk in chunks)
+    assert chunks[0].input_ids == ids[: len(chunks[0].input_ids)]
+    assert chunks[-1].input_ids == ids[-len(chunks[-1].input_ids):]
+    for chunk in chunks:
+        assert chunk.text in CONTENT
+        assert chunker.count_tokens(chunk.text) == len(chunk.input_ids)
+
+
+def test_consecutive_chunks_overlap(tokenizer):
+    chunker = TokenChunker(tokenizer, max_tokens=20, overlap=4)
+    chunks = chunker.split(CONTENT)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.input_ids[:4] == previous.input_ids[-4:]
+
+
+def test_chunks_end_at_sentence_boundaries_when_they_can(tokenizer):
+    chunker = TokenChunker(tokenizer, max_tokens=20, overlap=0)
+
+    for chunk in chunker.split(CONTENT):
+        assert chunk.text.endswith(".")
+
+
+def test_budget_is_capped_by_the_model_input(tokenizer):
+    chunker = TokenChunker(tokenizer, max_tokens=4096, overlap=64)
+
+    assert chunker.budget == tokenizer.model_max_length
+    assert chunker.overlap < chunker.budget
+
+
+def test_empty_content_has_no_chunks(tokenizer):
+    assert TokenChunker(tokenizer, max_tokens=20, overlap=4).split("") == []
+
+
+def test_slow_tokenizers_are_rejected():
+    class SlowTokenizer:
+        is_fast = False
+
+    with pytest.raises(ValueError):
+        TokenChunker(SlowTokenizer(), max_tokens=20, overlap=4)
@@ -0,0 +1,59 @@
+from app.core.kafka import OffsetTracker
+from app.core.transport import OffsetAndMetadata, TopicPartition
+
+TP = TopicPartition("summary_requests", 0)
+
+
+def tracker_with(*offsets: int) -> OffsetTracker:
+    tracker = OffsetTracker()
+    for offset in offsets:
+        tracker.add(TP, offset)
+    return tracker
+
+
+def test_commit_waits_for_gaps_to_fill():
+    """Records finishing out of order only advance the commit up to the first unfinished one."""
+    tracker = tracker_with(10, 11, 12, 13)
+
+    tracker.complete(TP, 11)
+    tracker.complete(TP, 13)
+    assert tracker.committable() == {}
+
+    tracker.complete(TP, 10)
+    assert tracker.committable() == {TP: OffsetAndMetadata(12, "")}
+
+    tracker.complete(TP, 12)
+    assert tracker.committable() == {TP: OffsetAndMetadata(14, "")}
+    assert tracker.in_flight == 0
+
+
+def test_committed_offsets_are_not_offered_again():
+    tracker = tracker_with(0, 1)
+    tracker.complete(TP, 0)
+    offsets = tracker.committable()
+
+    tracker.mark_committed(offsets)
+    assert tracker.committable() == {}
+
+    tracker.complete(TP, 1)
+    assert tracker.committable() == {TP: OffsetAndMetadata(2, "")}
+
+
+def test_partitions_are_tracked_independently():
+    other = TopicPartition("summary_requests.retry.0", 0)
+    tracker = tracker_with(0, 1)
+    tracker.add(other, 5)
+
+    tracker.complete(TP, 1)
+    tracker.complete(other, 5)
+    assert tracker.committable() == {other: OffsetAndMetadata(6, "")}
+    assert tracker.committable([TP]) == {}
+
+
+def test_completions_after_revoke_are_ignored():
+    tracker = tracker_with(0, 1)
+    tracker.forget([TP])
+
+    tracker.complete(TP, 0)
+    assert tracker.committable() == {}
+    assert tracker.in_flight == 0
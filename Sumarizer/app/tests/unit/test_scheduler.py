@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+
+from app.services.scheduler import FairQueue, JobOwner
+
+
+@dataclass
+class Item:
+    owner: JobOwner
+    name: str
+
+
+def drain(queue: FairQueue) -> list:
+    names = []
+    while (item := queue.get_nowait()) is not None:
+        names.append(item.name)
+    return names
+
+
+def test_users_are_served_round_robin():
+    """A user with many queued jobs takes turns with the others."""
+    queue = FairQueue(interactive_weight=8)
+    for name in ("a1", "a2", "a3"):
+        queue.put(Item(JobOwner(user_id="alice"), name))
+    queue.put(Item(JobOwner(user_id="bob"), "b1"))
+    queue.put(Item(JobOwner(user_id="carol"), "c1"))
+
+    assert drain(queue) == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_bulk_gets_one_slot_per_interactive_weight():
+    """Interactive jobs go first, but one bulk job runs after every ``interactive_weight``."""
+    queue = FairQueue(interactive_weight=2)
+    for i in range(5):
+        queue.put(Item(JobOwner("interactive", "alice"), f"i{i}"))
+    for i in range(2):
+        queue.put(Item(JobOwner("bulk", "backfill"), f"b{i}"))
+
+    assert drain(queue) == ["i0", "i1", "b0", "i2", "i3", "b1", "i4"]
+
+
+def test_bulk_runs_when_no_interactive_jobs_wait():
+    queue = FairQueue(interactive_weight=8)
+    queue.put(Item(JobOwner("bulk", "backfill"), "b0"))
+
+    assert drain(queue) == ["b0"]
+
+
+def test_depths_are_tracked_per_class_and_user():
+    queue = FairQueue(interactive_weight=8)
+    alice = JobOwner("interactive", "alice")
+    alice_bulk = JobOwner("bulk", "alice")
+    queue.put(Item(alice, "i0"))
+    queue.put(Item(alice, "i1"))
+    queue.put(Item(alice_bulk, "b0"))
+
+    assert len(queue) == 3
+    assert queue.depth("interactive") == 2
+    assert queue.user_depth(alice) == 2
+    assert queue.user_depth(alice_bulk) == 1
+    assert queue.snapshot()["interactive"] == {"depth": 2, "users": 1}
+
+    drain(queue)
+    assert len(queue) == 0
+    assert queue.user_depth(alice) == 0
@@ -1,11 +1,61 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
-from Sumarizer.app.api.v1.endpoints import summarizer
+from app.services.loader import ModelLoader
 import uvicorn
 
+logger = logging.getLogger(__name__)
+
+if settings.PRELOAD_MODELS:
+    from app.core.model_registry import model_registry
+
+    # Load before workers are forked (gunicorn --preload) so they share the weights
+    routed = [route.model for route in settings.MODEL_ROUTES if route.model]
+    model_registry.preload([settings.MODEL_NAME, *routed], settings.INFERENCE_BACKEND)
+
+from app.api.v1.endpoints import health, summarizer
+
+
+async def consume_requests(app: FastAPI) -> None:
+    """Run the summary request consumer once the model is loaded, until shutdown stops it."""
+    try:
+        # Loading stays with WARM_UP_ON_STARTUP or the first HTTP request
+        await app.state.model_loader.wait_ready()
+        from app.services.kafka_handlers import KafkaEventHandler
+
+        app.state.event_handler = KafkaEventHandler()
+        await app.state.event_handler.start_listening()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("Summary request consumer stopped")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The model loads in the background, liveness probes are answered meanwhile
+    app.state.model_loader = ModelLoader()
+    app.state.event_handler = None
+    if settings.WARM_UP_ON_STARTUP:
+        app.state.model_loader.start_loading()
+    consumer = asyncio.create_task(consume_requests(app)) if settings.CONSUME_REQUESTS else None
+    yield
+    if consumer is not None:
+        if app.state.event_handler is not None:
+            # Finishes in-flight requests and commits their offsets before returning
+            app.state.event_handler.stop()
+        else:
+            consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+    await app.state.model_loader.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 app.include_router(
@@ -13,6 +63,7 @@ app.include_router(
     prefix="/api/v1",
     tags=["summarizer"]
 )
+app.include_router(health.router)
 
 if __name__ == "__main__":
     uvicorn.run(
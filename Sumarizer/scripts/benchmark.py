@@ -0,0 +1,334 @@
+"""
+Throughput and latency benchmark of the summarization pipeline.
+
+Run from the Sumarizer directory:
+    python -m scripts.benchmark --model sshleifer/distilbart-cnn-6-6 --output bench.json
+    python -m scripts.benchmark --backends torch int8 --batch-sizes 1 4 8 --threads 2 4
+    python -m scripts.benchmark --pipeline transport --lengths short medium --concurrency 16
+
+Every combination of backend, batch size and thread count runs in a fresh subprocess, so
+peak RSS and torch thread settings are measured per configuration. Each run summarizes a
+fixed, seeded corpus of synthetic news articles in several lengths, after one warm-up
+request, with ``--concurrency`` requests in flight. The summary cache and request
+deduplication are disabled and the message transport is the in-memory bus, so no Redis,
+Kafka or network access is needed once the model is in the local Hugging Face cache.
+
+``--pipeline service`` calls ``SummarizerService.summarize`` directly. ``--pipeline transport``
+publishes every request to the in-memory bus up front and measures each one from publish to
+its completion event, through the same handler that consumes Kafka.
+
+Results are written as JSON (``--output``, default stdout). The layout is stable
+(``"schema": 1``), so files from different machines or commits can be compared run by run.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+SCHEMA_VERSION = 1
+
+# Approximate words per article of each length class
+LENGTHS = {"short": 120, "medium": 500, "long": 1500, "very_long": 4000}
+
+SENTENCES = [
+    "Apple reported quarterly revenue of $94.9 billion, up 6 percent year over year.",
+    "iPhone sales beat analyst expectations despite weaker demand in China.",
+    "The company announced a $110 billion share buyback, the largest in its history.",
+    "The Federal Reserve held interest rates steady on Wednesday.",
+    "Officials signaled that they expect to cut rates later this year if inflation keeps cooling.",
+    "Chair Jerome Powell said the labor market remains strong.",
+    "Oil prices fell more than 3 percent after OPEC+ agreed to gradually raise output.",
+    "Analysts had expected the group to extend its production cuts through the end of the year.",
+    "Shares of Nvidia rose 4 percent in early trading after the chipmaker raised its outlook.",
+    "Data center revenue more than doubled from a year earlier on demand for AI accelerators.",
+    "Treasury yields climbed as investors weighed stronger than expected retail sales figures.",
+    "The dollar edged higher against the euro and the yen.",
+    "Tesla said deliveries declined for a second consecutive quarter.",
+    "The automaker cut prices in several markets to defend its share against cheaper rivals.",
+    "European stocks closed lower, weighed down by banks and energy companies.",
+    "Gold traded near a record high as central banks continued to add to their reserves.",
+    "Microsoft said cloud revenue grew 29 percent, slightly ahead of estimates.",
+    "Amazon plans to invest $10 billion in new data centers over the next two years.",
+    "Consumer confidence fell to its lowest level in six months, a survey showed.",
+    "Economists said higher borrowing costs are starting to weigh on household spending.",
+]
+
+
+def build_corpus(lengths: List[str], documents: int, seed: int) -> List[Dict[str, Any]]:
+    """Deterministic articles, every one different so nothing is deduplicated."""
+    corpus = []
+    for name in lengths:
+        for index in range(documents):
+            rng = random.Random(f"{seed}:{name}:{index}")
+            sentences, words = [], 0
+            while words < LENGTHS[name]:
+                sentence = rng.choice(SENTENCES)
+                sentences.append(sentence)
+                words += len(sentence.split())
+            # Paragraph breaks every few sentences, like scraped articles
+            paragraphs = [" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+            corpus.append({"id": f"{name}-{index}", "length": name, "content": "\n".join(paragraphs)})
+    return corpus
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    import numpy as np
+
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "mean": round(float(np.mean(values)), 2),
+        "max": round(float(np.max(values)), 2),
+    }
+
+
+async def _run_service(service: Any, requests: List[Any], concurrency: int) -> Dict[str, Tuple[float, str]]:
+    """Latency in milliseconds and summary of each request, keyed by request id."""
+    slots = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def run(request_id: str, request: Any) -> None:
+        async with slots:
+            start = time.perf_counter()
+            response = await service.summarize(request)
+            results[request_id] = ((time.perf_counter() - start) * 1000, response.summary)
+
+    await asyncio.gather(*(run(request_id, request) for request_id, request in requests))
+    return results
+
+
+async def _run_transport(args: argparse.Namespace, corpus: List[Dict[str, Any]]) -> Dict[str, Tuple[float, str]]:
+    """Milliseconds from publishing each request to receiving its completion event, and its summary."""
+    from app.core.kafka import REQUEST_TOPIC
+    from app.core.local_bus import LocalBus, LocalConsumer, LocalTransport
+    from app.services.kafka_handlers import KafkaEventHandler
+
+    bus = LocalBus()
+    transport = LocalTransport(bus)
+    handler = KafkaEventHandler(transport)
+    completions = LocalConsumer(bus, ["summary_completed"], group_id="benchmark")
+    await completions.start()
+
+    # Unique per run, so no request is ever answered from an earlier run's stored result
+    run_id = uuid.uuid4().hex[:8]
+    published = {}
+    for document in corpus:
+        request_id = f"{document['id']}-{run_id}"
+        published[request_id] = (document["id"], time.perf_counter())
+        await transport.publish(REQUEST_TOPIC, transport.serialize_message({
+            "request_id": request_id,
+            "user_id": "benchmark",
+            "content": document["content"],
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+        }))
+
+    listener = asyncio.create_task(handler.start_listening())
+    results = {}
+    try:
+        while len(results) < len(published):
+            if listener.done():
+                listener.result()  # Surface the consumer's failure
+                raise RuntimeError("Request handler stopped before every request completed")
+            batches = await completions.getmany(timeout_ms=100)
+            received = time.perf_counter()
+            for records in batches.values():
+                for record in records:
+                    completed = json.loads(record.value)["summary"]
+                    document_id, start = published[completed["request_id"]]
+                    results[document_id] = ((received - start) * 1000, completed["summary"])
+    finally:
+        handler.stop()
+        await listener
+    return results
+
+
+async def _measure(args: argparse.Namespace) -> Dict[str, Any]:
+    """One benchmark run under the settings of this process, called in the subprocess."""
+    from app.core.config import settings
+    from app.core.model_registry import model_registry
+    from app.models.summarizer import SummaryRequest
+    from app.services.batcher import BatchStats
+    from app.services.summarizer import get_summarizer_service
+
+    service = get_summarizer_service()
+    corpus = build_corpus(args.lengths, args.documents, args.seed)
+    requests = [
+        (document["id"], SummaryRequest(
+            content=document["content"], min_length=args.min_length, max_length=args.max_length
+        ))
+        for document in corpus
+    ]
+
+    # Kernel selection and allocator growth happen on the first generate calls
+    await service.summarize(SummaryRequest(
+        content=build_corpus(["medium"], 1, args.seed + 1)[0]["content"],
+        min_length=args.min_length,
+        max_length=args.max_length,
+    ))
+    service.batcher.stats = BatchStats()
+
+    start = time.perf_counter()
+    if args.pipeline == "transport":
+        results = await _run_transport(args, corpus)
+    else:
+        results = await _run_service(service, requests, args.concurrency)
+    wall = time.perf_counter() - start
+
+    input_tokens = sum(service.chunker.count_tokens(document["content"]) for document in corpus)
+    output_tokens = sum(service.chunker.count_tokens(summary) for _, summary in results.values())
+    stats = service.batcher.stats
+    by_length = {
+        name: _percentiles([results[d["id"]][0] for d in corpus if d["length"] == name])
+        for name in args.lengths
+    }
+    loaded = model_registry.get(settings.MODEL_NAME, settings.INFERENCE_BACKEND)
+    return {
+        "requests": len(corpus),
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(len(corpus) / wall, 3),
+        "input_tokens": input_tokens,
+        "input_tokens_per_second": round(input_tokens / wall, 1),
+        "output_tokens": output_tokens,
+        "output_tokens_per_second": round(output_tokens / wall, 1),
+        "chunks_per_second": round(stats.chunks / wall, 3),
+        "latency_ms": _percentiles([latency for latency, _ in results.values()]),
+        "latency_ms_by_length": by_length,
+        "batching": {
+            "batches": stats.batches,
+            "chunks": stats.chunks,
+            "avg_batch_size": round(stats.avg_batch_size, 2),
+            "max_batch_size": stats.max_batch,
+            # Share of the batch slots that were filled, 1.0 means every generate call was full
+            "fill_ratio": round(stats.avg_batch_size / settings.MAX_BATCH_SIZE, 3),
+            "seconds_per_chunk": round(stats.seconds_per_chunk, 4),
+        },
+        "model_load_seconds": round(loaded.load_time, 3),
+        "model_routes": [route.model_dump() for route in settings.MODEL_ROUTES],
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024), 1
+        ),
+    }
+
+
+def _run_config(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one configuration in a subprocess and return its result."""
+    env = {
+        **os.environ,
+        "MODEL_NAME": config["model"],
+        "INFERENCE_BACKEND": config["backend"],
+        "MAX_BATCH_SIZE": str(config["max_batch_size"]),
+        "MAX_BATCH_WAIT_MS": str(config["max_batch_wait_ms"]),
+        "TORCH_NUM_THREADS": str(config["torch_threads"]),
+        "INFERENCE_WORKERS": str(config["workers"]),
+        "KAFKA_MAX_CONCURRENCY": str(config["concurrency"]),
+        "KAFKA_POLL_TIMEOUT_MS": "100",
+        "MESSAGE_TRANSPORT": "memory",
+        "CACHE_ENABLED": "false",
+        "IDEMPOTENCY_ENABLED": "false",
+        "SUMMARY_MODE": "abstractive",
+        "HF_HUB_OFFLINE": os.environ.get("HF_HUB_OFFLINE", "1"),
+    }
+    command = [sys.executable, "-m", "scripts.benchmark", "--child", *sys.argv[1:]]
+    print(f"Running {config}", file=sys.stderr)
+    completed = subprocess.run(command, env=env, stdout=subprocess.PIPE, text=True)
+    if completed.returncode != 0:
+        return {"config": config, "error": f"exited with status {completed.returncode}, see stderr"}
+    return {"config": config, **json.loads(completed.stdout.strip().splitlines()[-1])}
+
+
+def _host() -> Dict[str, Any]:
+    import torch
+    import transformers
+
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Model to benchmark, defaults to MODEL_NAME")
+    parser.add_argument("--backends", nargs="+", default=["torch"], choices=["torch", "int8", "onnx"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8])
+    parser.add_argument("--threads", nargs="+", type=int, default=[os.cpu_count() or 1])
+    parser.add_argument("--workers", type=int, default=1, help="INFERENCE_WORKERS of every run")
+    parser.add_argument("--batch-wait-ms", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at a time")
+    parser.add_argument("--pipeline", choices=["service", "transport"], default="service")
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument("--documents", type=int, default=4, help="Articles per length class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-length", type=int, help="Requested summary length, by default the model route decides")
+    parser.add_argument("--max-length", type=int)
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_measure(args))))
+        return 0
+
+    from app.core.config import settings
+
+    configs = [
+        {
+            "model": args.model or settings.MODEL_NAME,
+            "backend": backend,
+            "max_batch_size": batch_size,
+            "max_batch_wait_ms": args.batch_wait_ms,
+            "torch_threads": threads,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "pipeline": args.pipeline,
+        }
+        for backend, batch_size, threads in itertools.product(args.backends, args.batch_sizes, args.threads)
+    ]
+    corpus = build_corpus(args.lengths, args.documents, args.seed)
+    results = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "host": _host(),
+        "corpus": {
+            "seed": args.seed,
+            "documents": len(corpus),
+            "words": {name: LENGTHS[name] for name in args.lengths},
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+        },
+        "runs": [_run_config(args, config) for config in configs],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Wrote {len(results['runs'])} run(s) to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0 if all("error" not in run for run in results["runs"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Parity check of an inference backend against the PyTorch reference.
+
+Run from the Sumarizer directory:
+    python -m scripts.check_parity --backend int8
+    python -m scripts.check_parity --backend onnx --model sshleifer/distilbart-cnn-6-6 --min-f1 0.9
+
+Exits with status 1 when the mean token F1 against the fp32 PyTorch summaries drops
+below ``--min-f1``.
+"""
+
+import argparse
+import sys
+
+from app.core.backends import BACKENDS, check_parity
+from app.core.config import settings
+
+SAMPLE_TEXTS = [
+    "Apple reported quarterly revenue of $94.9 billion, up 6 percent year over year, as iPhone "
+    "sales beat analyst expectations. The company also announced a $110 billion share buyback, "
+    "the largest in its history, and raised its quarterly dividend by 4 percent.",
+    "The Federal Reserve held interest rates steady on Wednesday but signaled that it expects to "
+    "cut rates later this year if inflation continues to cool. Chair Jerome Powell said the labor "
+    "market remains strong and that the committee will watch incoming data closely.",
+    "Oil prices fell more than 3 percent after OPEC+ agreed to gradually raise output starting in "
+    "October. Analysts said the decision surprised markets that had expected the group to extend "
+    "its production cuts through the end of the year amid weak demand from China.",
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b != "torch"], required=True)
+    parser.add_argument("--model", default=settings.MODEL_NAME)
+    parser.add_argument("--min-f1", type=float, default=0.9)
+    args = parser.parse_args()
+
+    report = check_parity(args.model, args.backend, SAMPLE_TEXTS)
+    print(
+        f"{args.backend} vs torch on {report.total} texts: "
+        f"exact match {report.exact_match_rate:.0%}, mean token F1 {report.mean_token_f1:.3f}"
+    )
+    return 0 if report.mean_token_f1 >= args.min_f1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
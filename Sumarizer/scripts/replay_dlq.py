@@ -0,0 +1,103 @@
+"""
+Replay dead-lettered summary requests through the pipeline.
+
+Run from the Sumarizer directory:
+    python -m scripts.replay_dlq --dry-run
+    python -m scripts.replay_dlq --error-type TimeoutError --commit
+    python -m scripts.replay_dlq --request-id 3f2c... --commit
+
+Reads ``summary_requests.dlq`` up to its current end and republishes matching records to
+``summary_requests`` with a fresh attempt count. With ``--commit`` the replay consumer group
+remembers how far it got, so the next run starts after the last replayed record (records
+skipped by the filters before it are passed over as well); without it every run starts from
+the same position.
+
+Works on the bus selected by MESSAGE_TRANSPORT. For ``file``, run it while the service is
+stopped: the service only loads the logs under TRANSPORT_DIR when it starts. ``memory``
+has nothing to replay from another process.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Optional
+
+from app.core.kafka import ATTEMPT_HEADER, DLQ_TOPIC, REQUEST_TOPIC, RETRY_AT_HEADER, header
+from app.core.transport import OffsetAndMetadata, create_transport
+
+REPLAY_GROUP = "summarizer_dlq_replay"
+
+
+def _request_id(value: bytes) -> Optional[str]:
+    try:
+        return json.loads(value).get("request_id")
+    except (ValueError, AttributeError):
+        return None
+
+
+async def replay(args: argparse.Namespace) -> int:
+    transport = create_transport()
+    consumer = await transport.open_reader(DLQ_TOPIC, REPLAY_GROUP)
+    replayed = 0
+    try:
+        partitions = list(consumer.assignment())
+        if not partitions:
+            print(f"{DLQ_TOPIC} does not exist or is being replayed by another process")
+            return 0
+
+        # Stop at the current end, records that fail again during the replay are not re-read
+        end_offsets = await consumer.end_offsets(partitions)
+        remaining = {tp for tp in partitions if await consumer.position(tp) < end_offsets[tp]}
+        while remaining and (args.limit is None or replayed < args.limit):
+            batches = await consumer.getmany(*remaining, timeout_ms=1000)
+            for tp, messages in batches.items():
+                for message in messages:
+                    if message.offset >= end_offsets[tp] or (args.limit is not None and replayed >= args.limit):
+                        remaining.discard(tp)
+                        break
+                    if args.request_id and _request_id(message.value) != args.request_id:
+                        continue
+                    if args.error_type and header(message, "x-error-type") != args.error_type:
+                        continue
+
+                    print(
+                        f"{tp.partition}:{message.offset} request={_request_id(message.value)} "
+                        f"attempts={header(message, ATTEMPT_HEADER)} "
+                        f"error={header(message, 'x-error-type')}: {header(message, 'x-error-message')}"
+                    )
+                    if not args.dry_run:
+                        # Keep the failure history, restart the attempt count
+                        headers = [
+                            (key, value) for key, value in message.headers
+                            if key not in (ATTEMPT_HEADER, RETRY_AT_HEADER)
+                        ]
+                        headers.append(("x-replayed-from", f"{tp.partition}:{message.offset}".encode("utf-8")))
+                        await transport.publish(REQUEST_TOPIC, message.value, key=message.key, headers=headers)
+                    replayed += 1
+                    if args.commit and not args.dry_run:
+                        await consumer.commit({tp: OffsetAndMetadata(message.offset + 1, "")})
+            for tp in list(remaining):
+                if await consumer.position(tp) >= end_offsets[tp]:
+                    remaining.discard(tp)
+    finally:
+        await consumer.stop()
+        await transport.close()
+
+    action = "would replay" if args.dry_run else "replayed"
+    print(f"{action} {replayed} record(s) from {DLQ_TOPIC}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--request-id", help="Only replay this request")
+    parser.add_argument("--error-type", help="Only replay records whose last error has this type")
+    parser.add_argument("--limit", type=int, help="Replay at most this many records")
+    parser.add_argument("--dry-run", action="store_true", help="List matching records without replaying")
+    parser.add_argument("--commit", action="store_true", help="Remember the position for the next run")
+    return asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())